@@ -0,0 +1,92 @@
+"""
+benchmarks/import_budget.py - 모듈 import 시간 예산 검사
+
+각 진입 모듈을 새 인터프리터에서 import 하여 소요 시간(중앙값)을 재고,
+예산을 넘거나 무거운 의존성(pygame, sklearn, scipy, autonavsim2d)을 미리 로드하면 실패합니다.
+
+    python benchmarks/import_budget.py --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+# 프로젝트 루트
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import 시점에 로드되면 안 되는 무거운 의존성
+HEAVY_MODULES = ('pygame', 'sklearn', 'scipy', 'autonavsim2d')
+
+# (모듈, 예산 ms) - numpy 로드(약 100ms)를 포함한 값
+BUDGETS = [
+    ('src.mapdata.raster', 200),
+    ('src.mapdata.occupancy', 200),
+    ('src.mapdata.generate', 200),
+    ('src.perception.detect', 200),
+    ('src.perception.stream', 200),
+    ('src.control.planner', 200),
+    ('src.launch.wrapper', 200),
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000.0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'ms': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> dict:
+    """
+    새 인터프리터에서 모듈 import 시간 측정
+
+    Returns:
+        dict: {'ms': 중앙값(ms), 'heavy': 함께 로드된 무거운 의존성 목록}
+    """
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result['ms'])
+        heavy = result['heavy']
+    return {'ms': float(np.median(samples)), 'heavy': heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모듈 import 시간 예산 검사')
+    parser.add_argument('--repeat', type=int, default=5, help='모듈별 측정 횟수')
+    parser.add_argument('--scale', type=float, default=1.0, help='예산 배율 (느린 머신용)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️ Import Budget")
+    print("=" * 60)
+
+    failures = 0
+    for module, budget in BUDGETS:
+        result = measure_import(module, args.repeat)
+        limit = budget * args.scale
+        ok = result['ms'] <= limit and not result['heavy']
+        failures += not ok
+
+        status = "✅" if ok else "❌"
+        heavy = f" | 무거운 의존성 로드: {', '.join(result['heavy'])}" if result['heavy'] else ""
+        print(f"{status} {module:<26} {result['ms']:7.1f}ms / {limit:.0f}ms{heavy}")
+
+    if failures:
+        print(f"\n❌ 예산 초과: {failures}개 모듈")
+        sys.exit(1)
+    print("\n✅ 모든 모듈이 예산 이내입니다.")
+
+
+if __name__ == "__main__":
+    main()
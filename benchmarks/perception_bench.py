@@ -0,0 +1,236 @@
+"""
+benchmarks/perception_bench.py - 인식(Perception) 단계별 성능 벤치마크
+
+합성 맵(코트 1면 ~ 시설 규모, src/mapdata/generate.py)을 생성하여 맵 로드, 눈 픽셀 추출,
+군집화, 재색칠 단계를 각각 측정하고 p50/p95, 최대 메모리를 JSON으로 저장합니다.
+맵 포맷(.pkl 그리드 / .tcmap 래스터)별로 따로 측정합니다.
+
+    python benchmarks/perception_bench.py --repeat 5 --output benchmarks/results/perception.json
+"""
+import argparse
+import itertools
+import json
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.mapdata.generate import generate_map
+from src.mapdata.raster import colors_to_map_val, colors_to_raster, save_raster, load_raster
+from src.perception.detect import (
+    load_map, extract_snow_pixels, extract_snow_pixels_from_colors, cluster_snow_pixels,
+    clusters_to_boxes, recolor_clusters, recolor_cluster_colors
+)
+
+# 눈 패치 한 변 길이 (최소, 최대)
+PATCH_SIZE = (12, 18)
+
+# (이름, 코트 행 수, 코트 열 수, 눈 패치 수, 노이즈 비율)
+SCENARIOS = [
+    ('court_1x1_c1', 1, 1, 1, 0.0),
+    ('court_1x1_c8', 1, 1, 8, 0.001),
+    ('court_1x1_c12', 1, 1, 12, 0.003),
+    ('facility_2x2_c40', 2, 2, 40, 0.002),
+    ('facility_3x4_c120', 3, 4, 120, 0.002),
+    ('facility_5x7_c400', 5, 7, 400, 0.003),
+]
+
+STAGES = ('load', 'extract', 'cluster', 'recolor')
+
+
+def run_stages(map_path: str, map_format: str, checkpoint) -> dict:
+    """
+    감지 파이프라인을 단계별로 1회 실행 (각 단계 종료 시 checkpoint(stage) 호출)
+
+    Parameters:
+        map_path: 맵 파일 경로
+        map_format: 'pkl' (AutoNavSim2D 그리드) 또는 'tcmap' (색상 인덱스 래스터)
+        checkpoint: 단계 종료 콜백
+
+    Returns:
+        dict: {'clusters': 감지 수, 'snow_pixels': 눈 픽셀 수}
+    """
+    if map_format == 'pkl':
+        map_val = load_map(map_path)
+        checkpoint('load')
+        top_pixels, bottom_pixels = extract_snow_pixels(map_val)
+    else:
+        colors = load_raster(map_path).colors()
+        checkpoint('load')
+        top_pixels, bottom_pixels = extract_snow_pixels_from_colors(colors)
+    checkpoint('extract')
+
+    top_clusters = cluster_snow_pixels(top_pixels)
+    bottom_clusters = cluster_snow_pixels(bottom_pixels)
+    boxes = clusters_to_boxes(top_clusters) + clusters_to_boxes(bottom_clusters)
+    checkpoint('cluster')
+
+    if map_format == 'pkl':
+        recolor_clusters(map_val, top_clusters, color_offset=0)
+        recolor_clusters(map_val, bottom_clusters, color_offset=4)
+    else:
+        recolor_cluster_colors(colors, top_clusters, color_offset=0)
+        recolor_cluster_colors(colors, bottom_clusters, color_offset=4)
+    checkpoint('recolor')
+
+    return {
+        'clusters': len(boxes),
+        'snow_pixels': len(top_pixels) + len(bottom_pixels)
+    }
+
+
+def run_pipeline(map_path: str, map_format: str) -> dict:
+    """
+    단계별 소요 시간 측정
+
+    Returns:
+        dict: {'times': {stage: 초}, 'clusters': 감지 수, 'snow_pixels': 눈 픽셀 수}
+    """
+    times = {}
+    last = [time.perf_counter()]
+
+    def checkpoint(stage):
+        now = time.perf_counter()
+        times[stage] = now - last[0]
+        last[0] = now
+
+    result = run_stages(map_path, map_format, checkpoint)
+    result['times'] = times
+    return result
+
+
+def measure_peak_memory(map_path: str, map_format: str) -> dict:
+    """tracemalloc으로 단계별 최대 메모리(MB) 측정 (시간 측정과 분리)"""
+    peaks = {}
+    tracemalloc.start()
+
+    def checkpoint(stage):
+        _, peak = tracemalloc.get_traced_memory()
+        peaks[stage] = peak / (1024 * 1024)
+        tracemalloc.reset_peak()
+
+    tracemalloc.reset_peak()
+    run_stages(map_path, map_format, checkpoint)
+    tracemalloc.stop()
+    return peaks
+
+
+def summarize(samples: list) -> dict:
+    """측정값 리스트 -> p50/p95/평균 (ms)"""
+    values = np.array(samples) * 1000.0
+    return {
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'mean_ms': float(values.mean())
+    }
+
+
+def write_map(colors: np.ndarray, map_path: str, map_format: str):
+    """합성 색상 레이어를 지정 포맷으로 저장"""
+    if map_format == 'pkl':
+        with open(map_path, 'wb') as f:
+            pickle.dump(colors_to_map_val(colors), f)
+    else:
+        save_raster(map_path, colors_to_raster(colors))
+
+
+def bench_scenario(name, court_rows, court_cols, num_patches, noise, repeat, work_dir,
+                   map_format='pkl') -> dict:
+    """시나리오 1개 측정"""
+    colors, _ = generate_map(num_courts=court_rows * court_cols, num_patches=num_patches,
+                             patch_size=PATCH_SIZE, noise=noise, seed=0, courts_per_row=court_cols)
+    map_path = os.path.join(work_dir, f"{name}.{map_format}")
+    write_map(colors, map_path, map_format)
+
+    samples = {stage: [] for stage in STAGES}
+    totals = []
+    run = None
+    for _ in range(repeat):
+        run = run_pipeline(map_path, map_format)
+        for stage in STAGES:
+            samples[stage].append(run['times'][stage])
+        totals.append(sum(run['times'].values()))
+
+    peaks = measure_peak_memory(map_path, map_format)
+
+    return {
+        'name': name,
+        'format': map_format,
+        'rows': int(colors.shape[0]),
+        'cols': int(colors.shape[1]),
+        'courts': court_rows * court_cols,
+        'patches': num_patches,
+        'noise': noise,
+        'clusters_detected': run['clusters'],
+        'snow_pixels': run['snow_pixels'],
+        'map_file_mb': os.path.getsize(map_path) / (1024 * 1024),
+        'stages': {
+            stage: dict(summarize(samples[stage]), peak_mb=peaks[stage]) for stage in STAGES
+        },
+        'total': summarize(totals)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perception 단계별 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5, help='시나리오별 반복 횟수')
+    parser.add_argument('--only', type=str, default=None, help='이름에 이 문자열이 포함된 시나리오만 실행')
+    parser.add_argument('--formats', type=str, default='pkl,tcmap',
+                        help='측정할 맵 포맷 (쉼표 구분: pkl, tcmap)')
+    parser.add_argument('--output', type=str,
+                        default=os.path.join(project_root, 'benchmarks', 'results', 'perception_bench.json'),
+                        help='결과 JSON 경로')
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if args.only is None or args.only in s[0]]
+
+    print("=" * 60)
+    print("📊 Perception Benchmark")
+    print("=" * 60)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for (name, court_rows, court_cols, num_patches, noise), map_format in itertools.product(
+                scenarios, args.formats.split(',')):
+            result = bench_scenario(name, court_rows, court_cols, num_patches, noise, args.repeat,
+                                    work_dir, map_format)
+            results.append(result)
+
+            print(f"\n[{name} / {map_format}] {result['rows']}x{result['cols']} | 코트 {result['courts']}면 | "
+                  f"군집 {result['clusters_detected']}/{num_patches} | 눈 {result['snow_pixels']}px")
+            for stage in STAGES:
+                st = result['stages'][stage]
+                print(f"   - {stage:<8} p50 {st['p50_ms']:9.2f}ms | p95 {st['p95_ms']:9.2f}ms | "
+                      f"peak {st['peak_mb']:8.2f}MB")
+            print(f"   - {'total':<8} p50 {result['total']['p50_ms']:9.2f}ms | "
+                  f"p95 {result['total']['p95_ms']:9.2f}ms")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'scenarios': results
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
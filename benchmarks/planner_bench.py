@@ -0,0 +1,343 @@
+"""
+benchmarks/planner_bench.py - 경로 계획(Planner) 성능 벤치마크 + 성능 예산 검사
+
+합성 맵(src/mapdata/generate.py)을 크기/군집 수별로 만들어 planner 각 단계를 측정합니다.
+    update_matrix   : update_matrix_for_court_and_snow (캐시를 비운 cold 실행)
+    update_matrix_cached : 같은 호출의 캐시 적중(warm) 실행
+    a_star          : 시작 셀 -> 각 군집 진입점 A* (확장 노드 수 포함)
+    landmarks       : 랜드마크 거리 테이블 생성 (ALT 휴리스틱, src/control/landmarks.py)
+    a_star_alt      : a_star와 같은 질의를 ALT 휴리스틱으로 (네트 건너편 질의의 확장 노드 수 비교)
+    a_star_bidir    : a_star와 같은 질의를 양방향 BFS로 (확장 노드 수는 많지만 노드당 비용이 작음)
+    a_star_coarse   : a_star와 같은 질의를 다중 해상도(축소 그리드 경로 주변 통로)로 (src/control/multires.py)
+    nearest_cluster : find_nearest_cluster 1회
+    coverage        : 군집별 generate_multi_pass_coverage
+    full_plan       : create_snow_removal_planners + custom_path_planner 전체 (cold)
+                      (생성된 경로의 품질 지표도 함께 저장, src/control/metrics.py)
+
+cold 단계는 샘플마다 통행 마스크/랜드마크 캐시를 비운 뒤 측정합니다 (build_scenario가 같은 인자로
+이미 채워 둔 캐시를 조회하는 시간만 재지 않도록).
+
+측정값(p50/p95, 확장 노드 수, 최대 메모리)을 JSON으로 저장하고,
+benchmarks/planner_budgets.json 의 시나리오별 예산을 넘으면 종료 코드 1로 실패합니다.
+
+    python benchmarks/planner_bench.py --repeat 3
+    python benchmarks/planner_bench.py --only court_1x1 --update-budgets
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.mapdata.generate import generate_map, save_map
+from src.mapdata.raster import open_map_raster
+from src.mapdata.occupancy import OccupancyView
+from src.perception.detect import detect_snow_regions
+from src.control import planner, landmarks
+from src.control.planner import (
+    a_star, find_nearest_cluster, update_matrix_for_court_and_snow, estimate_court_zones,
+    generate_multi_pass_coverage, create_snow_removal_planners, PASSAGE_MARGIN, NET_THICKNESS
+)
+from src.control.landmarks import LandmarkTable, build_landmark_table
+from src.control.multires import GridPyramid
+from src.control.metrics import compute_plan_metrics
+from src.launch.headless import default_start
+from src.utils import trace
+
+DEFAULT_BUDGETS = os.path.join(project_root, 'benchmarks', 'planner_budgets.json')
+
+# (이름, 코트 수, 눈 패치 수, 패치 크기, 무거운 시나리오 여부)
+# 무거운 시나리오(여러 코트)는 현재 planner로 수 분이 걸리므로 --all 을 줄 때만 실행
+SCENARIOS = [
+    ('court_1x1_c2', 1, 2, (8, 10), False),
+    ('court_1x1_c4', 1, 4, (8, 10), False),
+    ('court_1x1_c8', 1, 8, (15, 20), False),
+    ('facility_1x2_c8', 2, 8, (8, 10), True),
+    ('facility_2x2_c16', 4, 16, (8, 10), True),
+]
+
+STAGES = ('update_matrix', 'update_matrix_cached', 'a_star', 'landmarks', 'a_star_alt', 'a_star_bidir',
+          'a_star_coarse', 'nearest_cluster', 'coverage', 'full_plan')
+
+# 샘플마다 캐시를 비우고 측정하는 단계
+COLD_STAGES = ('update_matrix', 'full_plan')
+
+# 예산 갱신 시 측정값에 곱할 여유 배율 (확장 노드 수는 결정적이므로 그대로 사용)
+TIME_HEADROOM = 1.5
+MEMORY_HEADROOM = 1.25
+TIME_FLOOR_MS = 5.0  # 매우 짧은 단계(coverage 등)는 측정 잡음이 커서 최소 예산 적용
+COVERAGE_PASSES = 3
+
+
+def build_scenario(name: str, num_courts: int, num_patches: int, patch_size: tuple, work_dir: str) -> dict:
+    """
+    합성 맵 생성 -> 감지 -> 통행 행렬 (벤치마크 입력)
+
+    Returns:
+        dict: {'matrix', 'updated', 'landmarks', 'pyramid', 'boxes', 'stats', 'court_structure', 'start', 'shape'}
+    """
+    colors, _ = generate_map(num_courts=num_courts, num_patches=num_patches,
+                             patch_size=patch_size, seed=0, courts_per_row=2)
+    map_path = os.path.join(work_dir, f"{name}.tcmap")
+    save_map(colors, map_path)
+
+    detection = detect_snow_regions(map_path, use_cache=False, with_layers=False)
+    raster = open_map_raster(map_path)
+    matrix = OccupancyView(raster).to_bitgrid()
+    court_structure = detection['court_structure']
+
+    # 시작 셀: 첫 코트 좌상단 근처의 통행 가능 셀 (planner의 대체 위치 탐색과 같은 결과가 되도록)
+    sr, sc = default_start(court_structure)
+    updated = update_matrix_for_court_and_snow(matrix, detection['all_boxes'], court_structure)
+    if not updated.is_free(sr, sc):
+        free = np.argwhere(updated.to_bool())
+        sr, sc = free[np.argmin(np.abs(free - (sr, sc)).sum(axis=1))].tolist()
+
+    zones = estimate_court_zones(detection['all_boxes'], *updated.shape, court_structure)
+    return {
+        'matrix': matrix,
+        'updated': updated,
+        'landmarks': build_landmark_table(updated, zones, PASSAGE_MARGIN, NET_THICKNESS),
+        'pyramid': GridPyramid(updated),
+        'boxes': detection['all_boxes'],
+        'stats': detection['cluster_stats'],
+        'court_structure': court_structure,
+        'start': (sr, sc),
+        'shape': raster.shape
+    }
+
+
+def clear_caches():
+    """planner 통행 마스크 캐시 + 랜드마크 테이블 캐시 비우기 (cold 측정용)"""
+    planner._PASSABILITY_CACHE.clear()
+    landmarks._LANDMARK_CACHE.clear()
+
+
+def prepare_stage(stage: str, scenario: dict):
+    """측정 샘플 1개 직전 준비 (시간 측정 밖): cold 단계는 캐시 비우기, warm 단계는 캐시 채우기"""
+    if stage in COLD_STAGES:
+        clear_caches()
+    elif stage == 'update_matrix_cached':
+        update_matrix_for_court_and_snow(scenario['matrix'], scenario['boxes'], scenario['court_structure'])
+
+
+def run_stage(stage: str, scenario: dict):
+    """단계 1회 실행 (full_plan은 생성된 경로 반환)"""
+    boxes = scenario['boxes']
+    if stage in ('update_matrix', 'update_matrix_cached'):
+        update_matrix_for_court_and_snow(scenario['matrix'], boxes, scenario['court_structure'])
+    elif stage == 'a_star':
+        for (r1, c1), _ in boxes:
+            a_star(scenario['updated'], scenario['start'], (r1, c1))
+    elif stage == 'landmarks':
+        # 캐시를 거치지 않고 같은 랜드마크로 거리 테이블을 새로 생성
+        LandmarkTable(scenario['updated'], scenario['landmarks'].landmarks)
+    elif stage == 'a_star_alt':
+        for (r1, c1), _ in boxes:
+            a_star(scenario['updated'], scenario['start'], (r1, c1), scenario['landmarks'])
+    elif stage == 'a_star_bidir':
+        for (r1, c1), _ in boxes:
+            a_star(scenario['updated'], scenario['start'], (r1, c1), bidirectional=True)
+    elif stage == 'a_star_coarse':
+        for (r1, c1), _ in boxes:
+            a_star(scenario['updated'], scenario['start'], (r1, c1), pyramid=scenario['pyramid'])
+    elif stage == 'nearest_cluster':
+        find_nearest_cluster(scenario['updated'], scenario['start'], boxes)
+    elif stage == 'coverage':
+        for box in boxes:
+            generate_multi_pass_coverage(box, box[0], COVERAGE_PASSES)
+    elif stage == 'full_plan':
+        path_planner, _ = create_snow_removal_planners(
+            boxes, cluster_stats=scenario['stats'], court_structure=scenario['court_structure']
+        )
+        route, _ = path_planner(None, scenario['matrix'], scenario['start'], scenario['start'])
+        return route
+
+
+def measure_instrumented(stage: str, scenario: dict) -> tuple:
+    """
+    계측 실행 1회 (시간 측정과 분리): A* 확장 노드 수 합계(trace) + 최대 메모리(tracemalloc)
+
+    Returns:
+        tuple: (확장 노드 수, 최대 메모리 MB)
+    """
+    prepare_stage(stage, scenario)
+    trace.reset()
+    trace.enable()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        run_stage(stage, scenario)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        trace.disable()
+    expansions = sum(event['args'].get('expansions', 0)
+                     for event in trace.drain() if event['name'] == 'a_star')
+    return expansions, peak / (1024 * 1024)
+
+
+def summarize(samples: list) -> dict:
+    """측정값 리스트 -> p50/p95/평균 (ms)"""
+    values = np.array(samples) * 1000.0
+    return {
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'mean_ms': float(values.mean())
+    }
+
+
+def bench_scenario(name, num_courts, num_patches, patch_size, repeat, stages, work_dir) -> dict:
+    """시나리오 1개 측정"""
+    scenario = build_scenario(name, num_courts, num_patches, patch_size, work_dir)
+
+    results = {}
+    plan_metrics = None
+    for stage in stages:
+        samples = []
+        for _ in range(repeat):
+            prepare_stage(stage, scenario)
+            start = time.perf_counter()
+            output = run_stage(stage, scenario)
+            samples.append(time.perf_counter() - start)
+        if stage == 'full_plan':
+            plan_metrics = compute_plan_metrics(output, scenario['boxes'], shape=scenario['shape'])
+
+        expansions, peak_mb = measure_instrumented(stage, scenario)
+        results[stage] = dict(summarize(samples), expansions=expansions, peak_mb=peak_mb)
+
+    return {
+        'name': name,
+        'rows': int(scenario['shape'][0]),
+        'cols': int(scenario['shape'][1]),
+        'courts': num_courts,
+        'clusters': len(scenario['boxes']),
+        'start': list(scenario['start']),
+        'stages': results,
+        'plan_metrics': plan_metrics
+    }
+
+
+def check_budgets(result: dict, budgets: dict, scale: float) -> list:
+    """
+    예산 초과 항목 목록
+
+    Returns:
+        list: ["stage: p50_ms 123.4 > 100.0", ...]
+    """
+    violations = []
+    for stage, measured in result['stages'].items():
+        budget = budgets.get(result['name'], {}).get(stage)
+        if not budget:
+            continue
+        for metric, limit in budget.items():
+            limit = limit * scale if metric != 'expansions' else limit
+            if measured[metric] > limit:
+                violations.append(f"{stage}: {metric} {measured[metric]:.1f} > {limit:.1f}")
+    return violations
+
+
+def make_budget(result: dict) -> dict:
+    """측정값 -> 예산 (시간/메모리는 여유 배율 적용)"""
+    return {
+        stage: {
+            'p50_ms': round(max(measured['p50_ms'] * TIME_HEADROOM, TIME_FLOOR_MS), 1),
+            'expansions': measured['expansions'],
+            'peak_mb': round(max(measured['peak_mb'], 0.1) * MEMORY_HEADROOM, 2)
+        }
+        for stage, measured in result['stages'].items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Planner 벤치마크 + 성능 예산 검사')
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 반복 횟수')
+    parser.add_argument('--only', type=str, default=None, help='이름에 이 문자열이 포함된 시나리오만 실행')
+    parser.add_argument('--all', action='store_true', help='무거운(여러 코트) 시나리오 포함')
+    parser.add_argument('--stages', type=str, default=','.join(STAGES), help='측정할 단계 (쉼표 구분)')
+    parser.add_argument('--budgets', type=str, default=DEFAULT_BUDGETS, help='예산 JSON 경로')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='시간/메모리 예산 배율 (느린 머신용)')
+    parser.add_argument('--update-budgets', action='store_true', help='측정값으로 예산 파일 갱신')
+    parser.add_argument('--output', type=str,
+                        default=os.path.join(project_root, 'benchmarks', 'results', 'planner_bench.json'),
+                        help='결과 JSON 경로')
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS
+                 if (args.only is None or args.only in s[0]) and (args.all or not s[4] or args.only)]
+    stages = [stage for stage in args.stages.split(',') if stage]
+
+    budgets = {}
+    if os.path.exists(args.budgets):
+        with open(args.budgets) as f:
+            budgets = json.load(f)
+
+    print("=" * 60)
+    print("📊 Planner Benchmark")
+    print("=" * 60)
+
+    results = []
+    failures = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, num_courts, num_patches, patch_size, _ in scenarios:
+            result = bench_scenario(name, num_courts, num_patches, patch_size, args.repeat, stages, work_dir)
+            results.append(result)
+
+            print(f"\n[{name}] {result['rows']}x{result['cols']} | 코트 {num_courts}면 | "
+                  f"군집 {result['clusters']} | 시작 {tuple(result['start'])}")
+            for stage in stages:
+                st = result['stages'][stage]
+                print(f"   - {stage:<16} p50 {st['p50_ms']:10.2f}ms | p95 {st['p95_ms']:10.2f}ms | "
+                      f"확장 {st['expansions']:8d} | peak {st['peak_mb']:7.2f}MB")
+            metrics = result['plan_metrics']
+            if metrics:
+                print(f"   - 경로 품질: 길이 {metrics['length_cells']:.0f} (이동 {metrics['transit_cells']:.0f}) | "
+                      f"회전 {metrics['turns']} | 중복 {metrics['revisited_cells']} | "
+                      f"커버리지 {metrics['coverage_ratio']:.1%} | 예상 {metrics['est_time_s']:.0f}s")
+
+            if args.update_budgets:
+                budgets.setdefault(name, {}).update(make_budget(result))
+            else:
+                violations = check_budgets(result, budgets, args.budget_scale)
+                if violations:
+                    failures[name] = violations
+                    for violation in violations:
+                        print(f"   ❌ 예산 초과 - {violation}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'scenarios': results,
+        'budget_failures': failures
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 결과 저장: {args.output}")
+
+    if args.update_budgets:
+        with open(args.budgets, 'w') as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+        print(f"💾 예산 갱신: {args.budgets}")
+    elif failures:
+        print(f"\n❌ 예산 초과 시나리오: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+benchmarks/service_load.py - 경로 계획 서비스 부하 생성기 (처리량 / 꼬리 지연)
+
+여러 클라이언트가 동시에 계획 요청을 보내고 요청별 지연 시간(p50/p95/p99), 처리량,
+중복 제거된 요청 수를 측정합니다. 서버를 따로 띄우지 않으면 같은 프로세스에서 서비스를 시작합니다.
+요청은 적은 수의 고유 요청(맵 x 시작 셀)을 돌려 쓰므로 동시에 같은 요청이 자주 겹칩니다.
+
+    python benchmarks/service_load.py --clients 8 --requests 4 --workers 4
+    python benchmarks/service_load.py --port 8765 --maps maps/corpus   # 실행 중인 서비스에 요청
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.mapdata.generate import generate_map, save_map
+from src.control.route_codec import decode_route
+from src.launch.headless import expand_map_paths
+from src.launch.service import (
+    DEFAULT_HOST, PlanningService, pack_frame, read_frame, unpack_response
+)
+
+# 합성 맵 기본값 (코트 1면, 작은 눈 패치 - 요청 1건이 수 초 이내)
+SYNTHETIC_MAPS = 3
+SYNTHETIC_PATCHES = 2
+SYNTHETIC_PATCH_SIZE = (8, 10)
+STARTS = [(7, 65), (166, 65), (7, 164), (166, 164)]
+
+
+def make_maps(work_dir: str, count: int) -> list:
+    """합성 맵 생성 (시드 0..count-1)"""
+    paths = []
+    for seed in range(count):
+        colors, _ = generate_map(num_courts=1, num_patches=SYNTHETIC_PATCHES,
+                                 patch_size=SYNTHETIC_PATCH_SIZE, seed=seed)
+        path = os.path.join(work_dir, f"load_{seed:03d}.tcmap")
+        save_map(colors, path)
+        paths.append(path)
+    return paths
+
+
+async def run_client(host: str, port: int, client_id: int, jobs: list, count: int, samples: list):
+    """
+    클라이언트 1개: 연결 하나로 요청을 순서대로 보내고 응답 지연 기록
+
+    Parameters:
+        jobs: 고유 요청 리스트 [(map_path, start), ...]
+        count: 보낼 요청 수
+        samples: 결과를 추가할 리스트 (latency_s, 헤더, 검증 결과)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            map_path, start = jobs[(client_id + i) % len(jobs)]
+            request = {'id': client_id * count + i, 'map': map_path, 'start': list(start)}
+
+            sent = time.perf_counter()
+            writer.write(pack_frame(json.dumps(request).encode()))
+            await writer.drain()
+            header, route = unpack_response(await read_frame(reader))
+            latency = time.perf_counter() - sent
+
+            valid = header['ok'] and len(decode_route(route)) == header['waypoints']
+            samples.append((latency, header, valid))
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, jobs: list, clients: int, requests: int) -> tuple:
+    """
+    부하 실행
+
+    Returns:
+        tuple: (샘플 리스트, 전체 소요 시간)
+    """
+    samples = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, cid, jobs, requests, samples) for cid in range(clients)))
+    return samples, time.perf_counter() - start
+
+
+async def main_async(args, map_paths: list) -> dict:
+    jobs = [(path, start) for path in map_paths for start in STARTS][:args.unique]
+
+    service = None
+    host, port = args.host, args.port
+    if port is None:
+        service = PlanningService(args.workers)
+        host, port = await service.start(DEFAULT_HOST, 0)
+        print(f"🛰️ 서비스 시작: {host}:{port} (프로세스 {service.workers}개)")
+
+    try:
+        # 워밍업: 작업 프로세스 맵 캐시 / 감지 캐시 채우기 (측정에서 제외)
+        if args.warmup:
+            await run_load(host, port, jobs, 1, len(jobs))
+        samples, elapsed = await run_load(host, port, jobs, args.clients, args.requests)
+    finally:
+        if service is not None:
+            await service.stop()
+
+    latencies = np.array([latency for latency, _, _ in samples]) * 1000.0
+    return {
+        'requests': len(samples),
+        'unique_requests': len(jobs),
+        'failed': sum(1 for _, header, valid in samples if not valid),
+        'deduplicated': sum(1 for _, header, _ in samples if header.get('deduplicated')),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(samples) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+        'mean_plan_ms': float(np.mean([header['plan_s'] for _, header, valid in samples if valid]) * 1000.0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='경로 계획 서비스 부하 생성기')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='서비스 주소')
+    parser.add_argument('--port', type=int, default=None, help='실행 중인 서비스 포트 (없으면 내부에서 시작)')
+    parser.add_argument('--workers', type=int, default=None, help='내부 서비스 프로세스 수')
+    parser.add_argument('--maps', nargs='*', default=None, help='맵 파일/디렉터리/manifest.json (없으면 합성 맵)')
+    parser.add_argument('--clients', type=int, default=8, help='동시 클라이언트 수')
+    parser.add_argument('--requests', type=int, default=4, help='클라이언트별 요청 수')
+    parser.add_argument('--unique', type=int, default=6, help='고유 요청(맵 x 시작 셀) 수')
+    parser.add_argument('--no-warmup', dest='warmup', action='store_false', help='워밍업 생략')
+    parser.add_argument('--output', type=str,
+                        default=os.path.join(project_root, 'benchmarks', 'results', 'service_load.json'),
+                        help='결과 JSON 경로')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 Planning Service Load")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        map_paths = expand_map_paths(args.maps) if args.maps else make_maps(work_dir, SYNTHETIC_MAPS)
+        result = asyncio.run(main_async(args, map_paths))
+
+    print(f"\n요청 {result['requests']}건 (고유 {result['unique_requests']}) | "
+          f"중복 제거 {result['deduplicated']} | 실패 {result['failed']}")
+    print(f"   - 처리량: {result['throughput_rps']:.2f} req/s ({result['elapsed_s']:.1f}s)")
+    print(f"   - 지연: p50 {result['p50_ms']:.0f}ms | p95 {result['p95_ms']:.0f}ms | "
+          f"p99 {result['p99_ms']:.0f}ms | 최대 {result['max_ms']:.0f}ms")
+    print(f"   - 계획 시간 평균: {result['mean_plan_ms']:.0f}ms")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'clients': args.clients,
+            'requests_per_client': args.requests,
+            'port': args.port
+        },
+        'result': result
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 결과 저장: {args.output}")
+
+    if result['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
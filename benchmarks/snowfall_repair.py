@@ -0,0 +1,122 @@
+"""
+benchmarks/snowfall_repair.py - 동적 강설 경로 수리 벤치마크
+
+합성 맵에서 전체 경로를 만든 뒤, 로봇이 경로를 따라가는 도중 여러 시점에 새 눈 더미(클러스터)를
+추가하고 custom_path_planner.add_clusters()의 수리 시간과 같은 클러스터로 처음부터 다시 계획하는 시간을 비교합니다.
+수리된 경로는 연속성(상하좌우 한 칸 이동), 이미 지나간 구간 보존, 모든 클러스터 커버 여부를 검사합니다.
+
+    python benchmarks/snowfall_repair.py --courts 1 --patches 4 --events 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.mapdata.generate import generate_map, save_map
+from src.mapdata.raster import open_map_raster
+from src.mapdata.occupancy import OccupancyView
+from src.perception.detect import detect_snow_regions
+from src.control.planner import (
+    create_snow_removal_planners, generate_cluster_coverage_path, update_matrix_for_court_and_snow
+)
+from src.control.route_codec import decode_plan
+from src.launch.headless import default_start
+
+DRIFT_SIZE = (6, 10)  # 새 눈 더미 크기 범위 (셀)
+
+
+def random_drift(rng: random.Random, court: dict) -> tuple:
+    """코트 안의 임의 위치에 새 눈 더미 박스 생성 (네트 행은 피함)"""
+    r1, c1, r2, c2 = court['bounds']
+    net = court['net_row']
+    height, width = rng.randint(*DRIFT_SIZE), rng.randint(*DRIFT_SIZE)
+    while True:
+        top = rng.randint(r1 + 2, r2 - height - 2)
+        if top > net + 6 or top + height < net - 6:
+            left = rng.randint(c1 + 2, c2 - width - 2)
+            return ((top, left), (top + height - 1, left + width - 1))
+
+
+def check_plan(data: bytes, matrix, court_structure, old_route: list, progress: int) -> dict:
+    """수리된 계획 검사: 연속성 / 통행 가능 / 지나간 구간 보존 / 클러스터 커버"""
+    plan = decode_plan(data)
+    route, segments = plan['route'], plan['segments']
+    updated = update_matrix_for_court_and_snow(matrix, [seg[0] for seg in segments], court_structure)
+    frozen_end = max([seg[3] for seg in segments if seg[2] < progress] or [0])
+    visited = set(route)
+    return {
+        'contiguous': all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(route, route[1:])),
+        'passable': all(updated.is_free(*cell) for cell in route),
+        'prefix_kept': route[:frozen_end + 1] == old_route[:frozen_end + 1],
+        'covered': all(cell in visited for seg in segments
+                       for cell in generate_cluster_coverage_path(seg[0], seg[1]))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동적 강설 경로 수리 벤치마크')
+    parser.add_argument('--courts', type=int, default=1, help='코트 수')
+    parser.add_argument('--patches', type=int, default=4, help='초기 눈 패치 수')
+    parser.add_argument('--events', type=int, default=3, help='강설 이벤트 수')
+    parser.add_argument('--drifts', type=int, default=2, help='이벤트당 새 눈 더미 수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        colors, _ = generate_map(num_courts=args.courts, num_patches=args.patches,
+                                 patch_size=(8, 10), seed=args.seed, courts_per_row=2)
+        map_path = os.path.join(work_dir, 'snowfall.tcmap')
+        save_map(colors, map_path)
+        detection = detect_snow_regions(map_path, use_cache=False, with_layers=False)
+        matrix = OccupancyView(open_map_raster(map_path)).to_bitgrid()
+
+    court_structure = detection['court_structure']
+    start = default_start(court_structure)
+    path_planner, _ = create_snow_removal_planners(
+        detection['all_boxes'], cluster_stats=detection['cluster_stats'], court_structure=court_structure
+    )
+    route, _ = path_planner(None, matrix, start, start)
+
+    print("=" * 60)
+    print(f"🌨️ Snowfall Repair | 코트 {args.courts}면 | 초기 군집 {len(detection['all_boxes'])} | 경로 {len(route)}")
+    print("=" * 60)
+
+    failed = False
+    for event in range(1, args.events + 1):
+        # 로봇이 남은 경로의 일부를 지나간 시점에 강설
+        progress = min(len(route) - 1, int(len(route) * event / (args.events + 1)))
+        route, _ = path_planner(None, matrix, route[progress], route[progress])
+        full_route = decode_plan(path_planner.export_plan())['route']
+        position = full_route.index(route[0])
+
+        drifts = [random_drift(rng, rng.choice(court_structure['courts'])) for _ in range(args.drifts)]
+        result = path_planner.add_clusters(drifts)
+        data = path_planner.export_plan()
+        checks = check_plan(data, matrix, court_structure, full_route, position)
+
+        clusters = [seg[0] for seg in decode_plan(data)['segments']]
+        replanner, _ = create_snow_removal_planners(clusters, court_structure=court_structure)
+        replan_start = time.perf_counter()
+        replanner(None, matrix, start, start)
+        replan_s = time.perf_counter() - replan_start
+
+        ok = all(checks.values())
+        failed |= not ok
+        print(f"[{event}] 위치 {position} | 추가 {result['inserted']} / 확장 {result['grown']} / 실패 {result['skipped']} | "
+              f"경로 {result['route_length']} | 수리 {result['repair_s'] * 1000:.0f}ms vs 재계획 {replan_s * 1000:.0f}ms | "
+              f"{'✅' if ok else '❌ ' + str(checks)}")
+        route = decode_plan(data)['route']
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
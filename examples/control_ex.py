@@ -33,7 +33,9 @@ def monitor_control():
     
     sim.custom_path_planner, sim.custom_motion_planner = create_snow_removal_planners(
         sim.snow_clusters, 
-        debug_mode=True 
+        debug_mode=True,
+        cluster_stats=sim.cluster_stats,
+        court_structure=sim.court_structure
     )
     
     # 확인용 출력
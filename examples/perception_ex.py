@@ -11,6 +11,7 @@ sys.path.insert(0, project_root)
 
 try:
     from src.perception.detect import detect_snow_regions # detect.py
+    from src.utils import trace
 except ImportError as e:
     print(f"❌ 임포트 오류: src.perception.detect 모듈을 찾을 수 없습니다.\n({e})")
     print("프로젝트 루트에서 실행하거나 PYTHONPATH를 확인해주세요.")
@@ -32,6 +33,7 @@ def monitor_detection():
         return
 
     # 2. 감지 알고리즘 실행
+    trace.enable()
     start_time = time.time()
     result = detect_snow_regions(map_file_path)
     end_time = time.time()
@@ -43,6 +45,8 @@ def monitor_detection():
 
     print_separator("감지 결과 모니터링")
     print(f"⏱  소요 시간: {end_time - start_time:.4f}초")
+    for name, entry in trace.summarize().items():
+        print(f"   - {name:<16} {entry['total_ms']:9.2f}ms")
     print(f"📍 총 감지된 눈 덩어리: {len(result['all_boxes'])}개")
     
     print("\n[상단 코트 영역]")
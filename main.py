@@ -2,6 +2,7 @@
 main.py - 테니스장 제설 로봇 시뮬레이션 실행 파일
 """
 
+import importlib.util
 import sys
 import os
 
@@ -13,21 +14,18 @@ except ImportError as e:
     print(f"   상세: {e}")
     sys.exit(1)
 
-try:
-    import pygame
-    print("✅ pygame 모듈 로드 성공")
-except ImportError:
+# GUI 의존성은 설치 여부만 확인 (실제 로드는 시뮬레이터 초기화 시점)
+if importlib.util.find_spec("pygame") is None:
     print("❌ 에러: pygame이 설치되지 않았습니다.")
     print("   pip install pygame")
     sys.exit(1)
+print("✅ pygame 모듈 확인")
 
-try:
-    from autonavsim2d.autonavsim2d import AutoNavSim2D
-    print("✅ autonavsim2d 모듈 로드 성공")
-except ImportError:
+if importlib.util.find_spec("autonavsim2d") is None:
     print("❌ 에러: autonavsim2d가 설치되지 않았습니다.")
     print("   pip install autonavsim2d")
     sys.exit(1)
+print("✅ autonavsim2d 모듈 확인")
 
 
 def main():
@@ -52,7 +50,8 @@ def main():
         sim = SnowRemovalSimulator(
             map_path=map_path,
             show_frame=True,   # 로봇 좌표계 표시
-            show_grid=True     # 그리드 라인 표시
+            show_grid=True,    # 그리드 라인 표시
+            anytime_budget=10.0  # Greedy 경로로 바로 출발, 10초 동안 백그라운드 경로 개선
         )
         sim.quick_start()
     except KeyboardInterrupt:
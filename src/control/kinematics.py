@@ -0,0 +1,144 @@
+"""
+kinematics.py - 차동 구동(Differential Drive) 로봇 주행 시뮬레이션 (창 없이, 실시간보다 빠르게)
+
+custom_motion_planner가 만든 Waypoint(PoseStamped)를 따라 주행하는 데 걸리는 시간을 추정합니다.
+로봇은 방향이 바뀌는 지점에서 정지 후 제자리 회전하고, 직선 구간은 가속/감속 제한 안에서 주행합니다.
+"""
+
+import math
+
+# AutoNavSim2D 로봇 모델 기준 (robot_model.Robot: 0.005 m/s, m2p = 3779.52)
+PIXELS_PER_METER = 3779.52
+DEFAULT_SPEED = 0.005 * PIXELS_PER_METER   # 최대 직선 속도 (px/s)
+DEFAULT_TURN_RATE = math.pi / 2            # 최대 회전 속도 (rad/s)
+DEFAULT_ACCELERATION = DEFAULT_SPEED * 2   # 직선 가감속 (px/s^2)
+DEFAULT_DT = 0.05                          # 적분 간격 (s)
+
+CELL_SPACING = 5  # 셀 간격 (px), 거리를 셀 단위로도 보고
+ANGLE_EPS = 1e-6
+
+
+def waypoint_positions(waypoints: list) -> list:
+    """PoseStamped 리스트 -> [(x, y), ...] (픽셀 좌표, 연속 중복 제거)"""
+    points = []
+    for waypoint in waypoints:
+        point = (waypoint.pose.position.x, waypoint.pose.position.y)
+        if not points or point != points[-1]:
+            points.append(point)
+    return points
+
+
+def merge_straight_runs(points: list) -> list:
+    """
+    같은 방향으로 이어지는 구간을 하나로 합침 (로봇은 방향이 바뀔 때만 정지)
+
+    Returns:
+        list: 방향 전환 지점 리스트 [(x, y), ...] (시작/끝 포함)
+    """
+    if len(points) < 3:
+        return points[:]
+
+    corners = [points[0]]
+    for prev, curr, nxt in zip(points, points[1:], points[2:]):
+        d1 = (curr[0] - prev[0], curr[1] - prev[1])
+        d2 = (nxt[0] - curr[0], nxt[1] - curr[1])
+        # 외적이 0이고 내적이 양수면 같은 방향
+        if d1[0] * d2[1] - d1[1] * d2[0] != 0 or d1[0] * d2[0] + d1[1] * d2[1] <= 0:
+            corners.append(curr)
+    corners.append(points[-1])
+    return corners
+
+
+def simulate_mission(waypoints: list, robot_pose=None, speed: float = DEFAULT_SPEED,
+                     turn_rate: float = DEFAULT_TURN_RATE, acceleration: float = DEFAULT_ACCELERATION,
+                     dt: float = DEFAULT_DT, record_trace: bool = False) -> dict:
+    """
+    Waypoint 주행 시뮬레이션
+
+    차동 구동 로봇의 (선속도 v, 각속도 w) 모델을 dt 간격으로 적분합니다.
+        x += v * cos(theta) * dt
+        y -= v * sin(theta) * dt   (화면 좌표: 위쪽이 90도, AutoNavSim2D와 동일)
+        theta += w * dt
+
+    Parameters:
+        waypoints: custom_motion_planner가 반환한 PoseStamped 리스트
+        robot_pose: 초기 로봇 Pose (None이면 첫 Waypoint, 90도 방향)
+        speed: 최대 직선 속도 (px/s)
+        turn_rate: 최대 회전 속도 (rad/s)
+        acceleration: 직선 가감속 (px/s^2)
+        dt: 적분 간격 (s)
+        record_trace: True일 경우 (t, x, y, theta) 궤적 포함
+
+    Returns:
+        dict: {'mission_time_s', 'drive_time_s', 'turn_time_s', 'distance_px', 'distance_cells',
+               'turns', 'turn_angle_deg', 'waypoints', 'steps', 'trace'(선택)}
+    """
+    points = waypoint_positions(waypoints)
+    if robot_pose is not None:
+        x, y = robot_pose.position.x, robot_pose.position.y
+        theta = robot_pose.orientation.w
+    elif points:
+        (x, y), theta = points[0], math.pi / 2
+    else:
+        x, y, theta = 0.0, 0.0, math.pi / 2
+
+    drive_time = turn_time = distance = turn_angle = 0.0
+    turns = steps = 0
+    trace = [(0.0, x, y, theta)] if record_trace else None
+
+    def record():
+        if record_trace:
+            trace.append((drive_time + turn_time, x, y, theta))
+
+    for target in merge_straight_runs([(x, y)] + points):
+        dx, dy = target[0] - x, target[1] - y
+        length = math.hypot(dx, dy)
+        if length < ANGLE_EPS:
+            continue
+
+        # 1. 제자리 회전 (정지 상태에서 목표 방향까지)
+        heading = math.atan2(-dy, dx) % (2 * math.pi)
+        error = (heading - theta + math.pi) % (2 * math.pi) - math.pi
+        if abs(error) > ANGLE_EPS:
+            turns += 1
+            turn_angle += abs(error)
+            while abs(error) > ANGLE_EPS:
+                w = math.copysign(min(turn_rate, abs(error) / dt), error)
+                theta = (theta + w * dt) % (2 * math.pi)
+                error -= w * dt
+                turn_time += abs(w) * dt / turn_rate
+                steps += 1
+                record()
+        theta = heading
+
+        # 2. 직선 주행 (남은 거리 안에서 정지할 수 있는 속도로 제한)
+        v = 0.0
+        remaining = length
+        cos_t, sin_t = dx / length, dy / length
+        while remaining > ANGLE_EPS:
+            v = min(speed, v + acceleration * dt, math.sqrt(2 * acceleration * remaining))
+            v = max(v, acceleration * dt)  # 마지막 스텝에서 0으로 수렴해 멈추지 않도록
+            step = min(v * dt, remaining)
+            x += step * cos_t
+            y += step * sin_t
+            remaining -= step
+            distance += step
+            drive_time += step / v
+            steps += 1
+            record()
+        x, y = target
+
+    result = {
+        'mission_time_s': drive_time + turn_time,
+        'drive_time_s': drive_time,
+        'turn_time_s': turn_time,
+        'distance_px': distance,
+        'distance_cells': distance / CELL_SPACING,
+        'turns': turns,
+        'turn_angle_deg': math.degrees(turn_angle),
+        'waypoints': len(points),
+        'steps': steps
+    }
+    if record_trace:
+        result['trace'] = trace
+    return result
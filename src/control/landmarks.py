@@ -0,0 +1,173 @@
+"""
+landmarks.py - ALT(A*, Landmarks, Triangle inequality) 휴리스틱 테이블
+
+Manhattan 거리는 네트를 돌아가야 하는 경로에서 실제 거리보다 크게 작아서, A*가 네트 앞 반쪽 코트를
+대부분 확장한 뒤에야 우회 통로를 찾습니다. 몇 개의 랜드마크(네트 우회 통로 끝, 코트 구역 모서리)에서
+통행 그리드 전체 거리를 미리 구해 두면, 삼각 부등식으로 더 정확한 하한을 얻습니다.
+
+    h(n) = max(Manhattan(n, goal), max_L |d(L, goal) - d(L, n)|)
+
+두 값 모두 일관성(consistent) 있는 하한이므로 최댓값도 일관성이 있고, 경로 길이는 그대로 최단입니다.
+"""
+
+import hashlib
+from array import array
+from collections import deque
+
+import numpy as np
+
+from src.mapdata.bitgrid import BitGrid
+
+MAX_LANDMARKS = 10
+UNREACHABLE = -1
+
+# 그리드 내용 + 랜드마크 -> LandmarkTable 캐시
+_LANDMARK_CACHE = {}
+_LANDMARK_CACHE_SIZE = 4
+
+
+def flood_fill(grid: BitGrid, source: int) -> array:
+    """
+    source(평탄 인덱스)에서 모든 셀까지의 BFS 거리
+
+    Returns:
+        array: 평탄 인덱스별 거리 ('i', 도달 불가 셀은 UNREACHABLE)
+    """
+    bits, stride, size = grid.view(), grid.stride, grid.rows * grid.stride
+    dist = array('i', [UNREACHABLE]) * size
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        step = dist[current] + 1
+        for nxt in (current - stride, current + stride, current - 1, current + 1):
+            if 0 <= nxt < size and dist[nxt] == UNREACHABLE and bits[nxt >> 3] >> (nxt & 7) & 1:
+                dist[nxt] = step
+                queue.append(nxt)
+    return dist
+
+
+def landmark_candidates(zones: list, passage_margin: int, net_thickness: int) -> list:
+    """
+    코트 구역별 랜드마크 후보 (네트 중앙 양쪽 + 네트 우회 통로 양 끝 + 구역 모서리)
+
+    네트 바로 앞/뒤 중앙 랜드마크는 네트 건너편 셀까지의 우회 거리를 거의 그대로 하한으로 줍니다.
+
+    Parameters:
+        zones: planner.estimate_court_zones() 결과 [(r1, c1, r2, c2, net_row), ...]
+        passage_margin: 사이드라인 바깥 우회 통로 폭
+        net_thickness: 네트 중심에서 막힌 행 수
+
+    Returns:
+        list: [(r, c), ...] (네트 중앙, 우회 통로 끝, 모서리 순)
+    """
+    net_sides, passage_ends, corners = [], [], []
+    for r1, c1, r2, c2, net_row in zones:
+        above, below = net_row - net_thickness - 1, net_row + net_thickness + 1
+        left, right = c1 - passage_margin, c2 + passage_margin
+        net_sides.extend([(above, (c1 + c2) // 2), (below, (c1 + c2) // 2)])
+        for col in (left, right):
+            passage_ends.extend([(above, col), (below, col)])
+        corners.extend([(r1, left), (r1, right), (r2, left), (r2, right)])
+    return net_sides + passage_ends + corners
+
+
+def snap_to_free(free: np.ndarray, points: list) -> list:
+    """각 점을 가장 가까운(Manhattan) 통행 가능 셀로 옮김 (중복 제거, 순서 유지)"""
+    cells = np.argwhere(free)
+    if len(cells) == 0:
+        return []
+    snapped = []
+    for r, c in points:
+        r = min(max(r, 0), free.shape[0] - 1)
+        c = min(max(c, 0), free.shape[1] - 1)
+        cell = tuple(cells[np.argmin(np.abs(cells - (r, c)).sum(axis=1))].tolist()) if not free[r, c] else (r, c)
+        if cell not in snapped:
+            snapped.append(cell)
+    return snapped
+
+
+def select_spread(points: list, count: int) -> list:
+    """후보가 많으면 서로 멀리 떨어진 count개 선택 (첫 후보부터 farthest-first)"""
+    if len(points) <= count:
+        return points
+    chosen = [points[0]]
+    while len(chosen) < count:
+        chosen.append(max(
+            (p for p in points if p not in chosen),
+            key=lambda p: min(abs(p[0] - q[0]) + abs(p[1] - q[1]) for q in chosen)
+        ))
+    return chosen
+
+
+class LandmarkTable:
+    """
+    랜드마크별 거리 테이블 + ALT 휴리스틱
+
+    Attributes:
+        landmarks (list): 랜드마크 셀 [(r, c), ...]
+        tables (list): 랜드마크별 평탄 인덱스 거리 array('i')
+        stride (int): 평탄 인덱스 행 간격 (BitGrid.stride)
+    """
+
+    def __init__(self, grid: BitGrid, landmarks: list):
+        self.landmarks = landmarks
+        self.stride = grid.stride
+        self.tables = [flood_fill(grid, grid.to_flat(cell)) for cell in landmarks]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(table.itemsize * len(table) for table in self.tables)
+
+    def heuristic_to(self, goal: tuple):
+        """
+        목표 셀에 대한 휴리스틱 함수 (A* 내부 루프용)
+
+        Returns:
+            function: h(평탄 인덱스) -> max(Manhattan, ALT 하한)
+        """
+        stride = self.stride
+        goal_r, goal_c = goal
+        target = goal_r * stride + goal_c
+        goal_dist = [(table, table[target]) for table in self.tables if table[target] >= 0]
+
+        def estimate(idx: int) -> int:
+            r, c = divmod(idx, stride)
+            best = abs(r - goal_r) + abs(c - goal_c)
+            for table, dg in goal_dist:
+                dn = table[idx]
+                if dn >= 0:
+                    diff = dg - dn if dg > dn else dn - dg
+                    if diff > best:
+                        best = diff
+            return best
+
+        return estimate
+
+
+def build_landmark_table(grid: BitGrid, zones: list, passage_margin: int, net_thickness: int,
+                         max_landmarks: int = MAX_LANDMARKS) -> LandmarkTable:
+    """
+    갱신된 통행 그리드에서 랜드마크 테이블 생성 (그리드 내용별 캐싱)
+
+    Parameters:
+        grid: update_matrix_for_court_and_snow() 결과 BitGrid
+        zones: planner.estimate_court_zones() 결과
+        passage_margin / net_thickness: planner 통행 모델 파라미터
+        max_landmarks: 최대 랜드마크 수 (코트가 많으면 서로 멀리 떨어진 후보 선택)
+
+    Returns:
+        LandmarkTable
+    """
+    key = (hashlib.sha1(grid.bits).hexdigest(), grid.shape, tuple(zones), max_landmarks)
+    if key in _LANDMARK_CACHE:
+        return _LANDMARK_CACHE[key]
+
+    free = grid.to_bool()
+    candidates = snap_to_free(free, landmark_candidates(zones, passage_margin, net_thickness))
+    table = LandmarkTable(grid, select_spread(candidates, max_landmarks))
+
+    if len(_LANDMARK_CACHE) >= _LANDMARK_CACHE_SIZE:
+        _LANDMARK_CACHE.pop(next(iter(_LANDMARK_CACHE)))
+    _LANDMARK_CACHE[key] = table
+    return table
@@ -0,0 +1,139 @@
+"""
+metrics.py - 경로 계획 결과 품질 지표 (NumPy 벡터화)
+
+custom_path_planner가 만든 전체 경로와 군집 리스트로 경로 품질을 계산합니다.
+    - 총 길이 / 이동(transit) 길이 / 제설(coverage) 길이
+    - 회전 수, 역방향(U턴) 수, 총 회전 각도
+    - 2번 이상 방문한 셀 수 (군집 밖 이동 구간의 중복 포함)
+    - 눈 마스크 커버리지 비율
+    - 속도/회전 모델 기반 예상 주행 시간 (kinematics.simulate_mission의 닫힌 형태 근사)
+
+파이썬 반복 없이 배열 연산만 사용하므로 10만 셀 경로도 수 ms 안에 계산됩니다.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from src.control.kinematics import (
+    DEFAULT_SPEED, DEFAULT_TURN_RATE, DEFAULT_ACCELERATION, CELL_SPACING
+)
+
+ANGLE_EPS = 1e-6
+
+
+def path_to_array(path) -> np.ndarray:
+    """[(r, c), ...] -> (N, 2) int 배열 (리스트면 np.array보다 빠른 fromiter 사용)"""
+    if isinstance(path, np.ndarray):
+        return path.reshape(-1, 2).astype(np.int64, copy=False)
+    flat = np.fromiter(itertools.chain.from_iterable(path), dtype=np.int64, count=2 * len(path))
+    return flat.reshape(-1, 2)
+
+
+def cluster_mask(clusters: list, shape: tuple) -> np.ndarray:
+    """군집 Bounding Box 합집합 마스크 (rows, cols) bool"""
+    mask = np.zeros(shape, dtype=bool)
+    for (r1, c1), (r2, c2) in clusters:
+        mask[max(r1, 0):r2 + 1, max(c1, 0):c2 + 1] = True
+    return mask
+
+
+def run_drive_times(lengths: np.ndarray, speed: float, acceleration: float) -> np.ndarray:
+    """
+    정지 -> 가속 -> (최고 속도) -> 감속 -> 정지 직선 구간 주행 시간 (사다리꼴 속도 프로파일)
+
+    Parameters:
+        lengths: 구간 길이 배열 (px)
+        speed: 최대 속도 (px/s)
+        acceleration: 가감속 (px/s^2)
+
+    Returns:
+        np.ndarray: 구간별 주행 시간 (s)
+    """
+    reaches_speed = lengths >= speed * speed / acceleration
+    return np.where(reaches_speed,
+                    lengths / speed + speed / acceleration,
+                    2.0 * np.sqrt(lengths / acceleration))
+
+
+def compute_plan_metrics(path, clusters: list, shape: tuple = None, snow_mask: np.ndarray = None,
+                         speed: float = DEFAULT_SPEED, turn_rate: float = DEFAULT_TURN_RATE,
+                         acceleration: float = DEFAULT_ACCELERATION,
+                         initial_heading: float = math.pi / 2) -> dict:
+    """
+    전체 경로 품질 지표 계산
+
+    Parameters:
+        path: 전체 경로 [(r, c), ...] 또는 (N, 2) 배열
+        clusters: 눈 군집 리스트 [((r_min, c_min), (r_max, c_max)), ...]
+        shape: 그리드 크기 (rows, cols) (None이면 경로/군집 좌표로 추정)
+        snow_mask: 눈 셀 마스크 (rows, cols) bool (None이면 군집 Box 합집합)
+        speed: 최대 직선 속도 (px/s)
+        turn_rate: 최대 회전 속도 (rad/s)
+        acceleration: 직선 가감속 (px/s^2)
+        initial_heading: 출발 시 로봇 방향 (rad, 화면 위쪽이 pi/2)
+
+    Returns:
+        dict: {'waypoints', 'length_cells', 'transit_cells', 'coverage_cells', 'turns', 'reversals',
+               'turn_angle_deg', 'unique_cells', 'revisited_cells', 'revisited_transit_cells',
+               'snow_cells', 'coverage_ratio', 'est_drive_time_s', 'est_turn_time_s', 'est_time_s'}
+    """
+    cells = path_to_array(path)
+    if shape is None:
+        extent = [cells.max(axis=0) + 1] if len(cells) else []
+        extent += [np.array(box[1]) + 1 for box in clusters]
+        shape = tuple(int(v) for v in np.max(extent, axis=0)) if extent else (1, 1)
+    rows, cols = shape
+
+    in_cluster_grid = cluster_mask(clusters, shape)
+    if snow_mask is None:
+        snow_mask = in_cluster_grid
+    snow_mask = np.asarray(snow_mask, dtype=bool)
+
+    # 1. 길이: 양 끝 셀이 모두 군집 안이면 제설, 아니면 이동 구간
+    steps = np.diff(cells, axis=0)
+    step_lengths = np.hypot(steps[:, 0], steps[:, 1])
+    in_cluster = in_cluster_grid[cells[:, 0], cells[:, 1]]
+    coverage_step = in_cluster[1:] & in_cluster[:-1]
+    length = float(step_lengths.sum())
+    coverage_length = float(step_lengths[coverage_step].sum())
+
+    # 2. 회전: 제자리 정지 스텝은 제외하고 연속 방향 변화만 셈
+    moving = step_lengths > 0
+    headings = np.arctan2(-steps[moving, 0], steps[moving, 1])
+    headings = np.concatenate(([initial_heading], headings))
+    delta = np.abs((np.diff(headings) + math.pi) % (2 * math.pi) - math.pi)
+    turning = delta > ANGLE_EPS
+    turn_angle = float(delta.sum())
+
+    # 3. 방문 횟수 (선형 인덱스 bincount)
+    visits = np.bincount(cells[:, 0] * cols + cells[:, 1], minlength=rows * cols).reshape(rows, cols)
+    visited = visits > 0
+    revisited = visits > 1
+    snow_cells = int(snow_mask.sum())
+
+    # 4. 예상 시간: 방향이 바뀌는 지점마다 정지 후 회전 + 직선 구간 사다리꼴 주행
+    run_starts = np.flatnonzero(turning[1:]) + 1 if len(turning) > 1 else np.array([], dtype=np.int64)
+    run_lengths = np.add.reduceat(step_lengths[moving], np.concatenate(([0], run_starts))) \
+        if moving.any() else np.array([])
+    drive_time = float(run_drive_times(run_lengths * CELL_SPACING, speed, acceleration).sum())
+    turn_time = turn_angle / turn_rate
+
+    return {
+        'waypoints': int(len(cells)),
+        'length_cells': length,
+        'transit_cells': length - coverage_length,
+        'coverage_cells': coverage_length,
+        'turns': int(turning.sum()),
+        'reversals': int((np.abs(delta - math.pi) < ANGLE_EPS).sum()),
+        'turn_angle_deg': math.degrees(turn_angle),
+        'unique_cells': int(visited.sum()),
+        'revisited_cells': int(revisited.sum()),
+        'revisited_transit_cells': int((revisited & ~in_cluster_grid).sum()),
+        'snow_cells': snow_cells,
+        'coverage_ratio': float((visited & snow_mask).sum() / snow_cells) if snow_cells else 1.0,
+        'est_drive_time_s': drive_time,
+        'est_turn_time_s': turn_time,
+        'est_time_s': drive_time + turn_time
+    }
@@ -0,0 +1,103 @@
+"""
+multires.py - 다중 해상도(coarse-to-fine) 이동 경로 탐색용 그리드
+
+통행 그리드를 factor x factor 블록으로 보수적으로 축소(자식 셀이 하나라도 막혀 있으면 막힘)해
+거친 경로를 먼저 찾고, 그 경로 주변 통로(corridor) 안에서만 원래 해상도로 다시 탐색합니다.
+빈 코트를 가로지르는 긴 이동에서 탐색 영역이 통로 폭으로 줄어듭니다.
+통로 안에서 경로를 찾지 못하면 planner가 전체 해상도 탐색으로 되돌아갑니다.
+"""
+
+import numpy as np
+
+from src.mapdata.bitgrid import BitGrid
+
+DEFAULT_FACTOR = 4      # 축소 배율 (블록 한 변의 셀 수)
+DEFAULT_CORRIDOR = 2    # 거친 경로 주변으로 열어줄 블록 수
+
+
+def downsample(free: np.ndarray, factor: int) -> np.ndarray:
+    """
+    보수적 축소: 블록 안의 모든 셀이 통행 가능해야 통행 가능 (맵 끝의 잘린 블록은 막힘)
+
+    Parameters:
+        free: (rows, cols) bool 배열
+        factor: 축소 배율
+
+    Returns:
+        np.ndarray: (ceil(rows / factor), ceil(cols / factor)) bool 배열
+    """
+    rows, cols = free.shape
+    coarse_rows, coarse_cols = -(-rows // factor), -(-cols // factor)
+    padded = np.zeros((coarse_rows * factor, coarse_cols * factor), dtype=bool)
+    padded[:rows, :cols] = free
+    return padded.reshape(coarse_rows, factor, coarse_cols, factor).all(axis=(1, 3))
+
+
+class GridPyramid:
+    """
+    원본 해상도 + 축소 해상도 통행 그리드 (갱신된 통행 행렬당 1회 생성)
+
+    Attributes:
+        fine (BitGrid): 원본 통행 그리드
+        coarse (BitGrid): 축소 통행 그리드
+        factor (int): 축소 배율
+        corridor (int): 거친 경로 주변으로 열어줄 블록 수
+    """
+
+    def __init__(self, fine: BitGrid, factor: int = DEFAULT_FACTOR, corridor: int = DEFAULT_CORRIDOR):
+        self.fine = fine
+        self.factor = factor
+        self.corridor = corridor
+        self._free = fine.to_bool()
+        self._coarse_free = downsample(self._free, factor)
+        self.coarse = BitGrid.from_bool(self._coarse_free)
+
+    def to_coarse(self, cell: tuple) -> tuple:
+        """원본 셀 -> 그 셀을 포함하는 블록"""
+        return (cell[0] // self.factor, cell[1] // self.factor)
+
+    def coarse_with(self, *cells: tuple) -> BitGrid:
+        """
+        주어진 원본 셀들이 속한 블록을 통행 가능으로 연 축소 그리드
+
+        시작/목표 셀이 벽 옆 블록(보수적 축소로 막힘)에 있어도 거친 탐색을 시작할 수 있게 합니다.
+        """
+        blocks = [self.to_coarse(cell) for cell in cells]
+        if all(self._coarse_free[block] for block in blocks):
+            return self.coarse
+        coarse_free = self._coarse_free.copy()
+        for block in blocks:
+            coarse_free[block] = True
+        return BitGrid.from_bool(coarse_free)
+
+    def corridor_grid(self, coarse_path: list) -> BitGrid:
+        """
+        거친 경로 주변 corridor 블록 안의 원본 통행 셀만 남긴 그리드
+
+        Parameters:
+            coarse_path: 축소 그리드 경로 [(br, bc), ...]
+
+        Returns:
+            BitGrid: 원본 크기 통행 그리드 (통로 밖은 막힘)
+        """
+        coarse_rows, coarse_cols = self._coarse_free.shape
+        blocks = np.zeros((coarse_rows, coarse_cols), dtype=bool)
+        cells = np.asarray(coarse_path, dtype=np.int64).reshape(-1, 2)
+        blocks[cells[:, 0], cells[:, 1]] = True
+
+        # corridor 블록만큼 팽창 (상하좌우 + 대각)
+        for _ in range(self.corridor):
+            grown = blocks.copy()
+            grown[1:, :] |= blocks[:-1, :]
+            grown[:-1, :] |= blocks[1:, :]
+            grown[:, 1:] |= blocks[:, :-1]
+            grown[:, :-1] |= blocks[:, 1:]
+            grown[1:, 1:] |= blocks[:-1, :-1]
+            grown[1:, :-1] |= blocks[:-1, 1:]
+            grown[:-1, 1:] |= blocks[1:, :-1]
+            grown[:-1, :-1] |= blocks[1:, 1:]
+            blocks = grown
+
+        rows, cols = self._free.shape
+        mask = np.repeat(np.repeat(blocks, self.factor, axis=0), self.factor, axis=1)[:rows, :cols]
+        return BitGrid.from_bool(self._free & mask)
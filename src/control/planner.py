@@ -4,85 +4,202 @@ planner.py - 제설 로봇 경로 계획 및 모션 제어
 
 import time
 import math
+import threading
+from collections import deque
+
+import numpy as np
+
+from src.control.landmarks import build_landmark_table
+from src.control.multires import GridPyramid
+from src.control.route_codec import encode_plan, decode_plan
+from src.mapdata.bitgrid import BitGrid
+from src.utils import trace
+
+# 적설 밀도 기반 스케줄링 파라미터
+SWEEP_PASS_THRESHOLDS = (0.7, 0.9)  # density가 각 값 이상이면 패스 1회 추가
+PRIORITY_GAIN = 1.0                 # 밀도가 높을수록 이동 비용을 할인하는 비율
+
+# 코트 구조 분석 결과 사용 시 코트 경계 바깥으로 열어줄 여유 행 수
+COURT_BOUNDS_MARGIN = 5
+
+# 통행 모델 파라미터
+PASSAGE_MARGIN = 30     # 사이드라인 바깥으로 열어줄 우회 통로 폭
+NET_THICKNESS = 4       # 네트 중심 행에서 위아래로 막아둘 행 수
+NET_WIDTH_MARGIN = 5    # 네트를 코트 폭보다 양옆으로 더 막아둘 열 수
+
+# 맵별 통행 마스크 캐시 (맵 크기 + 코트 구역 + 눈 군집 -> 마스크, 비트 압축 오버레이)
+_PASSABILITY_CACHE = {}
+_PASSABILITY_CACHE_SIZE = 8
 
 # ==================== Helper Functions ====================
 
-def update_matrix_for_court_and_snow(matrix: list, snow_list: list) -> list:
+def estimate_court_zones(snow_list: list, rows: int, cols: int, court_structure: dict = None) -> list:
+    """
+    통행 영역을 열어줄 코트 구역 목록 계산
+
+    court_structure(코트 구조 분석 결과)가 있으면 실제 코트 경계/네트를 사용하고,
+    없으면 눈 클러스터 전체의 Bounding Box로 코트 1면을 추정합니다.
+
+    Parameters:
+        snow_list: 감지된 눈 클러스터 리스트 [((r1, c1), (r2, c2)), ...]
+        rows, cols: 맵 크기
+        court_structure: src.perception.court.analyze_court_structure() 결과 (선택)
+
+    Returns:
+        list: [(court_r1, court_c1, court_r2, court_c2, net_row), ...]
+    """
+    if court_structure and court_structure['courts']:
+        zones = []
+        for court in court_structure['courts']:
+            r1, c1, r2, c2 = court['bounds']
+            zones.append((
+                max(0, r1 - COURT_BOUNDS_MARGIN),
+                c1,
+                min(rows - 1, r2 + COURT_BOUNDS_MARGIN),
+                c2,
+                court['net_row']
+            ))
+        return zones
+
+    if not snow_list:
+        return []
+
+    # 1. 모든 클러스터를 포함하는 Bounding Box (코트 영역)
+    all_r1 = min(cluster[0][0] for cluster in snow_list)
+    all_c1 = min(cluster[0][1] for cluster in snow_list)
+    all_r2 = max(cluster[1][0] for cluster in snow_list)
+    all_c2 = max(cluster[1][1] for cluster in snow_list)
+    
+    # 코트 영역 (+ 20px)
+    court_r1 = max(0, all_r1 - 20)
+    court_c1 = max(0, all_c1 - 20) # 왼쪽 사이드라인 근처
+    court_r2 = min(rows - 1, all_r2 + 20)
+    court_c2 = min(cols - 1, all_c2 + 20) # 오른쪽 사이드라인 근처
+    
+    # 2. 네트 위치 추정 (중앙)
+    net_row_approx = (court_r1 + court_r2) // 2
+    
+    return [(court_r1, court_c1, court_r2, court_c2, net_row_approx)]
+
+
+def zone_passages(zones: list, rows: int, cols: int) -> list:
+    """
+    코트 구역 사이 통로 (이웃한 코트 구역 사이의 빈 공간)
+
+    행 범위가 겹치는 코트끼리는 가로 통로, 열 범위가 겹치는 코트끼리는 세로 통로를
+    가장 가까운 이웃과만 연결합니다 (다른 코트를 가로지르는 통로는 만들지 않음).
+
+    Parameters:
+        zones: [(r1, c1, r2, c2), ...] 우회 통로까지 포함한 코트 구역 (포함 좌표)
+        rows, cols: 맵 크기
+
+    Returns:
+        list: 통로 영역 [(r1, c1, r2, c2), ...] (포함 좌표)
+    """
+    passages = []
+    for i, (r1, c1, r2, c2) in enumerate(zones):
+        right = [z for j, z in enumerate(zones) if j != i and z[1] > c2 and z[0] <= r2 and z[2] >= r1]
+        below = [z for j, z in enumerate(zones) if j != i and z[0] > r2 and z[1] <= c2 and z[3] >= c1]
+        if right:
+            nr1, nc1, nr2, _ = min(right, key=lambda z: z[1])
+            if nc1 - c2 > 1:
+                passages.append((max(r1, nr1), c2 + 1, min(r2, nr2), nc1 - 1))
+        if below:
+            nr1, nc1, _, nc2 = min(below, key=lambda z: z[0])
+            if nr1 - r2 > 1:
+                passages.append((r2 + 1, max(c1, nc1), nr1 - 1, min(c2, nc2)))
+    return [(r1, c1, min(r2, rows - 1), min(c2, cols - 1)) for r1, c1, r2, c2 in passages]
+
+
+def build_passability_masks(shape: tuple, snow_list: list, court_structure: dict = None) -> tuple:
+    """
+    코트/네트/눈 구역 통행 마스크 계산 (맵당 1회, 결과 캐싱)
+
+    여러 코트가 있는 시설에서도 코트마다 구역과 네트를 따로 계산합니다.
+    모든 구역과 통로를 먼저 연 뒤 모든 네트를 닫으므로, 이웃 코트의 우회 통로가
+    다른 코트의 네트를 열지 않습니다.
+
+    Parameters:
+        shape: 맵 크기 (rows, cols)
+        snow_list: 감지된 눈 클러스터 리스트 [((r1, c1), (r2, c2)), ...]
+        court_structure: 코트 구조 분석 결과 (선택, 없으면 눈 영역으로 코트 1면 추정)
+
+    Returns:
+        tuple: (open_mask, net_mask, snow_mask) - 각각 (rows, cols) bool 배열
+            통행 가능 = 원본 | (open_mask & ~net_mask) | snow_mask
+    """
+    rows, cols = shape
+    court_zones = estimate_court_zones(snow_list, rows, cols, court_structure)
+    key = (rows, cols, tuple(court_zones), tuple(snow_list))
+    if key in _PASSABILITY_CACHE:
+        return _PASSABILITY_CACHE[key][:3]
+
+    open_mask = np.zeros(shape, dtype=bool)
+    net_mask = np.zeros(shape, dtype=bool)
+    snow_mask = np.zeros(shape, dtype=bool)
+
+    # 1. 코트 구역 + 사이드라인 바깥 우회 통로
+    zones = []
+    for court_r1, court_c1, court_r2, court_c2, net_row in court_zones:
+        safe_c1 = max(0, court_c1 - PASSAGE_MARGIN)
+        safe_c2 = min(cols - 1, court_c2 + PASSAGE_MARGIN)
+        zones.append((court_r1, safe_c1, court_r2, safe_c2))
+
+        # 네트 (코트 폭보다 약간 넓게, 우회 통로는 남김)
+        net_r1 = max(court_r1, net_row - NET_THICKNESS)
+        net_r2 = min(court_r2, net_row + NET_THICKNESS)
+        net_c1 = max(safe_c1, court_c1 - NET_WIDTH_MARGIN)
+        net_c2 = min(safe_c2, court_c2 + NET_WIDTH_MARGIN)
+        net_mask[net_r1:net_r2 + 1, net_c1:net_c2 + 1] = True
+
+    # 2. 코트 사이 통로
+    for r1, c1, r2, c2 in zones + zone_passages(zones, rows, cols):
+        open_mask[r1:r2 + 1, c1:c2 + 1] = True
+
+    # 3. 눈 영역 (혹시 네트 위에 눈이 찍혔을 경우를 대비해 네트보다 우선)
+    for (r1, c1), (r2, c2) in snow_list:
+        snow_mask[max(r1, 0):r2 + 1, max(c1, 0):c2 + 1] = True
+
+    # 4. 원본에 OR 할 비트 압축 오버레이 (BitGrid 행렬용)
+    overlay = BitGrid.from_bool((open_mask & ~net_mask) | snow_mask)
+
+    if len(_PASSABILITY_CACHE) >= _PASSABILITY_CACHE_SIZE:
+        _PASSABILITY_CACHE.pop(next(iter(_PASSABILITY_CACHE)))
+    _PASSABILITY_CACHE[key] = (open_mask, net_mask, snow_mask, overlay)
+    return open_mask, net_mask, snow_mask
+
+
+def passability_overlay(shape: tuple, snow_list: list, court_structure: dict = None) -> BitGrid:
+    """build_passability_masks()의 통행 가능 추가 영역 (비트 압축, 캐싱)"""
+    build_passability_masks(shape, snow_list, court_structure)
+    rows, cols = shape
+    court_zones = estimate_court_zones(snow_list, rows, cols, court_structure)
+    return _PASSABILITY_CACHE[(rows, cols, tuple(court_zones), tuple(snow_list))][3]
+
+
+def update_matrix_for_court_and_snow(matrix: list, snow_list: list, court_structure: dict = None) -> list:
     """
     제설 작업을 위한 맵 통행 가능 영역(Matrix) 업데이트
 
     1. 네트를 제외한 다른 장애물(코트 외곽선, 내부 라인, 눈 등)을 통행 가능(1)으로 변경
+    2. 코트가 여러 면이면 이웃한 코트 사이 통로도 통행 가능으로 변경
 
     Parameters:
         matrix: 원본 그리드 맵 데이터 (0: 장애물, 1: 이동가능) [[x,y, state], [x,y, state], ... ]
+                또는 BitGrid (비트 압축 - 바이트 단위 OR 한 번으로 갱신)
         snow_list: 감지된 눈 클러스터 리스트 [((좌상단 x, y),(우하단 x, y)), ((좌상단 x, y),(우하단 x, y)), ... ]
+        court_structure: 코트 구조 분석 결과 (선택, 없으면 눈 영역으로 코트 추정)
 
     Returns:
-        list: 업데이트된 2D 그리드 맵 [[x,y, state], [x,y, state], ... ]
-    """
-    new_matrix = [row[:] for row in matrix]
-    rows = len(new_matrix)
-    cols = len(new_matrix[0])
-
-    court_cells_changed = 0
-    
-    if snow_list:
-        # 1. 모든 클러스터를 포함하는 Bounding Box (코트 영역)
-        all_r1 = min(cluster[0][0] for cluster in snow_list)
-        all_c1 = min(cluster[0][1] for cluster in snow_list)
-        all_r2 = max(cluster[1][0] for cluster in snow_list)
-        all_c2 = max(cluster[1][1] for cluster in snow_list)
-        
-        # 코트 영역 (+ 20px)
-        court_r1 = max(0, all_r1 - 20)
-        court_c1 = max(0, all_c1 - 20) # 왼쪽 사이드라인 근처
-        court_r2 = min(rows - 1, all_r2 + 20)
-        court_c2 = min(cols - 1, all_c2 + 20) # 오른쪽 사이드라인 근처
-        
-        # 2. 네트 위치 추정 (중앙)
-        net_row_approx = (court_r1 + court_r2) // 2
-        net_thickness = 4
-        
-        # 3. 우회 경로(Passage) 확보 범위 설정
-        # 사이드라인보다 더 바깥쪽으로 20픽셀 정도 추가 공간을 뚫어줌
-        passage_margin = 30
-        safe_c1 = max(0, court_c1 - passage_margin)
-        safe_c2 = min(cols - 1, court_c2 + passage_margin)
-        
-        # 4. 영역 설정 루프
-        # court_r1 ~ court_r2 (세로 전체), safe_c1 ~ safe_c2 (가로 확장 범위)
-        for r in range(court_r1, court_r2 + 1):
-            for c in range(safe_c1, safe_c2 + 1):
-                
-                # (A) 네트 위치인지 확인
-                is_net_row = abs(r - net_row_approx) <= net_thickness
-                
-                # (B) 코트 내부(사이드라인 안쪽)인지 확인
-                # 실제 코트 너비보다 약간 좁게 잡아서 네트 부분만 정확히 장애물로 남김
-                is_inside_court_width = (court_c1 - 5 <= c <= court_c2 + 5)
-                
-                # 조건: 네트 위치이면서 동시에 코트 안쪽이면 -> 장애물 유지 (건너뜀)
-                if is_net_row and is_inside_court_width:
-                    continue
-                
-                # 그 외 모든 영역(일반 바닥, 라인, 네트 옆 통로) -> 통행 가능(1)
-                if new_matrix[r][c] == 0:
-                    new_matrix[r][c] = 1
-                    court_cells_changed += 1
-
-    # 5. 눈 영역 확인 (혹시 네트 위에 눈이 찍혔을 경우를 대비)
-    snow_cells_changed = 0
-    for (top_left, bottom_right) in snow_list:
-        r1, c1 = top_left
-        r2, c2 = bottom_right
-        for r in range(r1, r2 + 1):
-            for c in range(c1, c2 + 1):
-                if 0 <= r < rows and 0 <= c < cols:
-                    if new_matrix[r][c] == 0:
-                        new_matrix[r][c] = 1
-                        snow_cells_changed += 1
-    
-    return new_matrix
+        list: 업데이트된 2D 그리드 맵 [[x,y, state], [x,y, state], ... ] (입력이 BitGrid면 BitGrid)
+    """
+    if isinstance(matrix, BitGrid):
+        return matrix | passability_overlay(matrix.shape, snow_list, court_structure)
+
+    base = np.asarray(matrix, dtype=bool)
+    open_mask, net_mask, snow_mask = build_passability_masks(base.shape, snow_list, court_structure)
+    passable = base | (open_mask & ~net_mask) | snow_mask
+    return passable.astype(np.uint8).tolist()
 
 
 def get_neighbors(pos: tuple, matrix: list) -> list:
@@ -146,7 +263,8 @@ def reconstruct_path(came_from: dict, current: tuple) -> list:
     return path
 
 
-def a_star(matrix: list, start: tuple, goal: tuple) -> list:
+def a_star(matrix: list, start: tuple, goal: tuple, landmarks=None, bidirectional: bool = False,
+           pyramid=None) -> list:
     """
     A* 알고리즘을 이용한 최단 경로 탐색
     
@@ -154,53 +272,190 @@ def a_star(matrix: list, start: tuple, goal: tuple) -> list:
         matrix: 맵 데이터 (2D List)
         start: 시작 좌표 (r, c)
         goal: 목표 좌표 (r, c)
+        landmarks: 같은 행렬로 만든 LandmarkTable (선택)
+                   주어지면 Manhattan 대신 ALT 휴리스틱 사용 (경로 길이는 같고 확장 노드 수 감소)
+        bidirectional: True면 양방향 BFS 사용 (균일 비용 그리드라 A*와 같은 길이, landmarks 무시)
+        pyramid: 같은 행렬로 만든 GridPyramid (선택)
+                 주어지면 축소 그리드 경로 주변 통로 안에서만 탐색 (다른 옵션 무시, 최단이 아닐 수 있음)
 
     Returns:
         list: 경로 좌표 리스트 (실패 시 빈 리스트 [])
               [(r1, c1), (r2, c2), ...]
     """
-    if not (0 <= start[0] < len(matrix) and 0 <= start[1] < len(matrix[0])):
-        return []
-    if not (0 <= goal[0] < len(matrix) and 0 <= goal[1] < len(matrix[0])):
-        return []
+    if pyramid is not None:
+        mode = 'multires'
+    elif bidirectional:
+        mode = 'bidirectional'
+    else:
+        mode = 'alt' if landmarks is not None else 'manhattan'
+    with trace.span('a_star', cat='planner', start=start, goal=goal, heuristic=mode) as sp:
+        if pyramid is not None:
+            path, expansions, fallback = _multires_search(pyramid, start, goal)
+            sp['fallback'] = fallback
+        elif bidirectional:
+            path, expansions = _bidirectional_search(matrix, start, goal)
+        else:
+            path, expansions = _a_star_search(matrix, start, goal, landmarks)
+        sp['expansions'] = expansions
+        sp['path_length'] = len(path)
+    return path
+
+
+def _a_star_search(matrix: list, start: tuple, goal: tuple, landmarks=None) -> tuple:
+    """
+    a_star() 본체 - (경로, 확장한 노드 수) 반환
+
+    비트 압축 그리드의 평탄 인덱스(r * stride + c)로 탐색합니다 (행 패딩 비트가 장애물이므로
+    좌우 이웃은 열 범위 검사가 필요 없음). 열린 목록 순서/이웃 순서(상하좌우)는 그대로라
+    2D List 행렬과 같은 경로를 반환합니다.
+
+    landmarks가 주어지면 ALT 휴리스틱을 쓰고 f가 같은 노드 중 g가 큰 노드를 먼저 확장합니다.
+    Manhattan 거리가 거의 정확한 빈 코트에서는 f가 같은 노드가 직사각형 전체에 퍼져 있어서
+    동점 처리만으로도 확장 수가 크게 줄어듭니다 (경로 길이는 같고 모양은 달라질 수 있음).
+    """
+    grid = BitGrid.from_matrix(matrix)
+    if not (0 <= start[0] < grid.rows and 0 <= start[1] < grid.cols):
+        return [], 0
+    if not (0 <= goal[0] < grid.rows and 0 <= goal[1] < grid.cols):
+        return [], 0
     
-    if matrix[start[0]][start[1]] == 0:
-        return []
-    if matrix[goal[0]][goal[1]] == 0:
-        return []
+    if not grid.is_free(*start):
+        return [], 0
+    if not grid.is_free(*goal):
+        return [], 0
+    
+    bits = grid.view()
+    stride = grid.stride
+    size = grid.rows * stride
+    goal_r, goal_c = goal
+    source = grid.to_flat(start)
+    target = grid.to_flat(goal)
+    estimate = landmarks.heuristic_to(goal) if landmarks is not None and landmarks.stride == stride else None
+    # ALT 모드: f가 같으면 g가 큰(목표에 가까운) 노드 우선 -> f_score = f * tie_scale - g
+    tie_scale = size + 1
     
-    open_set = [start]
+    expansions = 0
+    open_set = [source]
     closed_set = set()
     came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    g_score = {source: 0}
+    f_score = {source: estimate(source) * tie_scale if estimate else heuristic(start, goal)}
     
     while open_set:
-        current = min(open_set, key=lambda x: f_score.get(x, float('inf')))
+        current = min(open_set, key=f_score.__getitem__)
         
-        if current == goal:
-            return reconstruct_path(came_from, current)
+        if current == target:
+            return [grid.from_flat(idx) for idx in reconstruct_path(came_from, current)], expansions
         
         open_set.remove(current)
         closed_set.add(current)
+        expansions += 1
         
-        for neighbor in get_neighbors(current, matrix):
+        tentative_g = g_score[current] + 1
+        for neighbor in (current - stride, current + stride, current - 1, current + 1):
+            if not (0 <= neighbor < size and bits[neighbor >> 3] >> (neighbor & 7) & 1):
+                continue
             if neighbor in closed_set:
                 continue
             
-            tentative_g = g_score[current] + 1
-            
             if tentative_g < g_score.get(neighbor, float('inf')):
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor, goal)
+                if estimate:
+                    f_score[neighbor] = (tentative_g + estimate(neighbor)) * tie_scale - tentative_g
+                else:
+                    nr, nc = divmod(neighbor, stride)
+                    f_score[neighbor] = tentative_g + abs(nr - goal_r) + abs(nc - goal_c)
                 if neighbor not in open_set:
                     open_set.append(neighbor)
     
-    return []
+    return [], expansions
+
+
+def _bidirectional_search(matrix: list, start: tuple, goal: tuple) -> tuple:
+    """
+    양방향 BFS - (경로, 확장한 노드 수) 반환
+
+    시작/목표 양쪽에서 한 층(같은 거리)씩 번갈아 넓히되, 항상 프런티어가 작은 쪽을 넓힙니다.
+    모든 간선 비용이 1이고 층 단위로 넓히므로, 한쪽이 상대편이 이미 방문한 셀을 처음 발견한 순간
+    (앞쪽 거리 + 1 + 뒤쪽 거리)가 최단 거리입니다 - 더 짧은 경로가 있었다면 그 경로 위의 셀이
+    이전 층에서 이미 양쪽 모두에 방문되어 먼저 만났어야 하기 때문입니다.
+    네트 같은 병목 양쪽에서 반지름이 절반인 두 영역만 탐색하고, 열린 목록 최솟값 탐색이 없습니다.
+    """
+    grid = BitGrid.from_matrix(matrix)
+    if not (grid.is_free(*start) and grid.is_free(*goal)):
+        return [], 0
+
+    bits = grid.view()
+    stride = grid.stride
+    size = grid.rows * stride
+    source = grid.to_flat(start)
+    target = grid.to_flat(goal)
+    if source == target:
+        return [start], 0
+
+    parents = ({source: None}, {target: None})  # (시작 쪽, 목표 쪽) 방문 셀 -> 이전 셀
+    frontiers = [[source], [target]]
+    expansions = 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = parents[side], parents[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            expansions += 1
+            for neighbor in (current - stride, current + stride, current - 1, current + 1):
+                if not (0 <= neighbor < size and bits[neighbor >> 3] >> (neighbor & 7) & 1):
+                    continue
+                if neighbor in own:
+                    continue
+                own[neighbor] = current
+                if neighbor in other:
+                    # 만난 셀에서 양쪽 부모를 따라가 경로 연결
+                    forward, backward = [], []
+                    node = neighbor
+                    while node is not None:
+                        forward.append(node)
+                        node = parents[0][node]
+                    node = parents[1][neighbor]
+                    while node is not None:
+                        backward.append(node)
+                        node = parents[1][node]
+                    return [grid.from_flat(idx) for idx in forward[::-1] + backward], expansions
+                next_frontier.append(neighbor)
+        frontiers[side] = next_frontier
 
+    return [], expansions
 
-def find_nearest_cluster(matrix: list, start: tuple, snow_list: list) -> tuple:
+
+def _multires_search(pyramid, start: tuple, goal: tuple) -> tuple:
+    """
+    다중 해상도 탐색 - (경로, 확장한 노드 수, 전체 탐색 여부) 반환
+
+    1) 보수적 축소 그리드에서 시작/목표 블록 사이 경로를 양방향 BFS로 찾고
+    2) 그 경로 주변 corridor 블록 안에서만 원본 해상도 양방향 BFS로 실제 경로를 찾습니다.
+    축소 그리드에 경로가 없거나(좁은 통로가 막힘) 통로 안에서 연결되지 않으면 전체 그리드를 탐색합니다.
+    통로 안 경로는 통로 밖 지름길을 쓰지 못하므로 최단보다 길 수 있습니다.
+    """
+    fine = pyramid.fine
+    if not (fine.is_free(*start) and fine.is_free(*goal)):
+        return [], 0, False
+
+    coarse = pyramid.coarse_with(start, goal)
+    coarse_path, expansions = _bidirectional_search(coarse, pyramid.to_coarse(start), pyramid.to_coarse(goal))
+    if coarse_path:
+        path, fine_expansions = _bidirectional_search(pyramid.corridor_grid(coarse_path), start, goal)
+        expansions += fine_expansions
+        if path:
+            return path, expansions, False
+
+    # 통로 실패 -> 전체 해상도 탐색
+    path, fine_expansions = _bidirectional_search(fine, start, goal)
+    return path, expansions + fine_expansions, True
+
+
+def find_nearest_cluster(matrix: list, start: tuple, snow_list: list, priorities: dict = None,
+                         landmarks=None, bidirectional: bool = False, pyramid=None) -> tuple:
     """
     현재 위치에서 가장 가까운 눈 클러스터 및 진입점 탐색
     
@@ -209,6 +464,11 @@ def find_nearest_cluster(matrix: list, start: tuple, snow_list: list) -> tuple:
         start: 현재 로봇 위치 (r, c)
         snow_list: 남은 눈 클러스터 리스트
                   [((r_min, c_min), (r_max, c_max)), ...]
+        priorities: 클러스터별 우선순위 {cluster: weight} (선택)
+                    경로 길이를 weight로 나눈 값이 가장 작은 클러스터를 선택
+        landmarks: A* ALT 휴리스틱용 LandmarkTable (선택)
+        bidirectional: True면 이동 경로를 양방향 BFS로 탐색
+        pyramid: 다중 해상도 탐색용 GridPyramid (선택)
 
     Returns:
         tuple: (최적 클러스터, 이동 경로 리스트, 진입 좌표)
@@ -223,11 +483,12 @@ def find_nearest_cluster(matrix: list, start: tuple, snow_list: list) -> tuple:
         (r1, c1), (r2, c2) = cluster
         # 클러스터의 4개 코너를 진입 후보점으로
         entry_points = [(r1, c1), (r1, c2), (r2, c1), (r2, c2)]
+        weight = priorities.get(cluster, 1.0) if priorities else 1.0
         
         for ep in entry_points:
-            path = a_star(matrix, start, ep)
-            if path and len(path) < min_len:
-                min_len = len(path)
+            path = a_star(matrix, start, ep, landmarks, bidirectional, pyramid)
+            if path and len(path) / weight < min_len:
+                min_len = len(path) / weight
                 best_path = path
                 best_cluster = cluster
                 best_entry = ep
@@ -269,6 +530,58 @@ def generate_cluster_coverage_path(cluster: tuple, entry_point: tuple) -> list:
     return path
 
 
+def plan_sweep_passes(stats: dict) -> int:
+    """
+    적설 밀도에 따른 클러스터 제설 반복 횟수 결정
+    
+    Parameters:
+        stats: 클러스터 통계 {'pixel_count', 'fill_ratio', 'load', 'density'}
+
+    Returns:
+        int: 제설 패스 수 (1 이상)
+    """
+    if not stats:
+        return 1
+    return 1 + sum(1 for threshold in SWEEP_PASS_THRESHOLDS if stats['density'] >= threshold)
+
+
+def cluster_priority(stats: dict) -> float:
+    """
+    적설 밀도 기반 클러스터 우선순위 (무거운 구역일수록 큼)
+    
+    Parameters:
+        stats: 클러스터 통계 {'pixel_count', 'fill_ratio', 'load', 'density'}
+
+    Returns:
+        float: 우선순위 가중치 (1.0 이상)
+    """
+    if not stats:
+        return 1.0
+    return 1.0 + PRIORITY_GAIN * stats['density']
+
+
+def generate_multi_pass_coverage(cluster: tuple, entry_point: tuple, passes: int = 1) -> list:
+    """
+    클러스터를 여러 번 왕복하는 Coverage 경로 생성
+    
+    짝수 번째 패스는 직전 패스를 역순으로 되짚어 끊김 없이 이어집니다.
+    
+    Parameters:
+        cluster: 눈 클러스터 영역 ((r_min, c_min), (r_max, c_max))
+        entry_point: 진입한 모서리 좌표 (r, c)
+        passes: 제설 패스 수
+
+    Returns:
+        list: 청소 경로 [(r, c), ...]
+    """
+    single_pass = generate_cluster_coverage_path(cluster, entry_point)
+    path = single_pass[:]
+    for i in range(1, passes):
+        segment = single_pass[::-1] if i % 2 == 1 else single_pass
+        path.extend(segment[1:])
+    return path
+
+
 def calculate_angle(prev: tuple, curr: tuple) -> float:
     """
     연속된 두 그리드 셀의 이동 방향을 각도(Radian)로 변환
@@ -295,9 +608,485 @@ def calculate_angle(prev: tuple, curr: tuple) -> float:
         return math.pi / 2
 
 
+# ==================== Anytime Tour Improvement ====================
+
+class _BudgetExceeded(Exception):
+    """경로 개선 시간 예산 초과"""
+
+
+def bfs_distances(matrix, source: tuple, targets: set) -> dict:
+    """
+    source에서 targets 각 셀까지의 최단 이동 거리 (BFS, 모든 목표를 찾으면 조기 종료)
+
+    Returns:
+        dict: {target: 거리} (도달 불가능한 목표는 포함하지 않음)
+    """
+    grid = BitGrid.from_matrix(matrix)
+    bits, stride, size = grid.view(), grid.stride, grid.rows * grid.stride
+    remaining = {grid.to_flat(target): target for target in targets}
+    found = {}
+    start = grid.to_flat(source)
+    dist = {start: 0}
+    queue = deque([start])
+    while queue and remaining:
+        current = queue.popleft()
+        if current in remaining:
+            found[remaining.pop(current)] = dist[current]
+        for nxt in (current - stride, current + stride, current - 1, current + 1):
+            if 0 <= nxt < size and bits[nxt >> 3] >> (nxt & 7) & 1 and nxt not in dist:
+                dist[nxt] = dist[current] + 1
+                queue.append(nxt)
+    return found
+
+
+def bfs_path(matrix, start: tuple, goal: tuple) -> list:
+    """
+    BFS 최단 경로 (A*와 같은 길이, 경로 개선 결과를 실제 셀 경로로 만들 때 사용)
+
+    Returns:
+        list: [(r, c), ...] (실패 시 빈 리스트)
+    """
+    grid = BitGrid.from_matrix(matrix)
+    bits, stride, size = grid.view(), grid.stride, grid.rows * grid.stride
+    source, target = grid.to_flat(start), grid.to_flat(goal)
+    came_from = {source: None}
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            path = []
+            while current is not None:
+                path.append(grid.from_flat(current))
+                current = came_from[current]
+            return path[::-1]
+        for nxt in (current - stride, current + stride, current - 1, current + 1):
+            if 0 <= nxt < size and bits[nxt >> 3] >> (nxt & 7) & 1 and nxt not in came_from:
+                came_from[nxt] = current
+                queue.append(nxt)
+    return []
+
+
+def cluster_corners(cluster: tuple) -> list:
+    """클러스터의 4개 코너 (find_nearest_cluster의 진입 후보와 같은 순서)"""
+    (r1, c1), (r2, c2) = cluster
+    return [(r1, c1), (r1, c2), (r2, c1), (r2, c2)]
+
+
+def best_entry_sequence(start: tuple, order: list, exits: dict, distance) -> tuple:
+    """
+    방문 순서가 정해졌을 때 클러스터별 진입 코너 선택 (코너 4개 DP)
+
+    Parameters:
+        start: 출발 셀
+        order: 클러스터 방문 순서
+        exits: {(cluster, entry): Coverage 종료 셀}
+        distance: distance(a, b) -> 이동 거리 (도달 불가 시 inf)
+
+    Returns:
+        tuple: (총 이동 거리, [entry, ...])
+    """
+    if not order:
+        return 0, []
+
+    costs = {entry: distance(start, entry) for entry in cluster_corners(order[0])}
+    back = []
+    for prev_cluster, cluster in zip(order, order[1:]):
+        step_costs, step_back = {}, {}
+        for entry in cluster_corners(cluster):
+            step_costs[entry], step_back[entry] = min(
+                (cost + distance(exits[(prev_cluster, prev)], entry), prev) for prev, cost in costs.items()
+            )
+        costs = step_costs
+        back.append(step_back)
+
+    total, entry = min((cost, entry) for entry, cost in costs.items())
+    entries = [entry]
+    for step_back in reversed(back):
+        entry = step_back[entry]
+        entries.append(entry)
+    return total, entries[::-1]
+
+
+def improve_cluster_order(start: tuple, order: list, exits: dict, distance, expired) -> tuple:
+    """
+    클러스터 방문 순서 국소 탐색 (2-opt 구간 뒤집기 + 클러스터 1개 재배치)
+
+    expired()가 True가 되면 그때까지 찾은 가장 좋은 순서를 반환합니다 (anytime).
+
+    Returns:
+        tuple: (총 이동 거리, 방문 순서, 진입 코너 리스트)
+    """
+    best_cost, best_entries = best_entry_sequence(start, order, exits, distance)
+    best_order = order[:]
+    improved = True
+    try:
+        while improved:
+            improved = False
+            n = len(best_order)
+            candidates = [best_order[:i] + best_order[i:j + 1][::-1] + best_order[j + 1:]
+                          for i in range(n - 1) for j in range(i + 1, n)]
+            for i in range(n):
+                rest = best_order[:i] + best_order[i + 1:]
+                candidates.extend(rest[:k] + [best_order[i]] + rest[k:] for k in range(n) if k != i)
+
+            for candidate in candidates:
+                if expired():
+                    raise _BudgetExceeded()
+                cost, entries = best_entry_sequence(start, candidate, exits, distance)
+                if cost < best_cost:
+                    best_cost, best_order, best_entries = cost, candidate, entries
+                    improved = True
+                    break
+    except _BudgetExceeded:
+        pass
+    return best_cost, best_order, best_entries
+
+
+# ==================== Capacity / Dump Trips ====================
+
+def cluster_load(stats: dict, cluster: tuple) -> float:
+    """
+    클러스터 적재량 추정 (눈 픽셀 수, 통계가 없으면 박스 면적)
+
+    Parameters:
+        stats: 클러스터 통계 {'pixel_count', ...} (선택)
+        cluster: ((r1, c1), (r2, c2))
+
+    Returns:
+        float: 적재량 (픽셀 단위)
+    """
+    if stats:
+        return float(stats['pixel_count'])
+    (r1, c1), (r2, c2) = cluster
+    return float((r2 - r1 + 1) * (c2 - c1 + 1))
+
+
+def split_dump_trips(loads: list, capacity: float, direct: list, to_dump: list, from_dump: list) -> tuple:
+    """
+    방문 순서가 정해졌을 때 하치장 왕복을 넣을 위치 (최적 분할 DP, O(n^2))
+
+    연속한 클러스터 묶음마다 적재량 합이 capacity 이하가 되도록 나누고, 묶음이 끝날 때마다
+    하치장에 들렀다가 다음 묶음의 첫 클러스터로 갑니다. 마지막 묶음 뒤에도 하치장에서 비웁니다.
+    capacity보다 무거운 클러스터는 혼자 한 묶음이 됩니다 (클러스터 안의 왕복은 따로 계산).
+
+    Parameters:
+        loads: 방문 순서별 적재량
+        capacity: 1회 적재 한도
+        direct: 이전 위치(시작 셀 또는 이전 클러스터 출구) -> 진입 코너 이동 거리
+        to_dump: 클러스터 출구 -> 하치장 거리
+        from_dump: 하치장 -> 진입 코너 거리
+
+    Returns:
+        tuple: (총 이동 거리, 하치장에 들를 클러스터 인덱스 리스트 - 해당 클러스터 직후)
+    """
+    n = len(loads)
+    best = [0.0] + [math.inf] * n
+    split = [0] * (n + 1)
+    for j in range(n):
+        load, inner = 0.0, 0.0
+        for i in range(j, -1, -1):
+            load += loads[i]
+            if load > capacity and i < j:
+                break
+            if i < j:
+                inner += direct[i + 1]
+            cost = best[i] + (direct[0] if i == 0 else from_dump[i]) + inner + to_dump[j]
+            if cost < best[j + 1]:
+                best[j + 1] = cost
+                split[j + 1] = i
+    dumps = []
+    j = n
+    while j > 0:
+        dumps.append(j - 1)
+        j = split[j]
+    return best[n], sorted(dumps)
+
+
+def coverage_dump_points(coverage: list, load: float, capacity: float) -> list:
+    """
+    capacity보다 무거운 클러스터의 Coverage 중 하치장에 다녀올 지점 (Coverage 인덱스)
+
+    처음 지나는 셀마다 적재량이 고르게 쌓인다고 보고, 누적량이 capacity의 배수에 닿는 셀에서 비웁니다.
+    """
+    first_visits = []
+    seen = set()
+    for idx, cell in enumerate(coverage):
+        if cell not in seen:
+            seen.add(cell)
+            first_visits.append(idx)
+    per_cell = load / max(len(first_visits), 1)
+    points, carried = [], 0.0
+    for idx in first_visits[:-1]:
+        carried += per_cell
+        if carried >= capacity:
+            points.append(idx)
+            carried = 0.0
+    return points
+
+
+def coverage_leftover(coverage: list, load: float, capacity: float) -> float:
+    """coverage_dump_points() 지점에서 비우며 Coverage를 마쳤을 때 싣고 있는 양"""
+    points = coverage_dump_points(coverage, load, capacity) if load > capacity else []
+    if not points:
+        return load
+    first_visits = []
+    seen = set()
+    for idx, cell in enumerate(coverage):
+        if cell not in seen:
+            seen.add(cell)
+            first_visits.append(idx)
+    return load / len(first_visits) * sum(1 for idx in first_visits if idx > points[-1])
+
+
+def apply_dump_trips(route: list, segments: list, matrix, loads: list, capacity: float,
+                     dump: tuple, search, carried: float = 0.0) -> tuple:
+    """
+    완성된 경로에 하치장 왕복 삽입 (적재 한도 반영)
+
+    하치장 1곳에서 BFS 1회로 모든 진입 코너/출구까지의 거리를 구하고(무방향 그리드라 왕복 거리 동일),
+    기존 경로의 이동 구간 길이와 함께 split_dump_trips()로 왕복 위치를 정한 뒤
+    왕복이 들어가는 이동 구간과 클러스터 안의 왕복 구간만 새로 탐색합니다.
+
+    Parameters:
+        route / segments: 하치장 왕복이 없는 전체 경로와 클러스터 구간
+        matrix: 통행 행렬 (update_matrix_for_court_and_snow 결과)
+        loads: segments 순서별 적재량
+        capacity: 1회 적재 한도
+        dump: 하치장 셀 (r, c)
+        search: (a, b) -> 최단 경로 함수
+        carried: 출발 셀에서 이미 싣고 있는 양 (경로 수리 시, 필요하면 먼저 하치장에 들름)
+
+    Returns:
+        tuple: (새 경로, 새 segments, 요약 dict) - 하치장에 갈 수 없으면 (route, segments, None)
+    """
+    starts = [route.index(entry, ts) for _, entry, ts, _ in segments]   # Coverage 시작 인덱스
+    exits = [route[end] for _, _, _, end in segments]
+    targets = {seg[1] for seg in segments} | set(exits)
+    if carried:
+        targets.add(route[0])
+    dump_dist = bfs_distances(matrix, dump, targets)
+    if any(cell not in dump_dist for cell in targets):
+        return route, segments, None
+
+    direct = [start - ts for start, (_, _, ts, _) in zip(starts, segments)]
+    to_dump = [dump_dist[cell] for cell in exits]
+    from_dump = [dump_dist[seg[1]] for seg in segments]
+    if carried:
+        # 출발 셀을 적재량 carried인 가상 클러스터(이동 거리 0)로 두고 함께 분할
+        cost, dumps = split_dump_trips([carried] + loads, capacity, [0] + direct,
+                                       [dump_dist[route[0]]] + to_dump, [0] + from_dump)
+        dumped = 0 in dumps
+        dumps = [i - 1 for i in dumps if i > 0]
+    else:
+        cost, dumps = split_dump_trips(loads, capacity, direct, to_dump, from_dump)
+        dumped = False
+
+    new_route = [route[0]]
+    new_segments = []
+    visits = []
+
+    def extend(path):
+        new_route.extend(path[1:] if new_route[-1] == path[0] else path)
+
+    if dumped:
+        extend(search(route[0], dump))
+        visits.append(len(new_route) - 1)
+
+    for i, (cluster, entry, ts, end) in enumerate(segments):
+        transit_start = len(new_route) - 1
+        if dumped:
+            extend(search(dump, entry))
+        else:
+            extend(route[ts:starts[i] + 1])
+
+        coverage = route[starts[i]:end + 1]
+        prev = 0
+        for point in (coverage_dump_points(coverage, loads[i], capacity) if loads[i] > capacity else []):
+            extend(coverage[prev:point + 1])
+            trip = search(coverage[point], dump)
+            extend(trip)
+            visits.append(len(new_route) - 1)
+            extend(trip[::-1])
+            prev = point
+        extend(coverage[prev:])
+        new_segments.append((cluster, entry, transit_start, len(new_route) - 1))
+
+        dumped = i in dumps
+        if dumped:
+            extend(search(exits[i], dump))
+            visits.append(len(new_route) - 1)
+
+    summary = {
+        'capacity': capacity,
+        'dump_site': dump,
+        'trips': len(visits),
+        'dump_indices': visits,
+        'loads': loads,
+        'transit_before': sum(direct),
+        'transit_after': cost
+    }
+    return new_route, new_segments, summary
+
+
+def repair_dump_trips(route: list, segments: list, frozen: int, order: list, loads_of, capacity: float,
+                      dump: tuple, dump_indices: list, matrix, coverage_of, search) -> tuple:
+    """
+    적재 한도 모드 경로 수리 - 고정 구간 뒤 꼬리를 새 방문 순서로 다시 만들고 하치장 왕복을 다시 나눔
+
+    splice_cluster()는 바뀐 클러스터 앞뒤 이동 구간을 통째로 다시 탐색하므로 그 안의 하치장 왕복이 사라집니다.
+    마지막 고정 클러스터의 Coverage 끝(그 뒤 하치장으로 가는 중이면 그 하치장)에서 하치장 왕복 없는 꼬리를 만들고,
+    그때까지 싣고 있는 양을 이어받아 apply_dump_trips()로 왕복을 다시 넣습니다.
+
+    Parameters:
+        route / segments: 현재 전체 경로와 클러스터 구간 (하치장 왕복 포함)
+        frozen: 로봇이 이미 출발한 구간 수
+        order: 고정 구간 뒤 새 방문 순서 [(cluster, entry), ...]
+        loads_of: cluster -> 적재량
+        capacity / dump: 적재 한도 / 하치장 셀
+        dump_indices: 현재 경로의 하치장 방문 인덱스
+        matrix: 통행 행렬 (새 클러스터 반영)
+        coverage_of: (cluster, entry) -> Coverage 경로
+        search: (a, b) -> 최단 경로 함수
+
+    Returns:
+        tuple: (새 경로, 새 segments, 요약 dict) - 경로를 찾지 못하면 None
+    """
+    cut = segments[frozen - 1][3] if frozen else 0
+    ahead = [v for v in dump_indices if v > cut]
+    next_start = segments[frozen][2] if frozen < len(segments) else None
+    carried = 0.0
+    if ahead and (next_start is None or ahead[0] <= next_start):
+        cut = ahead[0]   # 하치장까지는 그대로 가서 비운 뒤 출발
+    else:
+        last_dump = max((v for v in dump_indices if v <= cut), default=-1)
+        for cluster, entry, ts, end in reversed(segments[:frozen]):
+            if end <= last_dump:
+                break
+            if route.index(entry, ts) > last_dump:
+                carried += loads_of(cluster)
+            else:
+                # 클러스터 안에서 마지막으로 비운 뒤 남은 양
+                carried += coverage_leftover(coverage_of(cluster, entry), loads_of(cluster), capacity)
+                break
+
+    tail = [route[cut]]
+    tail_segments = []
+    for cluster, entry in order:
+        leg = search(tail[-1], entry)
+        if not leg:
+            return None
+        transit_start = len(tail) - 1
+        tail.extend(leg[1:])
+        coverage = coverage_of(cluster, entry)
+        tail.extend(coverage[1:] if tail[-1] == coverage[0] else coverage)
+        tail_segments.append((cluster, entry, transit_start, len(tail) - 1))
+
+    tail, tail_segments, summary = apply_dump_trips(
+        tail, tail_segments, matrix, [loads_of(cluster) for cluster, _ in order], capacity, dump, search, carried
+    )
+    if summary is None:
+        return None
+
+    summary['dump_indices'] = [v for v in dump_indices if v <= cut] + [v + cut for v in summary['dump_indices']]
+    summary['trips'] = len(summary['dump_indices'])
+    summary['loads'] = [loads_of(seg[0]) for seg in segments[:frozen]] + summary['loads']
+    new_segments = segments[:frozen] + [(c, e, ts + cut, end + cut) for c, e, ts, end in tail_segments]
+    return route[:cut] + tail, new_segments, summary
+
+
+# ==================== Dynamic Snowfall ====================
+
+def boxes_overlap(a: tuple, b: tuple) -> bool:
+    """두 클러스터 박스가 겹치거나 맞닿는지"""
+    (ar1, ac1), (ar2, ac2) = a
+    (br1, bc1), (br2, bc2) = b
+    return ar1 <= br2 + 1 and br1 <= ar2 + 1 and ac1 <= bc2 + 1 and bc1 <= ac2 + 1
+
+
+def merge_boxes(a: tuple, b: tuple) -> tuple:
+    """두 클러스터 박스를 포함하는 박스 (커진 눈 더미)"""
+    (ar1, ac1), (ar2, ac2) = a
+    (br1, bc1), (br2, bc2) = b
+    return ((min(ar1, br1), min(ac1, bc1)), (max(ar2, br2), max(ac2, bc2)))
+
+
+def cheapest_insertion(route: list, segments: list, frozen: int, cluster: tuple, exit_of) -> tuple:
+    """
+    새 클러스터를 남은 방문 순서에 끼워 넣을 위치/진입 코너 (Manhattan 거리 기준 최소 증가량)
+
+    Parameters:
+        route: 현재 전체 경로
+        segments: [(cluster, entry, 이동 시작, Coverage 종료), ...]
+        frozen: 로봇이 이미 출발한 구간 수 (그 앞에는 끼워 넣지 않음)
+        cluster: 새 클러스터
+        exit_of: (cluster, entry) -> Coverage 종료 셀
+
+    Returns:
+        tuple: (삽입 위치 - segments 인덱스, 진입 코너)
+    """
+    def manhattan(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    best = (math.inf, None, None)
+    for pos in range(frozen, len(segments) + 1):
+        prev = route[segments[pos - 1][3]] if pos else route[0]
+        nxt = segments[pos][1] if pos < len(segments) else None
+        for corner in cluster_corners(cluster):
+            cost = manhattan(prev, corner)
+            if nxt is not None:
+                cost += manhattan(exit_of(cluster, corner), nxt) - manhattan(prev, nxt)
+            if cost < best[0]:
+                best = (cost, pos, corner)
+    return best[1], best[2]
+
+
+def splice_cluster(route: list, segments: list, pos: int, cluster: tuple, entry: tuple,
+                   coverage: list, search, replace: bool = False) -> tuple:
+    """
+    segments[pos] 앞에 클러스터 구간을 끼워 넣은(replace=True면 segments[pos]를 바꾼) 경로
+
+    바뀐 클러스터로 들어가는 이동 구간과 다음 클러스터로 나가는 이동 구간만 다시 탐색하고,
+    앞쪽 경로와 다음 클러스터 진입 이후의 경로는 그대로 이어 붙입니다.
+
+    Parameters:
+        coverage: 새 클러스터 Coverage 경로 (entry에서 시작)
+        search: (a, b) -> 최단 경로 함수
+
+    Returns:
+        tuple: (새 경로, 새 segments) - 이동 경로를 찾지 못하면 None
+    """
+    cut = segments[pos - 1][3] if pos else 0
+    following = pos + 1 if replace else pos
+
+    leg_in = search(route[cut], entry)
+    if not leg_in:
+        return None
+    piece = route[:cut + 1] + leg_in[1:] + coverage[1:]
+    new_segment = (cluster, entry, cut, len(piece) - 1)
+
+    if following >= len(segments):
+        return piece, segments[:pos] + [new_segment]
+
+    next_cluster, next_entry, next_start, next_end = segments[following]
+    leg_out = search(coverage[-1], next_entry)
+    if not leg_out:
+        return None
+    resume = route.index(next_entry, next_start)   # 다음 클러스터 Coverage 시작
+    new_route = piece + leg_out[1:] + route[resume + 1:]
+    delta = len(new_route) - len(route)
+
+    tail = [(next_cluster, next_entry, new_segment[3], next_end + delta)]
+    tail += [(c, e, start + delta, end + delta) for c, e, start, end in segments[following + 1:]]
+    return new_route, segments[:pos] + [new_segment] + tail
+
+
 # ==================== Factory Function ====================
 
-def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False) -> tuple:
+def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False,
+                                 cluster_stats: list = None, court_structure: dict = None,
+                                 anytime_budget: float = None, use_landmarks: bool = True,
+                                 bidirectional: bool = False, capacity: float = None,
+                                 dump_site: tuple = None, multiresolution: int = None) -> tuple:
     """
     경로 생성기 및 모션 제어기 팩토리 함수
     
@@ -305,15 +1094,70 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
         snow_clusters: 감지된 전체 눈 클러스터 정보 리스트
             [((r_min, c_min), (r_max, c_max)), ...]
         debug_mode: True일 경우 경로 생성 과정 로그로 출력
+        cluster_stats: 클러스터별 적설량 통계 (snow_clusters 순서, 선택)
+            주어지면 무거운 구역을 우선 방문하고 밀도에 따라 패스 수를 늘립니다.
+        court_structure: 코트 구조 분석 결과 (선택)
+            주어지면 실제 코트 경계/네트 위치로 통행 영역을 계산합니다.
+        anytime_budget: Anytime 경로 개선 시간 예산 (초, 선택)
+            주어지면 Greedy 경로를 즉시 반환한 뒤 백그라운드 스레드에서 방문 순서/진입 코너를
+            개선하고, 로봇이 아직 출발하지 않은 클러스터 구간만 교체합니다.
+            custom_path_planner.wait_for_improvement(timeout) / stop_improvement() 로 제어하고
+            custom_path_planner.improvement 에서 진행 상태를 확인합니다
+            (개선 중에 경로가 재계획/클러스터 추가로 바뀌면 교체하지 않고 'stale').
+        use_landmarks: True면 갱신된 통행 행렬마다 랜드마크 거리 테이블을 1회 만들어
+            A*에 ALT 휴리스틱을 사용합니다 (네트 건너편 목표의 확장 노드 수 감소, 경로 길이 동일).
+        bidirectional: True면 클러스터 사이 이동 경로를 A* 대신 양방향 BFS로 탐색합니다
+            (같은 길이, 랜드마크 테이블은 만들지 않음).
+        capacity: 1회 적재 한도 (눈 픽셀 수 단위, 선택)
+            주어지면 클러스터 적재량(cluster_stats의 pixel_count)을 누적해 한도를 넘기 전에
+            하치장 왕복을 넣고, 마지막에도 하치장에서 비웁니다 (custom_path_planner.capacity_plan 참고).
+            적재 한도 모드에서는 Anytime 개선을 하지 않습니다 (개선 결과가 하치장 왕복을 고려하지 않음).
+        dump_site: 하치장 셀 (r, c) (기본값: 시작 위치, 장애물이면 가장 가까운 통행 가능 셀)
+        multiresolution: 다중 해상도 축소 배율 (블록 한 변의 셀 수, 선택)
+            주어지면 이동 경로를 축소 그리드에서 먼저 찾고 그 주변 통로 안에서만 원본 해상도로 탐색합니다
+            (통로에서 실패하면 전체 탐색, 경로가 최단보다 조금 길 수 있음, 랜드마크 테이블은 만들지 않음).
 
     Returns:
         tuple: (custom_path_planner 함수, custom_motion_planner 함수)
+            custom_path_planner.export_plan() / import_plan(data) 로 계획을 저장하고,
+            불러온 계획은 재계획 없이 그대로 재생합니다.
+            custom_path_planner.add_clusters(new_clusters) 로 운행 중 새 클러스터를 남은 경로에 끼워 넣습니다.
     """
     
     # 전체 경로를 캐싱하기 위한 리스트
     cached_full_path = []
     path_generated = False
     
+    # 운행 중 추가되는 클러스터를 반영할 수 있도록 복사본 사용
+    snow_clusters = list(snow_clusters)
+    base_matrix = None  # 코트/눈 영역을 열기 전 원본 통행 그리드 (경로 수리용)
+    
+    # 적설량 기반 우선순위 / 패스 수
+    priorities = None
+    sweep_passes = {}
+    if cluster_stats:
+        priorities = {c: cluster_priority(st) for c, st in zip(snow_clusters, cluster_stats)}
+        sweep_passes = {c: plan_sweep_passes(st) for c, st in zip(snow_clusters, cluster_stats)}
+    
+    # 클러스터별 적재량 / 하치장 왕복 결과
+    loads = {c: cluster_load(st, c) for c, st in zip(snow_clusters, cluster_stats or [None] * len(snow_clusters))}
+    capacity_plan = {'capacity': capacity, 'dump_site': dump_site, 'trips': 0}
+    
+    # Anytime 경로 개선 상태 (백그라운드 스레드와 공유, path_lock으로 보호)
+    path_lock = threading.Lock()
+    segments = []       # [(cluster, entry, 이동 시작 인덱스, Coverage 종료 인덱스), ...]
+    progress_idx = 0    # 로봇이 지나간 가장 먼 경로 인덱스
+    planning_matrix = None
+    stop_event = threading.Event()
+    improver = None
+    improvement = {
+        'status': 'idle' if anytime_budget and not capacity else 'off',
+        'initial_transit': None,
+        'best_transit': None,
+        'replaced_clusters': 0,
+        'elapsed_s': 0.0
+    }
+    
     def custom_path_planner(grid, matrix: list, start_point: tuple, end_point: tuple) -> tuple:
         """
         Global Path Planner 함수
@@ -323,16 +1167,17 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
         
         Parameters:
             grid: 시뮬레이터 Grid 객체
-            matrix: 맵 통행 데이터 (2D List)
+            matrix: 맵 통행 데이터 (2D List 또는 BitGrid)
             start_point: 시작 좌표 (r, c)
             end_point: 목표 좌표 (사용되지 않음, 시뮬레이터 인터페이스 맞춤용)
 
         Returns:
             tuple: (경로 리스트 [(r,c)...], 소요 시간 float)
         """
-        nonlocal cached_full_path, path_generated
+        nonlocal cached_full_path, path_generated, progress_idx, planning_matrix, improver, base_matrix
         
         start_time = time.time()
+        span_start = time.perf_counter()
 
         def log(msg: str):
             if debug_mode: print(msg)
@@ -343,17 +1188,26 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
             log(f"   - 현재 위치: {start_point}")
             
             # 현재 위치에서 가장 가까운 남은 경로 지점 찾기
-            try:
-                start_idx = cached_full_path.index(start_point)
-                remaining_path = cached_full_path[start_idx:]
+            # (지나온 위치 이후부터 먼저 탐색 - 경로가 같은 셀을 여러 번 지나는 경우 대비)
+            with path_lock:
+                full_path = cached_full_path
+                try:
+                    start_idx = full_path.index(start_point, progress_idx)
+                except ValueError:
+                    start_idx = full_path.index(start_point) if start_point in full_path else None
+                if start_idx is not None:
+                    progress_idx = max(progress_idx, start_idx)
+            
+            if start_idx is not None:
+                remaining_path = full_path[start_idx:]
                 log(f" - 남은 경로: {len(remaining_path)}개")
                 runtime = time.time() - start_time
                 return remaining_path, runtime
-            except ValueError:
-                # 현재 위치가 경로에 없으면 전체 경로 반환
-                log(f" - 전체 경로 반환: {len(cached_full_path)}개")
-                runtime = time.time() - start_time
-                return cached_full_path, runtime
+            
+            # 현재 위치가 경로에 없으면 전체 경로 반환
+            log(f" - 전체 경로 반환: {len(full_path)}개")
+            runtime = time.time() - start_time
+            return full_path, runtime
         
         # 최초 경로 생성
         log(f"\n{'='*60}")
@@ -361,43 +1215,64 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
         log(f" - 시작 위치: {start_point}")
         log(f" - 제설 클러스터: {len(snow_clusters)}개")
         
+        # 비트 압축 그리드로 변환 (BitGrid 입력은 그대로, 2D List는 1회 압축)
+        grid_matrix = BitGrid.from_matrix(matrix)
+        
         # 시작 위치 검증
         sr, sc = start_point
-        if matrix[sr][sc] == 0:
+        if not grid_matrix.is_free(sr, sc):
             log(f" ⚠️ 시작 위치가 장애물 -> 대체 위치 탐색 중...")
             for radius in range(1, 20):
                 found = False
                 for dr in range(-radius, radius+1):
                     for dc in range(-radius, radius+1):
                         nr, nc = sr + dr, sc + dc
-                        if 0 <= nr < len(matrix) and 0 <= nc < len(matrix[0]):
-                            if matrix[nr][nc] == 1:
-                                start_point = (nr, nc)
-                                sr, sc = nr, nc
-                                found = True
-                                break
+                        if grid_matrix.is_free(nr, nc):
+                            start_point = (nr, nc)
+                            sr, sc = nr, nc
+                            found = True
+                            break
                     if found:
                         break
                 if found:
                     break
         
         # 코트와 눈 영역을 통행 가능하도록 수정
-        updated_matrix = update_matrix_for_court_and_snow(matrix, snow_clusters)
+        base_matrix = grid_matrix
+        with trace.span('update_matrix', cat='planner'):
+            updated_matrix = update_matrix_for_court_and_snow(grid_matrix, snow_clusters, court_structure)
+        
+        # 랜드마크 거리 테이블 (갱신된 행렬당 1회, 그리드 내용별 캐싱)
+        landmarks = None
+        if use_landmarks and not bidirectional and not multiresolution:
+            with trace.span('build_landmarks', cat='planner') as sp:
+                zones = estimate_court_zones(snow_clusters, *updated_matrix.shape, court_structure)
+                landmarks = build_landmark_table(updated_matrix, zones, PASSAGE_MARGIN, NET_THICKNESS)
+                sp['landmarks'] = len(landmarks.landmarks)
+        
+        # 다중 해상도 그리드 (갱신된 행렬당 1회)
+        pyramid = None
+        if multiresolution:
+            with trace.span('build_pyramid', cat='planner', factor=multiresolution):
+                pyramid = GridPyramid(updated_matrix, multiresolution)
         
         # 전체 경로 생성
+        segments.clear()
         final_path = [start_point]
         current_pos = start_point
         remaining_clusters = snow_clusters[:]
         
         cluster_count = 0
         while remaining_clusters:
-            cluster, path_to_cluster, entry_point = find_nearest_cluster(
-                updated_matrix, current_pos, remaining_clusters
-            )
+            with trace.span('find_nearest_cluster', cat='planner', candidates=len(remaining_clusters)):
+                cluster, path_to_cluster, entry_point = find_nearest_cluster(
+                    updated_matrix, current_pos, remaining_clusters, priorities, landmarks, bidirectional, pyramid
+                )
             
             if cluster is None or path_to_cluster is None:
                 break
             
+            transit_start = len(final_path) - 1
             if final_path[-1] == path_to_cluster[0]:
                 final_path.extend(path_to_cluster[1:])
             else:
@@ -405,7 +1280,10 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
             
             current_pos = path_to_cluster[-1]
             
-            coverage_path = generate_cluster_coverage_path(cluster, entry_point)
+            passes = sweep_passes.get(cluster, 1)
+            with trace.span('coverage', cat='planner', passes=passes) as sp:
+                coverage_path = generate_multi_pass_coverage(cluster, entry_point, passes)
+                sp['length'] = len(coverage_path)
             
             if final_path[-1] == coverage_path[0]:
                 final_path.extend(coverage_path[1:])
@@ -413,25 +1291,359 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
                 final_path.extend(coverage_path)
             
             # 진행상황
-            log(f" - 클러스터 #{cluster_count+1} 처리 완료 (남은 수: {len(remaining_clusters)-1})")
+            log(f" - 클러스터 #{cluster_count+1} 처리 완료 (패스: {passes}, 남은 수: {len(remaining_clusters)-1})")
             
+            segments.append((cluster, entry_point, transit_start, len(final_path) - 1))
             current_pos = coverage_path[-1]
             remaining_clusters.remove(cluster)
             cluster_count += 1
         
+        # 적재 한도: 하치장 왕복 삽입 (방문 순서는 그대로, 왕복 위치만 최적화)
+        if capacity and segments:
+            dump = dump_site or start_point
+            if not updated_matrix.is_free(*dump):
+                free = np.argwhere(updated_matrix.to_bool())
+                dump = tuple(free[np.argmin(np.abs(free - dump).sum(axis=1))].tolist())
+            with trace.span('dump_trips', cat='planner') as sp:
+                final_path, dump_segments, summary = apply_dump_trips(
+                    final_path, segments, updated_matrix,
+                    [loads.get(seg[0], cluster_load(None, seg[0])) for seg in segments], capacity, dump,
+                    lambda a, b: a_star(updated_matrix, a, b, bidirectional=True)
+                )
+                sp['trips'] = summary['trips'] if summary else 0
+            if summary is None:
+                print(f"⚠️ 하치장 {dump}에 갈 수 없어 적재 한도를 적용하지 않습니다.")
+            else:
+                segments[:] = dump_segments
+                capacity_plan.update(summary)
+                log(f" - 하치장 왕복: {summary['trips']}회 (하치장 {dump})")
+        
         # 전체 경로 캐싱
         cached_full_path = final_path
         path_generated = True
         
         runtime = time.time() - start_time
+        trace.record('plan_path', 'planner', span_start, time.perf_counter(),
+                     waypoints=len(final_path), clusters=cluster_count)
         log(f"\n🎯 [Planner] 전체 경로 생성 완료")
         log(f" - 총 Waypoint: {len(final_path)}")
         log(f" - 소요 시간: {runtime:.3f}초")
         log(f"{'='*60}\n")
         
+        # Anytime 모드: Greedy 경로는 바로 반환하고 백그라운드에서 개선
+        if anytime_budget and len(segments) > 1 and not capacity:
+            planning_matrix = updated_matrix
+            improvement['status'] = 'running'
+            improver = threading.Thread(target=improve_tour, name='tour-improver', daemon=True)
+            improver.start()
+            log(f"🔧 [Planner] 백그라운드 경로 개선 시작 (예산 {anytime_budget:.1f}초)")
+        
         return final_path, runtime
     
     
+    def improve_tour():
+        """
+        백그라운드 경로 개선 (Anytime)
+        
+        로봇이 이동을 시작한 클러스터 구간은 고정하고, 나머지 클러스터의 방문 순서와
+        진입 코너를 국소 탐색으로 개선한 뒤 경로 꼬리를 한 번에 교체합니다.
+        """
+        nonlocal cached_full_path, segments
+        
+        span_start = time.perf_counter()
+        deadline = span_start + anytime_budget
+        
+        # 공유 경로 상태 스냅샷 (이후에는 스냅샷만 사용하고, 교체 직전에만 바뀌었는지 확인)
+        with path_lock:
+            snapshot = segments[:]
+            full_path = cached_full_path
+        targets = {corner for seg in snapshot for corner in cluster_corners(seg[0])}
+        distances = {}
+        exits = {}
+        
+        def log(msg: str):
+            if debug_mode: print(msg)
+        
+        def expired():
+            return stop_event.is_set() or time.perf_counter() > deadline
+        
+        def distance(a, b):
+            # 출발 셀마다 BFS 1회 (모든 코너까지의 거리)
+            if a not in distances:
+                if expired():
+                    raise _BudgetExceeded()
+                distances[a] = bfs_distances(planning_matrix, a, targets)
+            return distances[a].get(b, math.inf)
+        
+        try:
+            while True:
+                with path_lock:
+                    frozen = sum(1 for seg in snapshot if seg[2] < progress_idx)
+                
+                remaining = snapshot[frozen:]
+                if len(remaining) < 2:
+                    improvement['status'] = 'no_gain'
+                    break
+                
+                base_idx = snapshot[frozen - 1][3] if frozen else 0
+                base = full_path[base_idx]
+                for cluster, _, _, _ in remaining:
+                    for corner in cluster_corners(cluster):
+                        if (cluster, corner) not in exits:
+                            exits[(cluster, corner)] = generate_multi_pass_coverage(
+                                cluster, corner, sweep_passes.get(cluster, 1))[-1]
+                
+                # 현재 경로의 이동 거리 (같은 거리 기준으로 비교)
+                current, prev = 0, base
+                for cluster, entry, _, _ in remaining:
+                    current += distance(prev, entry)
+                    prev = exits[(cluster, entry)]
+                if improvement['initial_transit'] is None:
+                    improvement['initial_transit'] = current
+                
+                cost, order, entries = improve_cluster_order(
+                    base, [seg[0] for seg in remaining], exits, distance, expired
+                )
+                improvement['best_transit'] = min(cost, current)
+                if cost >= current:
+                    improvement['status'] = 'no_gain'
+                    break
+                
+                # 새 꼬리 경로 생성
+                tail = [base]
+                tail_segments = []
+                for cluster, entry in zip(order, entries):
+                    transit_start = base_idx + len(tail) - 1
+                    tail.extend(bfs_path(planning_matrix, tail[-1], entry)[1:])
+                    coverage_path = generate_multi_pass_coverage(cluster, entry, sweep_passes.get(cluster, 1))
+                    tail.extend(coverage_path[1:] if tail[-1] == coverage_path[0] else coverage_path)
+                    tail_segments.append((cluster, entry, transit_start, base_idx + len(tail) - 1))
+                
+                with path_lock:
+                    # 개선하는 동안 경로 자체가 바뀌었으면(재계획/클러스터 추가) 교체하지 않음
+                    if cached_full_path is not full_path or segments != snapshot:
+                        improvement['status'] = 'stale'
+                        break
+                    # 개선하는 동안 로봇이 다음 클러스터로 출발했으면 다시 계산
+                    if sum(1 for seg in snapshot if seg[2] < progress_idx) != frozen:
+                        continue
+                    cached_full_path = full_path[:base_idx] + tail
+                    segments = snapshot[:frozen] + tail_segments
+                
+                improvement['status'] = 'improved'
+                improvement['replaced_clusters'] = len(tail_segments)
+                log(f"🔧 [Planner] 경로 개선: 이동 거리 {current} -> {cost} "
+                    f"(클러스터 {len(tail_segments)}개 구간 교체)")
+                break
+        except _BudgetExceeded:
+            improvement['status'] = 'timeout'
+        finally:
+            improvement['elapsed_s'] = time.perf_counter() - span_start
+            trace.record('improve_tour', 'planner', span_start, time.perf_counter(),
+                         status=improvement['status'], initial_transit=improvement['initial_transit'],
+                         best_transit=improvement['best_transit'])
+    
+    
+    def wait_for_improvement(timeout: float = None) -> dict:
+        """백그라운드 경로 개선이 끝날 때까지 대기 (개선 상태 dict 반환)"""
+        if improver is not None:
+            improver.join(timeout)
+        return dict(improvement)
+    
+    
+    def stop_improvement() -> dict:
+        """백그라운드 경로 개선 중단 (그때까지 교체된 경로는 유지)"""
+        stop_event.set()
+        return wait_for_improvement()
+    
+    def export_plan() -> bytes:
+        """
+        생성된 전체 경로 + 클러스터 방문 순서/진입 코너를 계획 바이트열로 저장 (src.control.route_codec)
+
+        Returns:
+            bytes: 계획 바이트열 (아직 경로를 생성하지 않았으면 None)
+        """
+        with path_lock:
+            if not path_generated:
+                return None
+            return encode_plan(cached_full_path, segments)
+    
+    
+    def import_plan(data: bytes) -> list:
+        """
+        저장된 계획 불러오기 - 이후 custom_path_planner 호출은 재계획 없이 이 경로를 그대로 재생
+
+        Parameters:
+            data: export_plan() / route_codec.encode_plan() 결과
+
+        Returns:
+            list: 불러온 전체 경로 [(r, c), ...]
+
+        Raises:
+            ValueError: 형식이 맞지 않는 경우
+        """
+        nonlocal cached_full_path, segments, path_generated, progress_idx
+        plan = decode_plan(data)
+        stored = {seg[0] for seg in plan['segments']}
+        if stored and stored != set(snow_clusters):
+            print(f"⚠️ 저장된 계획의 클러스터({len(stored)}개)가 현재 감지 결과({len(snow_clusters)}개)와 다릅니다.")
+        stop_event.set()
+        with path_lock:
+            cached_full_path = plan['route']
+            segments = plan['segments']
+            path_generated = bool(cached_full_path)
+            progress_idx = 0
+        if capacity:
+            # 계획 파일에는 하치장 왕복 정보가 없음 (경로 수리 불가)
+            capacity_plan.pop('dump_indices', None)
+            capacity_plan['trips'] = None
+        return cached_full_path
+    
+    def add_clusters(new_clusters: list, new_stats: list = None, matrix=None) -> dict:
+        """
+        운행 중 새로 생긴(또는 커진) 눈 클러스터를 남은 경로에 끼워 넣기 (동적 강설)
+
+        로봇이 이미 출발한 클러스터 구간까지의 경로는 그대로 두고,
+        - 아직 출발하지 않은 클러스터와 겹치면 그 클러스터를 합친 박스로 제자리에서 교체하고
+        - 아니면 Manhattan 거리 기준 최소 증가 위치(cheapest insertion)에 끼워 넣습니다.
+        바뀐 클러스터 앞뒤의 이동 구간만 양방향 BFS로 다시 탐색하므로 로봇은 계속 주행하고,
+        다음 custom_path_planner 호출부터 수리된 경로를 받습니다.
+        Anytime 개선이 진행 중이면 먼저 중단합니다 (오래된 스냅샷으로 꼬리를 덮어쓰지 않도록).
+        적재 한도 모드에서는 고정 구간 뒤 꼬리를 새 방문 순서로 다시 만들고, 그때까지 실은 양을 이어받아
+        하치장 왕복을 다시 나눕니다 (capacity_plan 갱신, transit_before/after는 다시 만든 꼬리 기준).
+        불러온 계획(import_plan)은 하치장 왕복 정보가 없어 적재 한도 모드에서는 수리하지 않습니다.
+
+        Parameters:
+            new_clusters: 새 클러스터 리스트 [((r1, c1), (r2, c2)), ...]
+            new_stats: 새 클러스터별 적설량 통계 (선택, 패스 수 결정)
+            matrix: 원본 통행 행렬 (선택, 기본값: 최초 계획에 사용한 행렬 - 저장된 계획을 재생한 경우 필요)
+
+        Returns:
+            dict: {'inserted', 'grown', 'skipped', 'route_length', 'repair_s'} (수리할 수 없으면 None)
+        """
+        nonlocal cached_full_path, segments, planning_matrix
+        
+        span_start = time.perf_counter()
+        for cluster, stats in zip(new_clusters, new_stats or [None] * len(new_clusters)):
+            loads[cluster] = cluster_load(stats, cluster)
+            if stats is not None:
+                sweep_passes[cluster] = plan_sweep_passes(stats)
+        
+        # 아직 경로를 만들지 않았으면 다음 계획에 포함
+        if not path_generated:
+            snow_clusters.extend(new_clusters)
+            return {'inserted': len(new_clusters), 'grown': 0, 'skipped': 0, 'route_length': 0, 'repair_s': 0.0}
+        
+        source = BitGrid.from_matrix(matrix) if matrix is not None else base_matrix
+        if source is None:
+            print("⚠️ 경로 수리에 필요한 통행 행렬이 없습니다 (matrix 인자를 주세요).")
+            return None
+        if capacity and capacity_plan['trips'] is None:
+            print("⚠️ 불러온 계획은 하치장 왕복 정보가 없어 적재 한도 모드로 수리할 수 없습니다.")
+            return None
+        if improver is not None and improver.is_alive():
+            stop_improvement()
+        
+        while True:
+            with path_lock:
+                frozen = sum(1 for seg in segments if seg[2] < progress_idx)
+                route, segs = cached_full_path, segments[:]
+                dump_indices = capacity_plan.get('dump_indices')
+            original_route, original_segs = route, segs
+            
+            clusters = snow_clusters[:]
+            inserted = grown = skipped = 0
+            for box in new_clusters:
+                pos = next((i for i in range(frozen, len(segs)) if boxes_overlap(segs[i][0], box)), None)
+                replace = pos is not None
+                if replace:
+                    cluster = merge_boxes(segs[pos][0], box)
+                    if segs[pos][0] in clusters:
+                        clusters.remove(segs[pos][0])
+                    clusters.append(cluster)
+                    sweep_passes.setdefault(cluster, sweep_passes.get(segs[pos][0], 1))
+                    loads[cluster] = loads.get(segs[pos][0], cluster_load(None, segs[pos][0])) + loads[box]
+                else:
+                    cluster = box
+                    clusters.append(cluster)
+                
+                # 새 박스까지 통행 가능하도록 갱신한 행렬에서 앞뒤 이동 구간만 탐색
+                updated = update_matrix_for_court_and_snow(source, clusters, court_structure)
+                passes = sweep_passes.get(cluster, 1)
+                
+                def exit_of(c, corner):
+                    return generate_multi_pass_coverage(c, corner, passes)[-1]
+                
+                if replace:
+                    prev = route[segs[pos - 1][3]] if pos else route[0]
+                    entry = min(cluster_corners(cluster),
+                                key=lambda corner: abs(corner[0] - prev[0]) + abs(corner[1] - prev[1]))
+                else:
+                    pos, entry = cheapest_insertion(route, segs, frozen, cluster, exit_of)
+                
+                with trace.span('splice_cluster', cat='planner', position=pos, replace=replace):
+                    spliced = splice_cluster(
+                        route, segs, pos, cluster, entry,
+                        generate_multi_pass_coverage(cluster, entry, passes),
+                        lambda a, b: a_star(updated, a, b, bidirectional=True),
+                        replace=replace
+                    )
+                if spliced is None:
+                    skipped += 1
+                    clusters.remove(cluster)
+                    continue
+                route, segs = spliced
+                grown += replace
+                inserted += not replace
+            
+            updated = update_matrix_for_court_and_snow(source, clusters, court_structure)
+            summary = None
+            if dump_indices is not None and (inserted or grown):
+                # 적재 한도: 이어 붙인 이동 구간에서 사라진 하치장 왕복을 꼬리 전체에서 다시 나눔
+                with trace.span('dump_trips', cat='planner', repair=True) as sp:
+                    repaired = repair_dump_trips(
+                        original_route, original_segs, frozen, [(c, e) for c, e, _, _ in segs[frozen:]],
+                        lambda c: loads.get(c, cluster_load(None, c)), capacity, capacity_plan['dump_site'],
+                        dump_indices, updated,
+                        lambda c, e: generate_multi_pass_coverage(c, e, sweep_passes.get(c, 1)),
+                        lambda a, b: a_star(updated, a, b, bidirectional=True)
+                    )
+                    sp['trips'] = repaired[2]['trips'] if repaired else 0
+                if repaired is None:
+                    print("⚠️ 하치장 왕복을 다시 나눌 수 없어 경로를 수리하지 않습니다.")
+                    return None
+                route, segs, summary = repaired
+            
+            with path_lock:
+                # 수리하는 동안 로봇이 다음 클러스터로 출발했으면 다시 계산
+                if sum(1 for seg in segments if seg[2] < progress_idx) != frozen:
+                    continue
+                cached_full_path = route
+                segments = segs
+                snow_clusters[:] = clusters
+                planning_matrix = updated
+                if summary is not None:
+                    capacity_plan.update(summary)
+            break
+        
+        result = {'inserted': inserted, 'grown': grown, 'skipped': skipped,
+                  'route_length': len(route), 'repair_s': time.perf_counter() - span_start}
+        trace.record('add_clusters', 'planner', span_start, time.perf_counter(),
+                     inserted=inserted, grown=grown, skipped=skipped)
+        if debug_mode:
+            print(f"🌨️ [Planner] 경로 수리: 추가 {inserted}, 확장 {grown}, 실패 {skipped} "
+                  f"({result['repair_s'] * 1000:.0f}ms)")
+        return result
+    
+    custom_path_planner.improvement = improvement
+    custom_path_planner.wait_for_improvement = wait_for_improvement
+    custom_path_planner.stop_improvement = stop_improvement
+    custom_path_planner.export_plan = export_plan
+    custom_path_planner.import_plan = import_plan
+    custom_path_planner.add_clusters = add_clusters
+    custom_path_planner.capacity_plan = capacity_plan
+    
+    
     def custom_motion_planner(grid, path: list, start_coord: tuple, end_coord: tuple) -> tuple:
         """
         Motion Planner 함수
@@ -488,6 +1700,7 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
         log(f" - 입력 경로 길이: {len(path)}")
         
         waypoints = []
+        span_start = time.perf_counter()
         
         for i, (row, col) in enumerate(path):
             if row >= len(grid) or col >= len(grid[0]):
@@ -514,6 +1727,7 @@ def create_snow_removal_planners(snow_clusters: list, debug_mode: bool = False)
             )
             waypoints.append(waypoint)
         
+        trace.record('build_waypoints', 'motion', span_start, time.perf_counter(), waypoints=len(waypoints))
         log(f"✅ [Motion] 생성 완료: {len(waypoints)}개 Waypoints\n")
         
         return robot_pose, waypoints
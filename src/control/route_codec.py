@@ -0,0 +1,280 @@
+"""
+route_codec.py - 경로 바이너리 인코딩 (서비스 응답 / 저장용)
+
+경로 [(r, c), ...]를 시작 셀 + 이동 방향 코드(2비트, 1바이트에 4개)로 압축합니다.
+상하좌우 한 칸씩 이어지지 않는 경로(대체 시작 위치 등)는 셀 좌표(uint16)를 그대로 저장합니다.
+
+    헤더 (14바이트, little-endian)
+        magic 'TCRT' | version u8 | flags u8 | start_r u16 | start_c u16 | 셀 수 u32
+    본문 (version 1 - 경로)
+        flags & FLAG_RAW == 0 : 방향 코드 (셀 수 - 1)개, 4개씩 1바이트
+        flags & FLAG_RAW != 0 : (셀 수 x 2) uint16 좌표
+
+version 2(계획 파일, .tcplan)는 경로와 함께 클러스터 방문 순서/진입 코너를 저장하고,
+직선 구간이 긴 제설 경로에 맞게 방향 코드를 런 길이(varint)로 압축합니다.
+
+    헤더 (version 2) | 구간 수 u16 | 구간 x (r1, c1, r2, c2, entry_r, entry_c u16, 이동 시작, Coverage 종료 u32)
+    본문 (version 2)
+        flags & FLAG_RAW == 0 : 런 (길이 << 2 | 방향 코드) LEB128 varint 나열
+        flags & FLAG_RAW != 0 : (셀 수 x 2) uint16 좌표
+
+좌표/구간 수는 0~65535, 셀 수/경로 인덱스는 u32 범위여야 하며 벗어나면 인코딩 시 ValueError입니다.
+"""
+
+import struct
+
+import numpy as np
+
+ROUTE_MAGIC = b'TCRT'
+ROUTE_VERSION = 1
+PLAN_VERSION = 2
+ROUTE_HEADER = struct.Struct('<4sBBHHI')
+SEGMENT_COUNT = struct.Struct('<H')
+SEGMENT = struct.Struct('<6HII')
+
+FLAG_RAW = 0x01
+
+# 형식이 담을 수 있는 최댓값 (좌표/구간 수 u16, 셀 수/경로 인덱스 u32)
+MAX_COORD = 0xFFFF
+MAX_SEGMENTS = 0xFFFF
+MAX_INDEX = 0xFFFFFFFF
+
+# 방향 코드 -> (dr, dc) (get_neighbors와 같은 상하좌우 순서)
+DIRECTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+
+
+def direction_codes(cells: np.ndarray) -> np.ndarray:
+    """
+    (N, 2) 셀 배열 -> 방향 코드 배열 (N-1,) uint8
+
+    Returns:
+        np.ndarray: 방향 코드 (상하좌우 한 칸 이동이 아닌 스텝이 있으면 None)
+    """
+    steps = np.diff(cells, axis=0)
+    codes = np.full(len(steps), 255, dtype=np.uint8)
+    for code, (dr, dc) in enumerate(DIRECTIONS):
+        codes[(steps[:, 0] == dr) & (steps[:, 1] == dc)] = code
+    return None if (codes == 255).any() else codes
+
+
+def pack_codes(codes: np.ndarray) -> bytes:
+    """2비트 방향 코드 4개를 1바이트로 압축"""
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)).tobytes()
+
+
+def unpack_codes(data: bytes, count: int) -> np.ndarray:
+    """pack_codes() 역변환"""
+    packed = np.frombuffer(data, dtype=np.uint8)
+    quads = np.stack([(packed >> shift) & 0x03 for shift in (0, 2, 4, 6)], axis=1)
+    return quads.reshape(-1)[:count]
+
+
+def check_cells(cells: np.ndarray):
+    """
+    경로 셀이 형식 범위 안인지 확인 (좌표 0~MAX_COORD, 셀 수 MAX_INDEX 이하)
+
+    Raises:
+        ValueError: 범위를 벗어난 경우 (struct.error / uint16 변환 시 값이 잘리는 것 방지)
+    """
+    if len(cells) > MAX_INDEX:
+        raise ValueError(f"경로 셀 수가 너무 많습니다 ({len(cells)} > {MAX_INDEX})")
+    if len(cells) and (cells.min() < 0 or cells.max() > MAX_COORD):
+        raise ValueError(f"경로 좌표가 범위를 벗어났습니다 (0~{MAX_COORD}, "
+                         f"최소 {int(cells.min())}, 최대 {int(cells.max())})")
+
+
+def check_segments(segments: list):
+    """
+    구간 메타데이터가 형식 범위 안인지 확인 (구간 수/좌표 u16, 경로 인덱스 u32)
+
+    Raises:
+        ValueError: 범위를 벗어난 경우
+    """
+    if len(segments) > MAX_SEGMENTS:
+        raise ValueError(f"구간 수가 너무 많습니다 ({len(segments)} > {MAX_SEGMENTS})")
+    for ((r1, c1), (r2, c2)), entry, transit_start, coverage_end in segments:
+        if not all(0 <= v <= MAX_COORD for v in (r1, c1, r2, c2, entry[0], entry[1])):
+            raise ValueError(f"구간 좌표가 범위를 벗어났습니다 (0~{MAX_COORD}): "
+                             f"{((r1, c1), (r2, c2))}, 진입 {tuple(entry)}")
+        if not (0 <= transit_start <= MAX_INDEX and 0 <= coverage_end <= MAX_INDEX):
+            raise ValueError(f"구간 경로 인덱스가 범위를 벗어났습니다 (0~{MAX_INDEX}): "
+                             f"{transit_start}, {coverage_end}")
+
+
+def encode_route(route) -> bytes:
+    """
+    경로 -> 바이트열
+
+    Parameters:
+        route: [(r, c), ...] 또는 (N, 2) 배열
+
+    Returns:
+        bytes: 헤더 + 방향 코드(또는 좌표) 본문
+
+    Raises:
+        ValueError: 좌표/셀 수가 형식 범위를 벗어난 경우
+    """
+    cells = np.asarray(route, dtype=np.int64).reshape(-1, 2)
+    check_cells(cells)
+    if len(cells) == 0:
+        return ROUTE_HEADER.pack(ROUTE_MAGIC, ROUTE_VERSION, 0, 0, 0, 0)
+
+    start_r, start_c = (int(v) for v in cells[0])
+    codes = direction_codes(cells)
+    if codes is None:
+        header = ROUTE_HEADER.pack(ROUTE_MAGIC, ROUTE_VERSION, FLAG_RAW, start_r, start_c, len(cells))
+        return header + cells.astype('<u2').tobytes()
+
+    header = ROUTE_HEADER.pack(ROUTE_MAGIC, ROUTE_VERSION, 0, start_r, start_c, len(cells))
+    return header + pack_codes(codes)
+
+
+def run_lengths(codes: np.ndarray) -> tuple:
+    """방향 코드 배열 -> (런별 코드, 런 길이) 배열"""
+    if len(codes) == 0:
+        return codes, np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+    return codes[starts], lengths
+
+
+def encode_varints(values) -> bytes:
+    """부호 없는 정수 -> LEB128 varint 바이트열"""
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> list:
+    """LEB128 varint 바이트열 -> 정수 리스트"""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    if shift:
+        raise ValueError("varint가 중간에 끝났습니다")
+    return values
+
+
+def encode_plan(route, segments: list = ()) -> bytes:
+    """
+    계획(경로 + 클러스터 방문 순서/진입 코너) -> 바이트열 (version 2)
+
+    Parameters:
+        route: [(r, c), ...] 또는 (N, 2) 배열
+        segments: 클러스터별 구간 [(cluster, entry, 이동 시작 인덱스, Coverage 종료 인덱스), ...]
+                  (create_snow_removal_planners의 방문 순서)
+
+    Returns:
+        bytes: 헤더 + 구간 메타데이터 + 런 길이 방향 코드(또는 좌표) 본문
+
+    Raises:
+        ValueError: 좌표/셀 수/구간 수가 형식 범위를 벗어난 경우
+    """
+    cells = np.asarray(route, dtype=np.int64).reshape(-1, 2)
+    check_cells(cells)
+    check_segments(segments)
+    meta = SEGMENT_COUNT.pack(len(segments)) + b''.join(
+        SEGMENT.pack(r1, c1, r2, c2, entry[0], entry[1], transit_start, coverage_end)
+        for ((r1, c1), (r2, c2)), entry, transit_start, coverage_end in segments
+    )
+    if len(cells) == 0:
+        return ROUTE_HEADER.pack(ROUTE_MAGIC, PLAN_VERSION, 0, 0, 0, 0) + meta
+
+    start_r, start_c = (int(v) for v in cells[0])
+    codes = direction_codes(cells)
+    if codes is None:
+        header = ROUTE_HEADER.pack(ROUTE_MAGIC, PLAN_VERSION, FLAG_RAW, start_r, start_c, len(cells))
+        return header + meta + cells.astype('<u2').tobytes()
+
+    run_codes, lengths = run_lengths(codes)
+    header = ROUTE_HEADER.pack(ROUTE_MAGIC, PLAN_VERSION, 0, start_r, start_c, len(cells))
+    return header + meta + encode_varints(((lengths << 2) | run_codes).tolist())
+
+
+def decode_plan(data: bytes) -> dict:
+    """
+    바이트열 -> 계획 (version 1 경로도 읽음, 이 경우 구간은 빈 리스트)
+
+    Returns:
+        dict: {'route': [(r, c), ...], 'segments': [(cluster, entry, 이동 시작, Coverage 종료), ...]}
+
+    Raises:
+        ValueError: 형식이 맞지 않는 경우
+    """
+    if len(data) < ROUTE_HEADER.size:
+        raise ValueError("경로 데이터가 너무 짧습니다")
+    magic, version, flags, start_r, start_c, count = ROUTE_HEADER.unpack_from(data)
+    if magic != ROUTE_MAGIC or version not in (ROUTE_VERSION, PLAN_VERSION):
+        raise ValueError(f"지원하지 않는 경로 형식입니다 (magic={magic!r}, version={version})")
+    if version == ROUTE_VERSION:
+        return {'route': decode_route(data), 'segments': []}
+
+    offset = ROUTE_HEADER.size
+    (segment_count,) = SEGMENT_COUNT.unpack_from(data, offset)
+    offset += SEGMENT_COUNT.size
+    if len(data) < offset + segment_count * SEGMENT.size:
+        raise ValueError("계획 메타데이터가 잘렸습니다")
+    segments = []
+    for r1, c1, r2, c2, entry_r, entry_c, transit_start, coverage_end in SEGMENT.iter_unpack(
+            data[offset:offset + segment_count * SEGMENT.size]):
+        segments.append((((r1, c1), (r2, c2)), (entry_r, entry_c), transit_start, coverage_end))
+    offset += segment_count * SEGMENT.size
+
+    if count == 0:
+        return {'route': [], 'segments': segments}
+
+    body = data[offset:]
+    if flags & FLAG_RAW:
+        cells = np.frombuffer(body, dtype='<u2', count=count * 2).reshape(-1, 2).astype(np.int64)
+    else:
+        runs = np.array(decode_varints(body), dtype=np.int64)
+        codes = np.repeat(runs & 0x03, runs >> 2)
+        if len(codes) != count - 1:
+            raise ValueError(f"방향 코드 수가 맞지 않습니다 ({len(codes)} != {count - 1})")
+        cells = np.empty((count, 2), dtype=np.int64)
+        cells[0] = (start_r, start_c)
+        cells[1:] = DIRECTIONS[codes]
+        np.cumsum(cells, axis=0, out=cells)
+    return {'route': list(map(tuple, cells.tolist())), 'segments': segments}
+
+
+def decode_route(data: bytes) -> list:
+    """
+    바이트열 -> 경로 [(r, c), ...]
+
+    Raises:
+        ValueError: 형식이 맞지 않는 경우
+    """
+    if len(data) < ROUTE_HEADER.size:
+        raise ValueError("경로 데이터가 너무 짧습니다")
+    magic, version, flags, start_r, start_c, count = ROUTE_HEADER.unpack_from(data)
+    if magic == ROUTE_MAGIC and version == PLAN_VERSION:
+        return decode_plan(data)['route']
+    if magic != ROUTE_MAGIC or version != ROUTE_VERSION:
+        raise ValueError(f"지원하지 않는 경로 형식입니다 (magic={magic!r}, version={version})")
+    if count == 0:
+        return []
+
+    body = data[ROUTE_HEADER.size:]
+    if flags & FLAG_RAW:
+        cells = np.frombuffer(body, dtype='<u2', count=count * 2).reshape(-1, 2).astype(np.int64)
+    else:
+        codes = unpack_codes(body, count - 1)
+        cells = np.empty((count, 2), dtype=np.int64)
+        cells[0] = (start_r, start_c)
+        cells[1:] = DIRECTIONS[codes]
+        np.cumsum(cells, axis=0, out=cells)
+    return list(map(tuple, cells.tolist()))
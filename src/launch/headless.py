@@ -0,0 +1,363 @@
+"""
+headless.py - 창 없이 실행하는 제설 파이프라인 (감지 -> 경로 계획 -> Waypoint)
+
+AutoNavSim2D GUI 없이 맵 파일과 시작 셀만으로 전체 파이프라인을 실행하고,
+경로/Waypoint 수/예상 주행 시간/단계별 소요 시간을 JSON으로 저장합니다.
+여러 맵은 프로세스 풀로 나눠 처리합니다.
+
+    python -m src.launch.headless maps/TennisCourt_Snow.tcmap --start 20,100
+    python -m src.launch.headless maps/corpus/manifest.json --workers 8 --output results.json
+    python -m src.launch.headless maps/TennisCourt_Snow.tcmap --plan-dir plans            # 계획 저장
+    python -m src.launch.headless maps/TennisCourt_Snow.tcmap --plan-dir plans --replay   # 저장된 계획 재생
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.perception.detect import detect_snow_regions
+from src.control.planner import create_snow_removal_planners
+from src.control.kinematics import (
+    DEFAULT_SPEED, DEFAULT_TURN_RATE, DEFAULT_ACCELERATION, simulate_mission
+)
+from src.control.metrics import compute_plan_metrics
+from src.mapdata.raster import open_map_raster
+from src.mapdata.occupancy import OccupancyView
+from src.utils import trace
+
+MAP_EXTENSIONS = ('.tcmap', '.pkl')
+
+
+def default_start(court_structure: dict) -> tuple:
+    """시작 셀을 주지 않았을 때 사용할 셀 (첫 번째 코트의 좌상단 모서리)"""
+    if court_structure and court_structure['courts']:
+        r1, c1, _, _ = court_structure['courts'][0]['bounds']
+        return (r1, c1)
+    return (0, 0)
+
+
+def run_map(map_path: str, starts: list = None, use_cache: bool = True,
+            include_route: bool = True, show_grid: bool = True, mission_params: dict = None,
+            anytime_budget: float = None, plan_dir: str = None, replay: bool = False,
+            planner_options: dict = None) -> list:
+    """
+    맵 1개에 대해 시작 셀별로 파이프라인 실행
+
+    통행 행렬은 AutoNavSim2D와 같은 규칙(src.mapdata.occupancy)으로 원본 래스터에서 바로 비트 압축(BitGrid)해 계산합니다.
+    GUI는 재색칠된 맵으로 행렬을 만들지만, 군집 색은 planner가 코트 구역을 통행 가능으로
+    여는 범위 안에 있으므로 계획 결과는 같습니다.
+
+    Parameters:
+        map_path: 맵 파일 경로 (.tcmap 또는 .pkl)
+        starts: 시작 셀 리스트 [(r, c), ...] (None이면 default_start)
+        use_cache: 감지 캐시 사용 여부
+        include_route: 결과에 전체 경로 좌표 포함 여부
+        show_grid: AutoNavSim2D show_grid 설정 (통행 행렬 배경색 결정)
+        mission_params: 주행 시뮬레이션 파라미터 (speed, turn_rate, acceleration, dt)
+        anytime_budget: Anytime 경로 개선 시간 예산 (초, 선택) - 개선이 끝난 경로로 주행 시간을 추정
+        plan_dir: 계획 파일(.tcplan) 디렉터리 (선택) - 생성한 계획을 맵/시작 셀별로 저장
+        replay: True면 plan_dir에 저장된 계획이 있을 때 재계획 없이 재생
+        planner_options: create_snow_removal_planners 추가 인자 (bidirectional, capacity, multiresolution 등)
+
+    Returns:
+        list: 시작 셀별 결과 dict 리스트
+    """
+    start_time = time.perf_counter()
+    detection = detect_snow_regions(map_path, use_cache=use_cache, with_layers=False)
+    detect_time = time.perf_counter() - start_time
+
+    with trace.span('occupancy_matrix', cat='headless'):
+        raster = open_map_raster(map_path)
+        matrix = OccupancyView(raster, show_grid=show_grid).to_bitgrid()
+        grid = raster.to_rect_grid()
+
+    results = []
+    for start in starts or [default_start(detection['court_structure'])]:
+        start = tuple(start)
+
+        # 플래너는 전체 경로를 캐싱하므로 시작 셀마다 새로 생성
+        path_planner, motion_planner = create_snow_removal_planners(
+            detection['all_boxes'],
+            cluster_stats=detection['cluster_stats'],
+            court_structure=detection['court_structure'],
+            anytime_budget=anytime_budget,
+            **(planner_options or {})
+        )
+
+        # 저장된 계획 재생 (경로 탐색 없이 custom_path_planner가 저장된 경로를 그대로 반환)
+        plan_file = plan_path(plan_dir, map_path, start) if plan_dir else None
+        replayed = bool(replay and plan_file and os.path.exists(plan_file))
+        if replayed:
+            with open(plan_file, 'rb') as f:
+                path_planner.import_plan(f.read())
+
+        plan_start = time.perf_counter()
+        route, _ = path_planner(grid, matrix, start, start)
+        plan_time = time.perf_counter() - plan_start
+
+        # Anytime 모드: 로봇이 출발하지 않은 상태로 개선을 기다린 뒤 전체 경로를 다시 받음
+        improve_time = 0.0
+        improvement = None
+        if anytime_budget and not replayed:
+            improve_start = time.perf_counter()
+            improvement = path_planner.wait_for_improvement()
+            if route:
+                route, _ = path_planner(grid, matrix, route[0], route[0])
+            improve_time = time.perf_counter() - improve_start
+
+        plan_bytes = None
+        if plan_file and not replayed:
+            data = path_planner.export_plan()
+            if data is not None:
+                os.makedirs(plan_dir, exist_ok=True)
+                with open(plan_file, 'wb') as f:
+                    f.write(data)
+                plan_bytes = len(data)
+
+        motion_start = time.perf_counter()
+        r, c = route[0] if route else start
+        robot_pose, waypoints = motion_planner(grid, route, grid[r][c], grid[r][c])
+        motion_time = time.perf_counter() - motion_start
+
+        # 주행 시간 추정 (차동 구동 모델, 실시간보다 빠르게)
+        sim_start = time.perf_counter()
+        with trace.span('simulate_mission', cat='headless'):
+            mission = simulate_mission(waypoints, robot_pose, **(mission_params or {}))
+        sim_time = time.perf_counter() - sim_start
+
+        # 경로 품질 지표 (이동/제설 길이, 회전, 중복 방문, 커버리지)
+        model = {key: value for key, value in (mission_params or {}).items()
+                 if key in ('speed', 'turn_rate', 'acceleration')}
+        with trace.span('plan_metrics', cat='headless'):
+            metrics = compute_plan_metrics(route, detection['all_boxes'], shape=raster.shape, **model)
+
+        result = {
+            'map': map_path,
+            'start': list(start),
+            'shape': list(raster.shape),
+            'clusters': len(detection['all_boxes']),
+            'courts': len(detection['court_structure']['courts']),
+            'from_cache': bool(detection.get('from_cache')),
+            'route_length': len(route),
+            'waypoints': len(waypoints),
+            'mission': {key: mission[key] for key in
+                        ('mission_time_s', 'distance_cells', 'turns', 'drive_time_s', 'turn_time_s')},
+            'metrics': metrics,
+            'timing': {
+                'detect_s': detect_time,
+                'plan_s': plan_time,
+                'improve_s': improve_time,
+                'motion_s': motion_time,
+                'sim_s': sim_time
+            }
+        }
+        if improvement is not None:
+            result['improvement'] = improvement
+        if path_planner.capacity_plan['capacity'] and not replayed:
+            result['capacity'] = {key: value for key, value in path_planner.capacity_plan.items()
+                                  if key != 'dump_indices'}
+        if plan_file:
+            result['plan'] = {'file': plan_file, 'replayed': replayed,
+                              'bytes': plan_bytes if plan_bytes is not None else os.path.getsize(plan_file)}
+        if include_route:
+            result['route'] = [list(cell) for cell in route]
+        results.append(result)
+
+    return results
+
+
+def _run_job(job: tuple) -> tuple:
+    """
+    프로세스 풀 작업 1개 (예외는 결과의 'error'로 기록)
+
+    Returns:
+        tuple: (결과 리스트, 트레이스 이벤트 리스트)
+    """
+    (map_path, starts, use_cache, include_route, mission_params, anytime_budget,
+     plan_dir, replay, planner_options, tracing) = job
+    if tracing:
+        trace.enable()
+    try:
+        with trace.span('run_map', cat='headless', map=map_path):
+            entries = run_map(map_path, starts, use_cache, include_route,
+                              mission_params=mission_params, anytime_budget=anytime_budget,
+                              plan_dir=plan_dir, replay=replay, planner_options=planner_options)
+    except Exception as e:
+        entries = [{'map': map_path, 'error': f"{type(e).__name__}: {e}"}]
+    return entries, trace.drain() if tracing else []
+
+
+def run_batch(map_paths: list, starts: list = None, workers: int = None, use_cache: bool = True,
+              include_route: bool = True, progress: bool = True, mission_params: dict = None,
+              tracing: bool = False, anytime_budget: float = None, plan_dir: str = None,
+              replay: bool = False, planner_options: dict = None) -> list:
+    """
+    여러 맵을 프로세스 풀로 처리
+
+    Parameters:
+        map_paths: 맵 파일 경로 리스트
+        starts: 모든 맵에 공통으로 적용할 시작 셀 리스트 (None이면 맵별 기본값)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 순차 실행)
+        use_cache / include_route / mission_params / anytime_budget / plan_dir / replay / planner_options:
+            run_map() 참고
+        progress: 진행 상황 출력 여부
+        tracing: True일 경우 각 작업의 트레이스 이벤트를 현재 프로세스로 모음 (src.utils.trace)
+
+    Returns:
+        list: 결과 dict 리스트 (map_paths 순서)
+    """
+    jobs = [(path, starts, use_cache, include_route, mission_params, anytime_budget,
+             plan_dir, replay, planner_options, tracing)
+            for path in map_paths]
+    results = [None] * len(jobs)
+
+    def report(idx):
+        if not progress:
+            return
+        for entry in results[idx]:
+            if 'error' in entry:
+                print(f"   ❌ {entry['map']}: {entry['error']}")
+            else:
+                print(f"   ✅ {entry['map']} {tuple(entry['start'])} | 군집 {entry['clusters']} | "
+                      f"경로 {entry['route_length']} | 계획 {entry['timing']['plan_s']:.2f}s"
+                      f"{' (재생)' if entry.get('plan', {}).get('replayed') else ''} | "
+                      f"주행 {entry['mission']['mission_time_s']:.0f}s (회전 {entry['mission']['turns']}) | "
+                      f"이동 {entry['metrics']['transit_cells']:.0f} / 제설 {entry['metrics']['coverage_cells']:.0f}셀"
+                      f"{' | 하치장 %d회' % entry['capacity']['trips'] if 'capacity' in entry else ''}")
+
+    if workers == 1 or len(jobs) == 1:
+        for idx, job in enumerate(jobs):
+            results[idx], events = _run_job(job)
+            trace.add_events(events)
+            report(idx)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_job, job): idx for idx, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx], events = future.result()
+                trace.add_events(events)
+                report(idx)
+
+    return [entry for entries in results for entry in entries]
+
+
+def print_trace_summary(limit: int = 10):
+    """트레이스 이름별 누적 시간 상위 항목 출력"""
+    for name, entry in list(trace.summarize().items())[:limit]:
+        print(f"   - {name:<22} {entry['count']:6d}회 | 합계 {entry['total_ms']:10.1f}ms | "
+              f"평균 {entry['mean_ms']:8.2f}ms | 최대 {entry['max_ms']:8.2f}ms")
+
+
+def expand_map_paths(inputs: list) -> list:
+    """맵 파일 / 디렉터리 / 생성기 manifest.json 을 맵 파일 목록으로 확장"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for ext in MAP_EXTENSIONS:
+                paths.extend(sorted(glob.glob(os.path.join(item, '*' + ext))))
+        elif item.endswith('.json'):
+            with open(item) as f:
+                manifest = json.load(f)
+            base = os.path.dirname(item)
+            paths.extend(os.path.join(base, entry['file']) for entry in manifest['scenarios'])
+        else:
+            paths.append(item)
+    return paths
+
+
+def plan_path(plan_dir: str, map_path: str, start: tuple) -> str:
+    """맵/시작 셀별 계획 파일 경로 (<plan_dir>/<맵 이름>_<r>_<c>.tcplan)"""
+    name = os.path.splitext(os.path.basename(map_path))[0]
+    return os.path.join(plan_dir, f"{name}_{start[0]}_{start[1]}.tcplan")
+
+
+def parse_cell(text: str) -> tuple:
+    """'r,c' -> (r, c)"""
+    r, c = text.split(',')
+    return (int(r), int(c))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless 제설 파이프라인 (감지 + 경로 계획 + Waypoint)')
+    parser.add_argument('maps', nargs='+', help='맵 파일, 디렉터리 또는 manifest.json')
+    parser.add_argument('--start', type=parse_cell, action='append', default=None,
+                        help='시작 셀 "r,c" (여러 번 지정 가능, 기본값: 첫 코트 좌상단)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--no-cache', action='store_true', help='감지 캐시 사용 안 함')
+    parser.add_argument('--no-route', action='store_true', help='결과에 경로 좌표를 저장하지 않음')
+    parser.add_argument('--speed', type=float, default=DEFAULT_SPEED, help='주행 시뮬레이션 최대 속도 (px/s)')
+    parser.add_argument('--turn-rate', type=float, default=DEFAULT_TURN_RATE, help='최대 회전 속도 (rad/s)')
+    parser.add_argument('--acceleration', type=float, default=DEFAULT_ACCELERATION, help='가감속 (px/s^2)')
+    parser.add_argument('--anytime', type=float, default=None,
+                        help='Anytime 경로 개선 시간 예산 (초): Greedy 경로 후 방문 순서/진입 코너 개선')
+    parser.add_argument('--bidirectional', action='store_true', help='클러스터 사이 이동 경로를 양방향 BFS로 탐색')
+    parser.add_argument('--multires', type=int, default=None,
+                        help='다중 해상도 축소 배율: 축소 그리드 경로 주변 통로 안에서만 이동 경로 탐색')
+    parser.add_argument('--capacity', type=float, default=None,
+                        help='1회 적재 한도 (눈 픽셀 수): 한도를 넘기 전에 하치장 왕복')
+    parser.add_argument('--dump', type=parse_cell, default=None, help='하치장 셀 "r,c" (기본값: 시작 셀)')
+    parser.add_argument('--plan-dir', type=str, default=None,
+                        help='계획 파일(.tcplan) 디렉터리: 생성한 계획을 맵/시작 셀별로 저장')
+    parser.add_argument('--replay', action='store_true',
+                        help='--plan-dir에 저장된 계획이 있으면 재계획 없이 재생')
+    parser.add_argument('--trace', type=str, default=None,
+                        help='단계별 트레이스 저장 경로 (Chrome Trace JSON, chrome://tracing / Perfetto)')
+    parser.add_argument('--output', type=str, default='headless_results.json', help='결과 JSON 경로')
+    args = parser.parse_args()
+
+    map_paths = expand_map_paths(args.maps)
+    if not map_paths:
+        print("❌ 에러: 처리할 맵 파일이 없습니다.")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"🤖 Headless 파이프라인: 맵 {len(map_paths)}개")
+    print("=" * 60)
+
+    start_time = time.perf_counter()
+    mission_params = {'speed': args.speed, 'turn_rate': args.turn_rate, 'acceleration': args.acceleration}
+    planner_options = {'bidirectional': args.bidirectional, 'capacity': args.capacity, 'dump_site': args.dump,
+                       'multiresolution': args.multires}
+    results = run_batch(map_paths, args.start, args.workers, not args.no_cache, not args.no_route,
+                        mission_params=mission_params, tracing=args.trace is not None,
+                        anytime_budget=args.anytime, plan_dir=args.plan_dir, replay=args.replay,
+                        planner_options=planner_options)
+    elapsed = time.perf_counter() - start_time
+
+    failed = sum(1 for entry in results if 'error' in entry)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'maps': len(map_paths),
+            'runs': len(results),
+            'failed': failed,
+            'elapsed_s': elapsed
+        },
+        'results': results
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f)
+
+    print(f"\n💾 결과 저장: {args.output} ({len(results) - failed}/{len(results)} 성공, {elapsed:.1f}s)")
+
+    if args.trace is not None:
+        trace.export_chrome_trace(args.trace)
+        print(f"🧭 트레이스 저장: {args.trace}")
+        print_trace_summary()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+service.py - 로컬 경로 계획 서비스 (asyncio + 프로세스 풀)
+
+여러 로봇/대시보드가 한 곳에서 경로를 요청할 수 있도록 TCP로 계획 요청을 받아
+프로세스 풀에서 계산하고, 경로는 바이너리(src.control.route_codec)로 돌려줍니다.
+같은 요청(맵, 시작 셀, 군집)이 계산 중이면 새로 계산하지 않고 결과를 함께 받습니다.
+
+    python -m src.launch.service --port 8765 --workers 4
+
+프로토콜 (모든 프레임은 4바이트 big-endian 길이 + 본문)
+    요청 본문: JSON {"id": 1, "map": "maps/TennisCourt_Snow.tcmap", "start": [20, 100],
+                     "clusters": [[[r1, c1], [r2, c2]], ...] (선택, 없으면 맵에서 감지)}
+               JSON {"id": 2, "op": "stats"}  (서비스 통계)
+    응답 본문: 4바이트 big-endian 헤더 길이 + JSON 헤더 + 경로 바이트열
+               헤더 {"id", "ok", "waypoints", "clusters", "plan_s", "deduplicated", "error"(실패 시)}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.control.route_codec import encode_route
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# 작업 프로세스별 맵 캐시 (맵 경로 -> (수정 시각, 감지 결과, 비트 압축 통행 행렬))
+_WORKER_MAPS = {}
+_WORKER_MAPS_SIZE = 8
+
+
+def _load_map(map_path: str, mtime_ns: int) -> tuple:
+    """작업 프로세스에서 맵 감지 결과 + 통행 행렬 로드 (프로세스별 캐싱)"""
+    from src.perception.detect import detect_snow_regions
+    from src.mapdata.raster import open_map_raster
+    from src.mapdata.occupancy import OccupancyView
+
+    cached = _WORKER_MAPS.get(map_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+
+    detection = detect_snow_regions(map_path, use_cache=True, with_layers=False)
+    matrix = OccupancyView(open_map_raster(map_path)).to_bitgrid()
+    if len(_WORKER_MAPS) >= _WORKER_MAPS_SIZE:
+        _WORKER_MAPS.pop(next(iter(_WORKER_MAPS)))
+    _WORKER_MAPS[map_path] = (mtime_ns, detection, matrix)
+    return detection, matrix
+
+
+def plan_request(map_path: str, mtime_ns: int, start: tuple, clusters: tuple = None) -> dict:
+    """
+    계획 요청 1건 처리 (프로세스 풀 작업)
+
+    Parameters:
+        map_path: 맵 파일 절대 경로
+        mtime_ns: 맵 파일 수정 시각 (캐시 무효화용)
+        start: 시작 셀 (r, c)
+        clusters: 군집 리스트 (None이면 맵에서 감지한 군집 사용)
+
+    Returns:
+        dict: {'route': 경로 바이트열, 'waypoints', 'clusters', 'plan_s'}
+    """
+    from src.control.planner import create_snow_removal_planners
+
+    detection, matrix = _load_map(map_path, mtime_ns)
+    if clusters is None:
+        clusters, stats = detection['all_boxes'], detection['cluster_stats']
+    else:
+        clusters, stats = list(clusters), None
+
+    path_planner, _ = create_snow_removal_planners(
+        clusters, cluster_stats=stats, court_structure=detection['court_structure']
+    )
+    plan_start = time.perf_counter()
+    route, _ = path_planner(None, matrix, tuple(start), tuple(start))
+    return {
+        'route': encode_route(route),
+        'waypoints': len(route),
+        'clusters': len(clusters),
+        'plan_s': time.perf_counter() - plan_start
+    }
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """길이 접두 프레임 1개 읽기 (연결 종료 시 None)"""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"프레임이 너무 큽니다 ({size} bytes)")
+    return await reader.readexactly(size)
+
+
+def pack_frame(payload: bytes) -> bytes:
+    """길이 접두 프레임 생성"""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def pack_response(header: dict, route: bytes = b'') -> bytes:
+    """응답 본문 = 헤더 길이 + JSON 헤더 + 경로 바이트열"""
+    encoded = json.dumps(header).encode()
+    return FRAME_HEADER.pack(len(encoded)) + encoded + route
+
+
+def unpack_response(payload: bytes) -> tuple:
+    """응답 본문 -> (헤더 dict, 경로 바이트열)"""
+    (size,) = FRAME_HEADER.unpack_from(payload)
+    header = json.loads(payload[FRAME_HEADER.size:FRAME_HEADER.size + size])
+    return header, payload[FRAME_HEADER.size + size:]
+
+
+class PlanningService:
+    """
+    asyncio 계획 서비스
+
+    Attributes:
+        workers (int): 프로세스 풀 크기
+        stats (dict): 요청/중복 제거/완료/실패 수
+    """
+
+    def __init__(self, workers: int = None):
+        """
+        Parameters:
+            workers: 프로세스 수 (기본값: CPU 수)
+        """
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+        self.server = None
+        self._inflight = {}
+        self._clients = set()
+        self.stats = {'requests': 0, 'deduplicated': 0, 'completed': 0, 'failed': 0}
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """프로세스 풀 생성 + TCP 서버 시작 (port=0이면 빈 포트 자동 선택)"""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        """서버 종료 + 프로세스 풀 정리"""
+        if self.server is not None:
+            self.server.close()
+            for task in list(self._clients):
+                task.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def plan(self, map_ref: str, start: tuple, clusters: list = None) -> tuple:
+        """
+        계획 요청 처리 (같은 요청이 계산 중이면 그 결과를 함께 기다림)
+
+        Returns:
+            tuple: (결과 dict, 중복 제거 여부)
+        """
+        map_path = os.path.abspath(map_ref)
+        mtime_ns = os.stat(map_path).st_mtime_ns
+        clusters = tuple(tuple(tuple(corner) for corner in box) for box in clusters) if clusters else None
+        key = (map_path, mtime_ns, tuple(start), clusters)
+
+        self.stats['requests'] += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['deduplicated'] += 1
+            return await asyncio.shield(future), True
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, plan_request, map_path, mtime_ns, tuple(start), clusters)
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future), False
+        finally:
+            self._inflight.pop(key, None)
+
+    async def handle_request(self, frame: bytes) -> bytes:
+        """요청 프레임 1개 -> 응답 본문 (JSON이 아니거나 객체가 아닌 본문은 오류 응답)"""
+        try:
+            request = json.loads(frame)
+        except ValueError as e:
+            self.stats['failed'] += 1
+            return pack_response({'id': None, 'ok': False, 'error': f"잘못된 JSON 요청: {e}"})
+        if not isinstance(request, dict):
+            self.stats['failed'] += 1
+            return pack_response({'id': None, 'ok': False,
+                                  'error': f"요청은 JSON 객체여야 합니다 ({type(request).__name__})"})
+
+        header = {'id': request.get('id')}
+        if request.get('op') == 'stats':
+            header.update(ok=True, stats=dict(self.stats, inflight=len(self._inflight)))
+            return pack_response(header)
+
+        try:
+            result, deduplicated = await self.plan(request['map'], request['start'], request.get('clusters'))
+        except Exception as e:
+            self.stats['failed'] += 1
+            header.update(ok=False, error=f"{type(e).__name__}: {e}")
+            return pack_response(header)
+
+        self.stats['completed'] += 1
+        header.update(ok=True, deduplicated=deduplicated,
+                      **{key: result[key] for key in ('waypoints', 'clusters', 'plan_s')})
+        return pack_response(header, result['route'])
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """연결 1개 처리 - 한 연결에서 여러 요청을 동시에 보내면 끝난 순서대로 응답"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        self._clients.add(asyncio.current_task())
+
+        async def respond(frame):
+            payload = await self.handle_request(frame)
+            async with write_lock:
+                writer.write(pack_frame(payload))
+                await writer.drain()
+
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                task = asyncio.create_task(respond(frame))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError) as e:
+            print(f"⚠️ 연결 오류: {e}")
+        except asyncio.CancelledError:
+            pass  # 서비스 종료
+        finally:
+            self._clients.discard(asyncio.current_task())
+            writer.close()
+
+
+async def request_plan(host: str, port: int, map_ref: str, start: tuple, clusters: list = None) -> tuple:
+    """
+    계획 요청 1건 (새 연결 사용, 간단한 클라이언트)
+
+    Returns:
+        tuple: (응답 헤더 dict, 경로 바이트열)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        request = {'id': 0, 'map': map_ref, 'start': list(start)}
+        if clusters:
+            request['clusters'] = clusters
+        writer.write(pack_frame(json.dumps(request).encode()))
+        await writer.drain()
+        return unpack_response(await read_frame(reader))
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, workers: int):
+    """서비스 실행 (Ctrl+C로 종료)"""
+    service = PlanningService(workers)
+    host, port = await service.start(host, port)
+    print(f"🛰️ 경로 계획 서비스 시작: {host}:{port} (프로세스 {service.workers}개)")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 경로 계획 서비스')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='바인드 주소')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='포트')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본값: CPU 수)')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        print("\n⚠️ 서비스를 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,6 @@ wrapper.py - 테니스장 제설 시뮬레이터 통합 래퍼
 
 import os
 import sys
-import pickle
-from autonavsim2d.autonavsim2d import AutoNavSim2D
 
 # 프로젝트 루트를 경로에 추가
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,6 +11,8 @@ sys.path.insert(0, project_root)
 
 from src.perception.detect import detect_snow_regions
 from src.control.planner import create_snow_removal_planners
+from src.mapdata.raster import colors_to_map_val, cached_map_pickle
+from src.utils import trace
 
 
 class SnowRemovalSimulator:
@@ -21,28 +21,41 @@ class SnowRemovalSimulator:
     
     Attributes:
         map_path (str): 맵 파일 경로
+        map_colors (np.ndarray): 군집별로 재색칠된 색상 레이어
         snow_clusters (list): 감지된 눈 영역 리스트
+        cluster_stats (list): 눈 영역별 적설량 통계
+        court_structure (dict): 코트 구조 (코트 경계, 네트, 라인)
         custom_path_planner (func): 경로 계획 함수
         custom_motion_planner (func): 모션 제어 함수
         simulator (AutoNavSim2D): 시뮬레이터 인스턴스
     """
     
-    def __init__(self, map_path='maps/TennisCourt_Snow.pkl', show_frame=True, show_grid=True):
+    def __init__(self, map_path='maps/TennisCourt_Snow.pkl', show_frame=True, show_grid=True,
+                 anytime_budget=None, plan_file=None):
         """
         초기화 및 설정
         
         Parameters:
-            map_path: 로드할 맵 파일 경로 (.pkl)
+            map_path: 로드할 맵 파일 경로 (.pkl 또는 .tcmap)
             show_frame: 로봇 좌표계(Frame) 표시 여부
             show_grid: 맵 그리드 표시 여부
+            anytime_budget: 백그라운드 경로 개선 시간 예산 (초, None이면 Greedy 경로만 사용)
+            plan_file: 계획 파일 경로 (.tcplan, 선택)
+                       파일이 있으면 재계획 없이 저장된 경로를 재생하고, 없으면 실행 후 생성된 경로를 저장
         """
         self.map_path = map_path
         self.show_frame = show_frame
         self.show_grid = show_grid
+        self.anytime_budget = anytime_budget
+        self.plan_file = plan_file
+        self.replaying = False
         
         # 변수 초기화
+        self.map_colors = None
         self.map_data = None
         self.snow_clusters = []
+        self.cluster_stats = []
+        self.court_structure = None
         self.custom_path_planner = None
         self.custom_motion_planner = None
         self.simulator = None
@@ -77,17 +90,29 @@ class SnowRemovalSimulator:
             print("❌ 에러: 눈 영역 감지 실패")
             sys.exit(1)
         
-        self.map_data = result['map_val']
+        # AutoNavSim2D 그리드(map_data)는 GUI 초기화 시점에 색상 레이어로부터 생성
+        self.map_colors = result['colors']
+        self.map_data = None
         self.snow_clusters = result['all_boxes']
+        self.cluster_stats = result['cluster_stats']
+        self.court_structure = result['court_structure']
+        
+        if result.get('from_cache'):
+            print(f"   - 감지 캐시 사용: {self.map_path}.detect.npz")
+        
+        # 코트 구조 / 클러스터 정보 출력
+        for idx, court in enumerate(self.court_structure['courts'], 1):
+            r1, c1, r2, c2 = court['bounds']
+            print(f"   - 코트 {idx}: ({r1},{c1})-({r2},{c2}) | 네트 행: {court['net_rows']}")
         
-        # 클러스터 정보 출력
         print(f"\n📋 감지된 제설 구역:")
-        for idx, cluster in enumerate(self.snow_clusters, 1):
+        for idx, (cluster, stats) in enumerate(zip(self.snow_clusters, self.cluster_stats), 1):
             (r1, c1), (r2, c2) = cluster
             width = c2 - c1 + 1
             height = r2 - r1 + 1
             area = width * height
-            print(f"   {idx}. 위치: ({r1},{c1})-({r2},{c2}) | 크기: {width}x{height} ({area}px)")
+            print(f"   {idx}. 위치: ({r1},{c1})-({r2},{c2}) | 크기: {width}x{height} ({area}px)"
+                  f" | 눈: {stats['pixel_count']}px, 밀도: {stats['density']:.2f}")
         
         return self.snow_clusters
     
@@ -109,11 +134,21 @@ class SnowRemovalSimulator:
         
         # Closure 패턴으로 planner 생성(factory 함수 호출)
         self.custom_path_planner, self.custom_motion_planner = create_snow_removal_planners(
-            self.snow_clusters
+            self.snow_clusters,
+            cluster_stats=self.cluster_stats,
+            court_structure=self.court_structure,
+            anytime_budget=self.anytime_budget
         )
         
         print(f"✅ Custom Planner 생성 완료")
         
+        # 저장된 계획이 있으면 재계획 없이 재생
+        if self.plan_file and os.path.exists(self.plan_file):
+            with open(self.plan_file, 'rb') as f:
+                route = self.custom_path_planner.import_plan(f.read())
+            self.replaying = True
+            print(f"   - 저장된 계획 재생: {self.plan_file} (Waypoint {len(route)}개)")
+        
         return self.custom_path_planner, self.custom_motion_planner
     
     def initialize_simulator(self):
@@ -132,21 +167,25 @@ class SnowRemovalSimulator:
             print("⚠️ 경고: Planner가 생성되지 않았습니다. 먼저 create_planners()를 실행하세요.")
             return None
         
-        if self.map_data is None:
+        if self.map_colors is None:
             print("⚠️ 경고: 맵 데이터가 없습니다. 먼저 load_map_and_detect_snow()를 실행하세요.")
             return None
         
-        # 맵 데이터를 임시 파일로 저장(시뮬레이터)
-        temp_map_path = 'maps/temp_Snow_map.pkl'
-        os.makedirs('maps', exist_ok=True)
-        with open(temp_map_path, 'wb') as f:
-            pickle.dump(self.map_data, f)
+        # GUI용 AutoNavSim2D 그리드 생성 (pygame.Rect 포함)
+        if self.map_data is None:
+            self.map_data = colors_to_map_val(self.map_colors)
+        
+        # pygame 창을 여는 AutoNavSim2D는 GUI를 실제로 띄울 때만 로드
+        from autonavsim2d.autonavsim2d import AutoNavSim2D
+        
+        # 시뮬레이터가 맵 속성을 직접 받을 수 있으면 메모리로 전달 (피클 저장/로드 생략)
+        in_memory = hasattr(AutoNavSim2D, 'map_available')
         
         # AutoNavSim2D 초기화
         config = {
             'show_frame': self.show_frame,
             'show_grid': self.show_grid,
-            'map': temp_map_path
+            'map': 'default' if in_memory else cached_map_pickle(self.map_colors, self.map_data)
         }
         
         try:
@@ -158,6 +197,10 @@ class SnowRemovalSimulator:
                 config=config
             )
             
+            if in_memory:
+                self.simulator.map_val = self.map_data
+                self.simulator.map_available = True
+            
             # custom_motion_planner가 None이 아닐 때 속성이 설정되지 않는 문제 해결
             if not hasattr(self.simulator, 'custom_motion_planner'):
                 print(" 💡 Workaround: Motion Planner 속성 강제 설정")
@@ -171,6 +214,7 @@ class SnowRemovalSimulator:
             
             print(f"✅ AutoNavSim2D 초기화 완료")
             print(f"   - Window: amr (Autonomous Mobile Robot)")
+            print(f"   - Map: {'메모리 전달' if in_memory else config['map']}")
             print(f"   - Show Frame: {self.show_frame}")
             print(f"   - Show Grid: {self.show_grid}")
             
@@ -216,6 +260,30 @@ class SnowRemovalSimulator:
             print(f"\n❌ 에러 발생: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            if self.plan_file and not self.replaying:
+                self.save_plan(self.plan_file)
+            # SNOWBOT_TRACE=<경로> 로 실행한 경우 단계별 트레이스 저장
+            trace_path = trace.env_trace_path()
+            if trace.is_enabled() and trace_path:
+                trace.export_chrome_trace(trace_path)
+                print(f"\n🧭 트레이스 저장: {trace_path}")
+    
+    def save_plan(self, path: str) -> bool:
+        """
+        생성된 계획(경로 + 클러스터 방문 순서/진입 코너)을 파일로 저장
+
+        Returns:
+            bool: 저장 여부 (아직 경로를 생성하지 않았으면 False)
+        """
+        data = self.custom_path_planner.export_plan() if self.custom_path_planner else None
+        if data is None:
+            print("⚠️ 경고: 저장할 경로가 없습니다. 'Plan Path'로 경로를 먼저 생성하세요.")
+            return False
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"\n💾 계획 저장: {path} ({len(data)} bytes)")
+        return True
     
     def quick_start(self):
         """전체 초기화 및 실행을 한 번에 수행"""
@@ -0,0 +1 @@
+# mapdata 패키지
@@ -0,0 +1,115 @@
+"""
+bitgrid.py - 비트 압축 통행 그리드 (셀당 1비트)
+
+list of lists 통행 행렬은 셀마다 포인터(8바이트) + 행 객체 오버헤드가 들지만,
+BitGrid는 셀당 1비트만 사용해 수백만 셀 시설 맵도 수 MB 안에 담고 복사도 한 번의 메모리 복사로 끝납니다.
+
+각 행은 바이트 단위로 정렬되고 끝에 1비트 이상의 0(장애물) 패딩이 있습니다.
+따라서 평탄 인덱스 idx = r * stride + c 에서 좌우 이웃 (idx -+ 1)이 행 경계를 넘으면
+자동으로 장애물이 되어, 탐색 엔진은 열 범위 검사 없이 비트만 확인하면 됩니다.
+"""
+
+import numpy as np
+
+BIT_ORDER = 'little'
+
+
+class BitGrid:
+    """
+    비트 압축 통행 그리드 (1: 통행 가능, 0: 장애물)
+
+    planner의 matrix 인터페이스(len(grid), grid[r][c], len(grid[0]))도 지원합니다.
+
+    Attributes:
+        bits (np.ndarray): (rows, row_bytes) uint8 비트 배열 (little bit order)
+        rows (int): 행 수
+        cols (int): 열 수
+        stride (int): 평탄 인덱스 행 간격 (row_bytes * 8, cols보다 큼)
+    """
+
+    def __init__(self, bits: np.ndarray, cols: int):
+        self.bits = np.ascontiguousarray(bits, dtype=np.uint8)
+        self.rows = self.bits.shape[0]
+        self.cols = cols
+        self.stride = self.bits.shape[1] * 8
+
+    @staticmethod
+    def row_bytes(cols: int) -> int:
+        """행당 바이트 수 (패딩 1비트 이상 보장)"""
+        return cols // 8 + 1
+
+    @classmethod
+    def from_bool(cls, mask: np.ndarray) -> 'BitGrid':
+        """bool/0-1 배열 (rows, cols) -> BitGrid"""
+        mask = np.asarray(mask, dtype=bool)
+        rows, cols = mask.shape
+        padded = np.zeros((rows, cls.row_bytes(cols) * 8), dtype=bool)
+        padded[:, :cols] = mask
+        return cls(np.packbits(padded, axis=1, bitorder=BIT_ORDER), cols)
+
+    @classmethod
+    def from_matrix(cls, matrix) -> 'BitGrid':
+        """2D List / 배열 / BitGrid -> BitGrid (BitGrid면 그대로 반환)"""
+        if isinstance(matrix, cls):
+            return matrix
+        return cls.from_bool(np.asarray(matrix) == 1)
+
+    @property
+    def shape(self) -> tuple:
+        return (self.rows, self.cols)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        """행 1개 (uint8 0/1 배열) - grid[r][c] 접근용"""
+        return np.unpackbits(self.bits[row], count=self.cols, bitorder=BIT_ORDER)
+
+    def is_free(self, r: int, c: int) -> bool:
+        """(r, c)가 범위 안이고 통행 가능한지"""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return False
+        return bool(self.bits[r, c >> 3] >> (c & 7) & 1)
+
+    def neighbors(self, pos: tuple) -> list:
+        """통행 가능한 상하좌우 이웃 (get_neighbors와 같은 순서)"""
+        r, c = pos
+        return [(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                if self.is_free(nr, nc)]
+
+    def view(self) -> memoryview:
+        """
+        탐색 엔진용 평탄 비트 뷰 (복사 없음)
+
+        셀 (r, c)의 비트: view[idx >> 3] >> (idx & 7) & 1, idx = r * stride + c
+        """
+        return memoryview(self.bits).cast('B')
+
+    def to_flat(self, pos: tuple) -> int:
+        """(r, c) -> 평탄 인덱스"""
+        return pos[0] * self.stride + pos[1]
+
+    def from_flat(self, idx: int) -> tuple:
+        """평탄 인덱스 -> (r, c)"""
+        return divmod(idx, self.stride)
+
+    def to_bool(self) -> np.ndarray:
+        """(rows, cols) bool 배열"""
+        return np.unpackbits(self.bits, axis=1, count=self.cols, bitorder=BIT_ORDER).astype(bool)
+
+    def to_matrix(self) -> list:
+        """2D List (AutoNavSim2D 형식)"""
+        return np.unpackbits(self.bits, axis=1, count=self.cols, bitorder=BIT_ORDER).tolist()
+
+    def copy(self) -> 'BitGrid':
+        return BitGrid(self.bits.copy(), self.cols)
+
+    def __or__(self, other: 'BitGrid') -> 'BitGrid':
+        return BitGrid(self.bits | other.bits, self.cols)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BitGrid) and self.cols == other.cols and np.array_equal(self.bits, other.bits)
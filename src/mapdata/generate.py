@@ -0,0 +1,253 @@
+"""
+generate.py - NumPy 기반 테니스 코트 합성 맵 생성기
+
+코트 라인/네트/눈 패치를 배열 연산으로 래스터화합니다. 같은 시드와 파라미터는 항상 같은 맵을
+만들며, generate_batch()는 여러 프로세스로 시나리오 묶음(벤치마크 입력 코퍼스)을 생성합니다.
+"""
+
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.mapdata.raster import RASTER_SUFFIX, colors_to_raster, colors_to_map_val, save_raster
+
+# 색상 정의 (tools/tenniscourt_map_gen.py 와 동일)
+GREEN = (0, 255, 0)      # 코트 바닥
+BLACK = (0, 0, 0)        # 경계선/네트
+GREY = (128, 128, 128)   # 외부 영역
+BLUE = (100, 149, 237)   # 눈 영역
+LIGHT_BLUE = (173, 216, 230)
+
+# 코트 1면 타일 규격 (AutoNavSim2D 창 1개 크기)
+TILE_HEIGHT, TILE_WIDTH = 175, 230
+COURT_HEIGHT, COURT_WIDTH = 160, 100
+BORDER_THICKNESS = 2
+SERVICE_LINE_OFFSET = 30  # 네트에서 서비스 라인까지 (21피트)
+SINGLES_MARGIN = 10       # 단식/복식 사이드라인 간격
+
+# 눈 패치 기본 크기 (최소, 최대)와 패치 사이 최소 간격 (DBSCAN eps=8 보다 큼)
+DEFAULT_PATCH_SIZE = (15, 20)
+PATCH_GAP = 9
+PATCH_MARGIN = 4          # 코트 경계/네트에서 떨어뜨릴 거리
+PATCH_FILL = 0.8          # 패치 내부에서 눈이 있는 셀 비율
+PATCH_LIGHT = 0.3         # 눈 셀 중 LIGHT_BLUE 비율
+
+
+def court_origins(num_courts: int, courts_per_row: int = None) -> tuple:
+    """
+    코트 타일 배치 계산
+
+    Parameters:
+        num_courts: 코트 수
+        courts_per_row: 한 줄에 놓을 코트 수 (None이면 정사각형에 가깝게)
+
+    Returns:
+        tuple: (맵 크기 (rows, cols), [(코트 시작 행, 코트 시작 열), ...])
+    """
+    if courts_per_row is None:
+        courts_per_row = int(np.ceil(np.sqrt(num_courts)))
+    courts_per_row = max(1, min(courts_per_row, num_courts))
+    tile_rows = -(-num_courts // courts_per_row)
+
+    origins = [
+        (tr * TILE_HEIGHT + (TILE_HEIGHT - COURT_HEIGHT) // 2,
+         tc * TILE_WIDTH + (TILE_WIDTH - COURT_WIDTH) // 2)
+        for tr, tc in (divmod(idx, courts_per_row) for idx in range(num_courts))
+    ]
+    return (tile_rows * TILE_HEIGHT, courts_per_row * TILE_WIDTH), origins
+
+
+def draw_court(colors: np.ndarray, r0: int, c0: int) -> dict:
+    """
+    표준 테니스 코트 1면 그리기 (바닥, 외곽선, 네트, 서비스/센터/단식 라인)
+
+    Parameters:
+        colors: 색상 레이어 (제자리 수정)
+        r0, c0: 코트 좌상단 좌표
+
+    Returns:
+        dict: {'bounds': (r1, c1, r2, c2) 끝 미포함, 'net_row': 네트 첫 행}
+    """
+    r1, c1 = r0 + COURT_HEIGHT, c0 + COURT_WIDTH
+    net_row = r0 + COURT_HEIGHT // 2
+    t = BORDER_THICKNESS
+
+    colors[r0:r1, c0:c1] = GREEN
+
+    # 외곽 경계선
+    colors[r0:r0 + t, c0:c1] = BLACK
+    colors[r1 - t:r1, c0:c1] = BLACK
+    colors[r0:r1, c0:c0 + t] = BLACK
+    colors[r0:r1, c1 - t:c1] = BLACK
+
+    # 네트 (2행) / 서비스 라인 / 센터 서비스 라인
+    colors[net_row:net_row + 2, c0:c1] = BLACK
+    service_top = net_row - SERVICE_LINE_OFFSET
+    service_bottom = net_row + SERVICE_LINE_OFFSET
+    colors[[service_top, service_bottom], c0:c1] = BLACK
+    colors[service_top:service_bottom + 1, c0 + COURT_WIDTH // 2] = BLACK
+
+    # 단식 사이드라인
+    colors[r0:r1, [c0 + SINGLES_MARGIN, c1 - SINGLES_MARGIN]] = BLACK
+
+    return {'bounds': (r0, c0, r1, c1), 'net_row': net_row}
+
+
+def patch_slots(court: dict, patch_size: tuple = DEFAULT_PATCH_SIZE) -> list:
+    """
+    코트 1면에서 눈 패치를 놓을 수 있는 슬롯(좌상단 좌표) 목록
+
+    슬롯 간격이 최대 패치 크기 + PATCH_GAP 이므로 패치끼리 하나의 군집으로 합쳐지지 않고,
+    네트를 넘어가는 패치도 생기지 않습니다.
+    """
+    r0, c0, r1, c1 = court['bounds']
+    net_row = court['net_row']
+    step = patch_size[1] + PATCH_GAP
+
+    slots = []
+    for h0, h1 in ((r0 + PATCH_MARGIN, net_row - PATCH_MARGIN), (net_row + 2 + PATCH_MARGIN, r1 - 2)):
+        for sr in range(h0, h1 - patch_size[1] + 1, step):
+            for sc in range(c0 + PATCH_MARGIN, c1 - 2 - patch_size[1] + 1, step):
+                slots.append((sr, sc))
+    return slots
+
+
+def add_snow_patches(colors: np.ndarray, slots: list, num_patches: int, rng,
+                     patch_size: tuple = DEFAULT_PATCH_SIZE) -> list:
+    """
+    슬롯 중 num_patches개를 골라 눈 패치를 한 번에 래스터화
+
+    Parameters:
+        colors: 색상 레이어 (제자리 수정)
+        slots: patch_slots() 결과 (여러 코트 합친 목록 가능)
+        num_patches: 패치 수
+        rng: np.random.Generator
+        patch_size: 패치 한 변 길이 (최소, 최대)
+
+    Returns:
+        list: 패치 영역 [((r1,c1),(r2,c2)), ...] (끝 포함)
+    """
+    if num_patches > len(slots):
+        raise ValueError(f"눈 패치 {num_patches}개를 배치할 공간이 부족합니다 (최대 {len(slots)}개)")
+    if num_patches == 0:
+        return []
+
+    lo, hi = patch_size
+    origins = np.asarray(slots)[rng.choice(len(slots), size=num_patches, replace=False)]
+    sizes = rng.integers(lo, hi + 1, size=(num_patches, 2))
+
+    # (패치, 행, 열) 3차원 배열로 모든 패치의 셀을 한 번에 계산
+    offsets = np.arange(hi)
+    inside = ((offsets[None, :, None] < sizes[:, 0, None, None]) &
+              (offsets[None, None, :] < sizes[:, 1, None, None]))
+    snow = inside & (rng.random(inside.shape) < PATCH_FILL)
+    light = rng.random(inside.shape) < PATCH_LIGHT
+
+    rows = np.broadcast_to(origins[:, 0, None, None] + offsets[None, :, None], inside.shape)
+    cols = np.broadcast_to(origins[:, 1, None, None] + offsets[None, None, :], inside.shape)
+    colors[rows[snow & ~light], cols[snow & ~light]] = BLUE
+    colors[rows[snow & light], cols[snow & light]] = LIGHT_BLUE
+
+    return [((int(r), int(c)), (int(r + h - 1), int(c + w - 1)))
+            for (r, c), (h, w) in zip(origins.tolist(), sizes.tolist())]
+
+
+def generate_map(num_courts: int = 1, num_patches: int = 8, patch_size: tuple = DEFAULT_PATCH_SIZE,
+                 noise: float = 0.0, seed: int = 0, courts_per_row: int = None) -> tuple:
+    """
+    합성 테니스장 맵 생성
+
+    Parameters:
+        num_courts: 코트 수
+        num_patches: 눈 패치 수 (전체 코트 합계)
+        patch_size: 패치 한 변 길이 (최소, 최대)
+        noise: 코트 바닥에 흩뿌릴 단독 눈 셀 비율
+        seed: 난수 시드 (같은 시드 + 파라미터 -> 같은 맵)
+        courts_per_row: 한 줄에 놓을 코트 수
+
+    Returns:
+        tuple: (색상 레이어 (rows x cols x 3, uint8),
+                {'courts': [{'bounds', 'net_row'}, ...], 'patches': [((r1,c1),(r2,c2)), ...]})
+    """
+    rng = np.random.default_rng(seed)
+    shape, origins = court_origins(num_courts, courts_per_row)
+
+    colors = np.empty(shape + (3,), dtype=np.uint8)
+    colors[:] = GREY
+
+    courts = [draw_court(colors, r0, c0) for r0, c0 in origins]
+    slots = [slot for court in courts for slot in patch_slots(court, patch_size)]
+    patches = add_snow_patches(colors, slots, num_patches, rng, patch_size)
+
+    if noise > 0:
+        floor = np.all(colors == GREEN, axis=-1)
+        colors[floor & (rng.random(floor.shape) < noise)] = LIGHT_BLUE
+
+    return colors, {'courts': courts, 'patches': patches}
+
+
+def save_map(colors: np.ndarray, path: str):
+    """색상 레이어를 확장자에 맞는 포맷으로 저장 (.tcmap: 래스터, .pkl: AutoNavSim2D 그리드)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if path.endswith(RASTER_SUFFIX):
+        save_raster(path, colors_to_raster(colors))
+    else:
+        with open(path, 'wb') as f:
+            pickle.dump(colors_to_map_val(colors), f)
+
+
+def _generate_scenario(job: tuple) -> dict:
+    """generate_batch 작업 1개 (프로세스 풀에서 실행)"""
+    path, seed, params = job
+    colors, info = generate_map(seed=seed, **params)
+    save_map(colors, path)
+    return {
+        'file': os.path.basename(path),
+        'seed': seed,
+        'rows': int(colors.shape[0]),
+        'cols': int(colors.shape[1]),
+        'patches': [[r1, c1, r2, c2] for (r1, c1), (r2, c2) in info['patches']]
+    }
+
+
+def generate_batch(output_dir: str, count: int, seed: int = 0, workers: int = None,
+                   map_format: str = 'tcmap', **params) -> str:
+    """
+    시나리오 묶음 생성 (시나리오 i의 시드 = seed + i)
+
+    Parameters:
+        output_dir: 출력 디렉터리
+        count: 시나리오 수
+        seed: 시작 시드
+        workers: 프로세스 수 (None: CPU 수, 1: 현재 프로세스에서 실행)
+        map_format: 'tcmap' 또는 'pkl'
+        **params: generate_map() 파라미터 (num_courts, num_patches, patch_size, noise, courts_per_row)
+
+    Returns:
+        str: 시나리오 목록(manifest.json) 경로
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    width = max(6, len(str(seed + count - 1)))
+    jobs = [(os.path.join(output_dir, f"scenario_{seed + i:0{width}d}.{map_format}"), seed + i, params)
+            for i in range(count)]
+
+    if workers == 1:
+        scenarios = [_generate_scenario(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, count // ((workers or os.cpu_count() or 1) * 8))
+            scenarios = list(pool.map(_generate_scenario, jobs, chunksize=chunksize))
+
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    with open(manifest_path, 'w') as f:
+        json.dump({
+            'seed': seed,
+            'count': count,
+            'format': map_format,
+            'params': {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()},
+            'scenarios': scenarios
+        }, f, indent=1)
+    return manifest_path
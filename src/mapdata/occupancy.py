@@ -0,0 +1,143 @@
+"""
+occupancy.py - MapRaster 기반 통행 가능(occupancy) 행렬
+
+AutoNavSim2D가 GUI에서 만드는 행렬(generate_grid_matrix + 장애물 2셀 팽창)과 같은 값을
+래스터에서 직접, 필요한 창(window)만 계산합니다.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from src.mapdata.bitgrid import BitGrid, BIT_ORDER
+
+# AutoNavSim2D 색상 (autonavsim2d.utils.utils 기준)
+SIM_WHITE = (255, 255, 255)
+SIM_GREY = (192, 192, 192)
+SIM_RED = (111, 0, 0)
+SIM_GREEN = (0, 255, 0)
+SIM_BLUE = (0, 0, 102)
+SIM_ORANGE = (255, 128, 0)
+
+# 장애물 주변을 통행 불가로 만드는 거리 (맨해튼, generate_path_custom과 동일)
+INFLATE_RADIUS = 2
+
+
+def free_space_lut(raster, show_grid: bool = True) -> np.ndarray:
+    """팔레트 인덱스별 통행 가능 여부 LUT (generate_grid_matrix 기준)"""
+    background = SIM_GREY if show_grid else SIM_WHITE
+    return raster.palette_mask([background, SIM_RED, SIM_GREEN, SIM_BLUE, SIM_ORANGE])
+
+
+def inflation_source_lut(raster) -> np.ndarray:
+    """팔레트 인덱스별 '주변을 팽창시키는 장애물' 여부 LUT (generate_path_custom 기준)"""
+    return ~raster.palette_mask([SIM_GREY, SIM_RED, SIM_GREEN, SIM_BLUE, SIM_ORANGE])
+
+
+def occupancy_window(raster, r0: int, r1: int, c0: int, c1: int, show_grid: bool = True,
+                     inflate: int = INFLATE_RADIUS) -> np.ndarray:
+    """
+    (r0:r1, c0:c1) 창의 통행 행렬 계산 - 팽창 반경만큼만 주변을 더 읽음
+
+    Parameters:
+        raster: src.mapdata.raster.MapRaster (메모리 맵 가능)
+        r0, r1, c0, c1: 창 범위 (끝 미포함)
+        show_grid: AutoNavSim2D show_grid 설정 (배경색 결정)
+        inflate: 장애물 팽창 반경 (0이면 팽창 없음)
+
+    Returns:
+        np.ndarray: 통행 행렬 (uint8, 0: 장애물, 1: 이동가능)
+    """
+    rows, cols = raster.shape
+    pr0, pc0 = max(0, r0 - inflate), max(0, c0 - inflate)
+    pr1, pc1 = min(rows, r1 + inflate), min(cols, c1 + inflate)
+
+    indices = np.asarray(raster.indices[pr0:pr1, pc0:pc1])
+    free = free_space_lut(raster, show_grid)[indices]
+
+    if inflate > 0:
+        from scipy import ndimage  # 필요할 때만 로드 (import 시간 절감)
+
+        yy, xx = np.mgrid[-inflate:inflate + 1, -inflate:inflate + 1]
+        diamond = (np.abs(yy) + np.abs(xx)) <= inflate
+        blocked = ndimage.binary_dilation(inflation_source_lut(raster)[indices], structure=diamond)
+        free &= ~blocked
+
+    return free[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0].astype(np.uint8)
+
+
+class OccupancyView:
+    """
+    planner용 통행 행렬 뷰 (matrix[r][c], len(matrix) 인터페이스)
+
+    행 타일 단위로 필요할 때 계산하고 최근 타일만 보관하므로,
+    메모리 맵 래스터와 함께 쓰면 실제로 접근한 영역만 읽습니다.
+
+    Attributes:
+        raster (MapRaster): 원본 래스터
+        tile_rows (int): 타일 행 수
+        max_tiles (int): 보관할 최대 타일 수
+    """
+
+    def __init__(self, raster, tile_rows: int = 64, max_tiles: int = 32, show_grid: bool = True,
+                 inflate: int = INFLATE_RADIUS):
+        self.raster = raster
+        self.tile_rows = tile_rows
+        self.max_tiles = max_tiles
+        self.show_grid = show_grid
+        self.inflate = inflate
+        self._tiles = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.raster.shape[0]
+
+    def __getitem__(self, row: int) -> list:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        tile_idx = row // self.tile_rows
+        return self._tile(tile_idx)[row - tile_idx * self.tile_rows]
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def window(self, r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+        """임의 창의 통행 행렬 (numpy, 캐시 미사용)"""
+        return occupancy_window(self.raster, r0, r1, c0, c1, self.show_grid, self.inflate)
+
+    def to_matrix(self) -> list:
+        """전체 통행 행렬 (2D List) - AutoNavSim2D가 planner에 넘기는 형식"""
+        return [list(row) for row in self]
+
+    def to_bitgrid(self):
+        """
+        전체 통행 행렬 (비트 압축 BitGrid) - 2D List를 만들지 않고 타일 단위로 압축
+
+        Returns:
+            BitGrid: 비트 압축 통행 그리드
+        """
+        rows, cols = self.raster.shape
+        row_bytes = BitGrid.row_bytes(cols)
+        bits = np.zeros((rows, row_bytes), dtype=np.uint8)
+        for r0 in range(0, rows, self.tile_rows):
+            r1 = min(rows, r0 + self.tile_rows)
+            padded = np.zeros((r1 - r0, row_bytes * 8), dtype=bool)
+            padded[:, :cols] = self.window(r0, r1, 0, cols) == 1
+            bits[r0:r1] = np.packbits(padded, axis=1, bitorder=BIT_ORDER)
+        return BitGrid(bits, cols)
+
+    def _tile(self, tile_idx: int) -> list:
+        if tile_idx in self._tiles:
+            self._tiles.move_to_end(tile_idx)
+            return self._tiles[tile_idx]
+
+        r0 = tile_idx * self.tile_rows
+        r1 = min(len(self), r0 + self.tile_rows)
+        tile = self.window(r0, r1, 0, self.raster.shape[1]).tolist()
+
+        self._tiles[tile_idx] = tile
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
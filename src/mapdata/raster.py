@@ -0,0 +1,373 @@
+"""
+raster.py - 색상 인덱스 래스터 기반 경량 맵 포맷 (.tcmap)
+
+AutoNavSim2D 피클 맵은 셀마다 [pygame.Rect, color, (i, j)]를 저장하지만,
+Rect는 CELL_SPACING/CELL_SIZE로 결정되므로 색상 정보만 있으면 충분합니다.
+
+파일 구조:
+    MAGIC (6 bytes) | 헤더 길이 (uint32, little-endian) | 헤더 JSON | 패딩 | uint8 색상 인덱스 (rows x cols)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b'TCMAP\x00'
+FORMAT_VERSION = 1
+RASTER_SUFFIX = '.tcmap'
+DATA_ALIGNMENT = 64
+
+# 시뮬레이터 전달용 피클 캐시 디렉터리 (저장소 밖, 내용 해시로 파일명 결정)
+HANDOFF_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'tennis_snowbot_maps')
+
+# AutoNavSim2D 그리드 규격
+CELL_SIZE = 4
+CELL_SPACING = 5
+
+# 기본 팔레트 (맵 생성기 색상 + 군집 시각화 색상)
+DEFAULT_PALETTE = [
+    (128, 128, 128),    # GREY (외부 영역)
+    (0, 255, 0),        # GREEN (코트 바닥)
+    (0, 0, 0),          # BLACK (라인/네트)
+    (255, 255, 255),    # WHITE
+    (100, 149, 237),    # BLUE (짙은 눈)
+    (173, 216, 230),    # LIGHT_BLUE (옅은 눈)
+    (255, 0, 0),        # RED
+    (0, 0, 255),        # BLUE (군집)
+    (255, 255, 0),      # YELLOW
+    (255, 0, 255),      # MAGENTA
+    (0, 255, 255),      # CYAN
+    (255, 128, 0),      # ORANGE
+    (128, 0, 255),      # PURPLE
+]
+
+
+class MapRaster:
+    """
+    색상 인덱스 래스터 맵
+
+    Attributes:
+        indices (np.ndarray): 셀별 팔레트 인덱스 (rows x cols, uint8)
+        palette (np.ndarray): 팔레트 색상 (K x 3, uint8)
+        cell_size (int): 셀 크기 (픽셀)
+        cell_spacing (int): 셀 간격 (픽셀)
+    """
+
+    def __init__(self, indices: np.ndarray, palette, cell_size: int = CELL_SIZE,
+                 cell_spacing: int = CELL_SPACING, source: str = None):
+        self.indices = indices
+        self.palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        self.cell_size = cell_size
+        self.cell_spacing = cell_spacing
+        self.source = source
+
+    @property
+    def shape(self) -> tuple:
+        return self.indices.shape
+
+    def colors(self, r0: int = 0, r1: int = None, c0: int = 0, c1: int = None) -> np.ndarray:
+        """색상 레이어 (rows x cols x 3, uint8) - 범위를 주면 해당 창만 읽음"""
+        return self.palette[self.indices[r0:r1, c0:c1]]
+
+    def palette_mask(self, colors: list) -> np.ndarray:
+        """팔레트 인덱스별로 colors에 포함되는지 나타내는 LUT (K, bool)"""
+        targets = {tuple(color) for color in colors}
+        return np.array([tuple(color) in targets for color in self.palette.tolist()], dtype=bool)
+
+    def iter_tiles(self, tile_rows: int = 256):
+        """
+        행 단위 타일 순회 (메모리 맵일 경우 해당 타일만 읽음)
+
+        Yields:
+            tuple: (타일 시작 행, 인덱스 타일 (tile_rows x cols))
+        """
+        for r0 in range(0, self.shape[0], tile_rows):
+            yield r0, self.indices[r0:r0 + tile_rows]
+
+    def to_grid(self) -> list:
+        """AutoNavSim2D 그리드로 변환 (GUI가 필요할 때만 호출)"""
+        return colors_to_map_val(self.colors(), self.cell_size, self.cell_spacing)
+
+    def to_rect_grid(self) -> 'RectGrid':
+        """pygame 없이 쓰는 그리드 (headless 모션 플래너용)"""
+        return RectGrid(self)
+
+
+# pygame.Rect 대신 쓰는 셀 사각형 (모션 플래너가 사용하는 속성만)
+CellRect = namedtuple('CellRect', ['x', 'y', 'width', 'height'])
+
+
+class RectGrid:
+    """
+    AutoNavSim2D 그리드(grid[i][j] = [rect, color, (i, j)])와 같은 인터페이스의 경량 그리드
+
+    행은 접근할 때 만들어 보관하므로, 경로가 지나는 행만 생성됩니다.
+    """
+
+    def __init__(self, raster: MapRaster):
+        self.raster = raster
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return self.raster.shape[0]
+
+    def __getitem__(self, i: int) -> list:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        if i not in self._rows:
+            spacing, size = self.raster.cell_spacing, self.raster.cell_size
+            colors = [tuple(color) for color in self.raster.colors(i, i + 1)[0].tolist()]
+            self._rows[i] = [[CellRect(j * spacing, i * spacing, size, size), color, (i, j)]
+                             for j, color in enumerate(colors)]
+        return self._rows[i]
+
+
+def colors_to_raster(colors: np.ndarray, palette: list = None) -> MapRaster:
+    """
+    색상 레이어 -> MapRaster (팔레트에 없는 색은 뒤에 추가)
+
+    Parameters:
+        colors: 색상 레이어 (rows x cols x 3)
+        palette: 기본 팔레트 (기본값: DEFAULT_PALETTE)
+
+    Returns:
+        MapRaster: 변환된 래스터
+    """
+    palette = list(DEFAULT_PALETTE if palette is None else palette)
+    flat = np.ascontiguousarray(colors, dtype=np.uint8).reshape(-1, 3)
+
+    # RGB -> 24bit 정수로 묶어 고유 색상/역인덱스 계산
+    packed = (flat[:, 0].astype(np.uint32) << 16) | (flat[:, 1].astype(np.uint32) << 8) | flat[:, 2]
+    unique, inverse = np.unique(packed, return_inverse=True)
+
+    lookup = {((r << 16) | (g << 8) | b): idx for idx, (r, g, b) in enumerate(palette)}
+    mapping = np.empty(len(unique), dtype=np.int64)
+    for k, value in enumerate(unique.tolist()):
+        if value not in lookup:
+            lookup[value] = len(palette)
+            palette.append(((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF))
+        mapping[k] = lookup[value]
+
+    if len(palette) > 256:
+        raise ValueError(f"색상 수({len(palette)})가 uint8 팔레트 한도(256)를 초과합니다")
+
+    indices = mapping[inverse].astype(np.uint8).reshape(colors.shape[:2])
+    return MapRaster(indices, palette)
+
+
+def map_val_to_colors(map_val: list) -> np.ndarray:
+    """AutoNavSim2D 그리드 -> 색상 레이어 (rows x cols x 3, uint8)"""
+    return np.array([[cell[1] for cell in row] for row in map_val], dtype=np.uint8)
+
+
+def colors_to_map_val(colors: np.ndarray, cell_size: int = CELL_SIZE, cell_spacing: int = CELL_SPACING) -> list:
+    """
+    색상 레이어 -> AutoNavSim2D 그리드 ([pygame.Rect, color, (i, j)] 형식)
+
+    Rect는 CELL_SPACING, CELL_SIZE로부터 결정되므로 색상만으로 복원 가능합니다.
+    """
+    import pygame
+
+    rows, cols = colors.shape[:2]
+    color_rows = colors.tolist()
+    map_val = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            rect = pygame.rect.Rect(j * cell_spacing, i * cell_spacing, cell_size, cell_size)
+            row.append([rect, tuple(color_rows[i][j]), (i, j)])
+        map_val.append(row)
+    return map_val
+
+
+def save_raster(path: str, raster: MapRaster):
+    """
+    MapRaster를 .tcmap 파일로 저장 (임시 파일 작성 후 교체)
+
+    Parameters:
+        path: 저장 경로
+        raster: 저장할 래스터
+    """
+    rows, cols = raster.shape
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'rows': rows,
+        'cols': cols,
+        'cell_size': raster.cell_size,
+        'cell_spacing': raster.cell_spacing,
+        'palette': raster.palette.tolist()
+    }).encode('utf-8')
+
+    prefix = MAGIC + struct.pack('<I', len(header)) + header
+    padding = (-len(prefix)) % DATA_ALIGNMENT
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(prefix)
+        f.write(b'\x00' * padding)
+        f.write(np.ascontiguousarray(raster.indices, dtype=np.uint8).tobytes())
+    os.replace(temp_path, path)
+
+
+def read_raster_header(path: str) -> tuple:
+    """
+    .tcmap 헤더 읽기
+
+    Returns:
+        tuple: (헤더 dict, 래스터 데이터 시작 오프셋)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"tcmap 파일이 아닙니다: {path}")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 tcmap 버전: {header['version']}")
+
+    prefix_len = len(MAGIC) + 4 + header_len
+    return header, prefix_len + (-prefix_len) % DATA_ALIGNMENT
+
+
+def load_raster(path: str, mmap: bool = False) -> MapRaster:
+    """
+    .tcmap 파일 로드 (pygame 불필요)
+
+    Parameters:
+        path: .tcmap 파일 경로
+        mmap: True일 경우 메모리 맵으로 열어 실제로 접근한 영역만 읽음 (읽기 전용)
+
+    Returns:
+        MapRaster: 로드된 래스터
+    """
+    header, offset = read_raster_header(path)
+    shape = (header['rows'], header['cols'])
+
+    if mmap:
+        indices = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=shape)
+    else:
+        indices = np.fromfile(path, dtype=np.uint8, count=shape[0] * shape[1], offset=offset).reshape(shape)
+
+    return MapRaster(indices, header['palette'], header['cell_size'], header['cell_spacing'], source=path)
+
+
+def open_map_raster(path: str, mmap: bool = True) -> MapRaster:
+    """
+    맵 파일(.pkl 또는 .tcmap) -> MapRaster
+
+    .tcmap은 메모리 맵으로 열고, .pkl은 색상 레이어로 변환하여 메모리에 둡니다.
+    """
+    if is_raster_file(path):
+        return load_raster(path, mmap=mmap)
+
+    with open(path, 'rb') as f:
+        raster = colors_to_raster(map_val_to_colors(pickle.load(f)))
+    raster.source = path
+    return raster
+
+
+def is_raster_file(path: str) -> bool:
+    """파일이 .tcmap 포맷인지 확인 (확장자 또는 MAGIC)"""
+    if path.endswith(RASTER_SUFFIX):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def load_map_colors(path: str) -> np.ndarray:
+    """
+    맵 파일(.pkl 또는 .tcmap) -> 색상 레이어
+
+    Parameters:
+        path: 맵 파일 경로
+
+    Returns:
+        np.ndarray: 색상 레이어 (rows x cols x 3, uint8)
+    """
+    if is_raster_file(path):
+        return load_raster(path).colors()
+
+    with open(path, 'rb') as f:
+        return map_val_to_colors(pickle.load(f))
+
+
+def convert_pickle_to_raster(pickle_path: str, raster_path: str = None) -> str:
+    """
+    AutoNavSim2D 피클 맵 -> .tcmap 변환
+
+    Returns:
+        str: 저장된 .tcmap 경로
+    """
+    if raster_path is None:
+        raster_path = os.path.splitext(pickle_path)[0] + RASTER_SUFFIX
+
+    with open(pickle_path, 'rb') as f:
+        map_val = pickle.load(f)
+
+    save_raster(raster_path, colors_to_raster(map_val_to_colors(map_val)))
+    return raster_path
+
+
+def convert_raster_to_pickle(raster_path: str, pickle_path: str = None) -> str:
+    """
+    .tcmap -> AutoNavSim2D 피클 맵 변환 (pygame 필요)
+
+    Returns:
+        str: 저장된 .pkl 경로
+    """
+    if pickle_path is None:
+        pickle_path = os.path.splitext(raster_path)[0] + '.pkl'
+
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(load_raster(raster_path).to_grid(), f)
+    return pickle_path
+
+
+def colors_digest(colors: np.ndarray) -> str:
+    """색상 레이어 내용(크기 포함)의 SHA-256 해시"""
+    colors = np.ascontiguousarray(colors, dtype=np.uint8)
+    digest = hashlib.sha256(str(colors.shape).encode('ascii'))
+    digest.update(colors.tobytes())
+    return digest.hexdigest()
+
+
+def cached_map_pickle(colors: np.ndarray, map_val: list = None, cache_dir: str = None) -> str:
+    """
+    색상 레이어를 AutoNavSim2D 피클 맵으로 저장한 경로 (내용 주소 캐시)
+
+    같은 내용이면 기존 파일을 그대로 재사용하고, 새로 쓸 때는 임시 파일 작성 후
+    교체하므로 여러 시뮬레이터가 동시에 실행되어도 안전합니다.
+
+    Parameters:
+        colors: 색상 레이어 (rows x cols x 3)
+        map_val: 이미 만들어 둔 AutoNavSim2D 그리드 (없으면 colors로부터 생성)
+        cache_dir: 캐시 디렉터리 (기본값: HANDOFF_CACHE_DIR)
+
+    Returns:
+        str: 피클 맵 경로
+    """
+    cache_dir = cache_dir or HANDOFF_CACHE_DIR
+    path = os.path.join(cache_dir, colors_digest(colors) + '.pkl')
+    if os.path.exists(path):
+        return path
+
+    if map_val is None:
+        map_val = colors_to_map_val(colors)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(map_val, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    return path
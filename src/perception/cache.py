@@ -0,0 +1,160 @@
+"""
+cache.py - 눈 감지 결과 캐시 (맵 파일 해시 + 군집화 파라미터 기반)
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+CACHE_VERSION = 3
+CACHE_SUFFIX = '.detect.npz'
+
+# 군집 통계 필드 (저장 순서)
+STATS_FIELDS = ('pixel_count', 'fill_ratio', 'load', 'density')
+
+
+def compute_file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    파일 내용의 SHA-256 해시 계산
+
+    Parameters:
+        path: 파일 경로
+        chunk_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_path(map_path: str) -> str:
+    """맵 파일 옆에 위치하는 캐시(sidecar) 파일 경로"""
+    return map_path + CACHE_SUFFIX
+
+
+def make_cache_key(map_hash: str, params: dict) -> str:
+    """
+    캐시 키 생성 - 해시나 파라미터가 하나라도 다르면 다른 키가 됨
+
+    Parameters:
+        map_hash: 맵 파일 해시
+        params: 군집화 파라미터 {'eps': 8, 'min_samples': 3, ...}
+
+    Returns:
+        str: JSON 문자열 키
+    """
+    return json.dumps(
+        {'version': CACHE_VERSION, 'map_hash': map_hash, 'params': params},
+        sort_keys=True
+    )
+
+
+def load_detection_cache(cache_path: str, key: str, with_layers: bool = True):
+    """
+    캐시 파일 로드 (키 불일치/손상 시 무효)
+
+    Parameters:
+        cache_path: 캐시 파일 경로
+        key: make_cache_key()로 만든 키
+        with_layers: False일 경우 맵 크기 레이어(labels, colors)는 읽지 않음 (None)
+                     True인데 레이어 없이 저장된 캐시면 무효
+
+    Returns:
+        dict | None: {'top_boxes', 'bottom_boxes', 'labels', 'colors',
+                      'cluster_stats', 'court_structure'} 또는 None
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if str(data['key']) != key:
+                return None
+            if with_layers and 'labels' not in data.files:
+                return None
+            return {
+                'top_boxes': _array_to_boxes(data['top_boxes']),
+                'bottom_boxes': _array_to_boxes(data['bottom_boxes']),
+                'labels': data['labels'] if with_layers else None,
+                'colors': data['colors'] if with_layers else None,
+                'cluster_stats': _array_to_stats(data['cluster_stats']),
+                'court_structure': json.loads(str(data['court_structure']))
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_detection_cache(cache_path: str, key: str, top_boxes: list, bottom_boxes: list,
+                         labels: np.ndarray, colors: np.ndarray, cluster_stats: list,
+                         court_structure: dict) -> bool:
+    """
+    감지 결과를 압축 NumPy 아카이브로 저장 (임시 파일 작성 후 교체)
+
+    Parameters:
+        cache_path: 캐시 파일 경로
+        key: make_cache_key()로 만든 키
+        top_boxes / bottom_boxes: Bounding box 리스트
+        labels: 군집 마스크 (rows x cols, -1: 눈 없음, k: all_boxes의 k번째 군집, 없으면 None)
+        colors: 재색칠된 색상 레이어 (rows x cols x 3, uint8, 없으면 None)
+                레이어 없이 저장한 캐시는 with_layers=False 로드에만 사용됩니다.
+        cluster_stats: 군집별 적설량 통계 리스트 (all_boxes 순서)
+        court_structure: 코트 구조 (JSON 변환 가능한 dict)
+
+    Returns:
+        bool: 저장 성공 여부
+    """
+    arrays = {
+        'key': np.array(key),
+        'top_boxes': _boxes_to_array(top_boxes),
+        'bottom_boxes': _boxes_to_array(bottom_boxes),
+        'cluster_stats': _stats_to_array(cluster_stats),
+        'court_structure': np.array(json.dumps(court_structure))
+    }
+    if labels is not None and colors is not None:
+        arrays['labels'] = labels.astype(np.int32)
+        arrays['colors'] = colors.astype(np.uint8)
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(temp_path, cache_path)
+        return True
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
+def _boxes_to_array(boxes: list) -> np.ndarray:
+    """[((r1,c1),(r2,c2)), ...] -> (N, 4) int32 배열"""
+    if not boxes:
+        return np.zeros((0, 4), dtype=np.int32)
+    return np.array([[r1, c1, r2, c2] for (r1, c1), (r2, c2) in boxes], dtype=np.int32)
+
+
+def _array_to_boxes(array: np.ndarray) -> list:
+    """(N, 4) 배열 -> [((r1,c1),(r2,c2)), ...]"""
+    return [((int(r1), int(c1)), (int(r2), int(c2))) for r1, c1, r2, c2 in array.tolist()]
+
+
+def _stats_to_array(stats: list) -> np.ndarray:
+    """[{'pixel_count', ...}, ...] -> (N, 4) float64 배열"""
+    return np.array([[s[field] for field in STATS_FIELDS] for s in stats],
+                    dtype=np.float64).reshape(-1, len(STATS_FIELDS))
+
+
+def _array_to_stats(array: np.ndarray) -> list:
+    """(N, 4) 배열 -> [{'pixel_count', ...}, ...]"""
+    stats = []
+    for values in array.tolist():
+        entry = dict(zip(STATS_FIELDS, values))
+        entry['pixel_count'] = int(entry['pixel_count'])
+        stats.append(entry)
+    return stats
@@ -0,0 +1,255 @@
+"""
+court.py - 색상 레이어/래스터 기반 코트 구조(코트 경계, 네트, 라인) 분석
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+# 코트 외부 배경 / 라인 색
+OUTSIDE_COLORS = [
+    (128, 128, 128),    #GREY
+    (255, 255, 255)     #WHITE
+]
+LINE_COLOR = (0, 0, 0)  #BLACK
+
+MIN_COURT_CELLS = 400       # 이보다 작은 영역은 코트로 보지 않음
+LINE_FILL_RATIO = 0.9       # 라인으로 판단할 검은 픽셀 비율 (눈에 가려진 픽셀 제외)
+
+# 맵별 분석 결과 캐시 (색상 레이어 해시 -> 결과)
+_STRUCTURE_CACHE = {}
+_STRUCTURE_CACHE_SIZE = 8
+
+
+def analyze_court_structure(colors: np.ndarray, snow_mask: np.ndarray = None) -> dict:
+    """
+    색상 레이어에서 코트 경계, 네트 위치, 라인 위치 탐색 (맵당 1회, 결과 캐싱)
+
+    Parameters:
+        colors: 색상 레이어 (rows x cols x 3)
+        snow_mask: 눈 픽셀 마스크 (선택) - 눈에 가려진 셀은 라인 비율 계산에서 제외
+
+    Returns:
+        dict: {
+            'shape': (rows, cols),
+            'courts': [{
+                'bounds': (r1, c1, r2, c2),   # 코트 외곽 (포함 좌표)
+                'net_rows': (n1, n2),         # 네트 행 범위 (포함)
+                'net_row': 네트 중심 행,
+                'line_rows': [(a, b), ...],   # 가로 라인 행 범위
+                'line_cols': [(a, b), ...]    # 세로 라인 열 범위
+            }, ...]                           # 좌상단 기준 정렬
+        }
+    """
+    key = hashlib.sha1(np.ascontiguousarray(colors)).hexdigest()
+    if snow_mask is not None:
+        key += hashlib.sha1(np.ascontiguousarray(snow_mask)).hexdigest()
+    if key in _STRUCTURE_CACHE:
+        return _STRUCTURE_CACHE[key]
+
+    outside = np.zeros(colors.shape[:2], dtype=bool)
+    for color in OUTSIDE_COLORS:
+        outside |= np.all(colors == color, axis=-1)
+    line = np.all(colors == LINE_COLOR, axis=-1)
+    hidden = snow_mask if snow_mask is not None else np.zeros_like(line)
+
+    courts = _find_courts(outside, line, hidden, (0, 0))
+    courts.sort(key=lambda court: court['bounds'][:2])
+    structure = {'shape': tuple(colors.shape[:2]), 'courts': courts}
+
+    _remember(key, structure)
+    return structure
+
+
+def analyze_court_structure_raster(raster, hidden_lut: np.ndarray = None,
+                                   block: int = 8, tile_rows: int = 256) -> dict:
+    """
+    MapRaster(메모리 맵 가능)에서 코트 구조 탐색 - 전체 색상 레이어를 만들지 않음
+
+    1. 타일 단위로 읽어 block x block 단위 저해상도 코트 마스크 생성
+    2. 저해상도 연결 성분마다 해당 창만 원본 해상도로 읽어 정밀 분석
+
+    Parameters:
+        raster: src.mapdata.raster.MapRaster
+        hidden_lut: 팔레트 인덱스별 '눈(라인을 가림)' 여부 LUT (선택)
+        block: 저해상도 블록 크기
+        tile_rows: 1차 스캔 타일 행 수 (block의 배수로 맞춤)
+
+    Returns:
+        dict: analyze_court_structure()와 동일한 형식
+    """
+    from scipy import ndimage  # 필요할 때만 로드 (import 시간 절감)
+
+    rows, cols = raster.shape
+    outside_lut = raster.palette_mask(OUTSIDE_COLORS)
+    line_lut = raster.palette_mask([LINE_COLOR])
+    if hidden_lut is None:
+        hidden_lut = np.zeros_like(line_lut)
+    hidden_lut = np.asarray(hidden_lut, dtype=bool)
+
+    # 파일 + LUT + 블록 크기별 캐싱 (같은 래스터라도 눈 LUT가 다르면 라인 복원 결과가 다름)
+    key = None
+    if raster.source is not None and os.path.exists(raster.source):
+        stat = os.stat(raster.source)
+        lut_hash = hashlib.sha1(hidden_lut.tobytes()).hexdigest()
+        key = f"{os.path.abspath(raster.source)}:{stat.st_size}:{stat.st_mtime_ns}:{lut_hash}:{block}"
+        if key in _STRUCTURE_CACHE:
+            return _STRUCTURE_CACHE[key]
+
+    # 1. 저해상도 코트 마스크 (블록 안에 코트 셀이 하나라도 있으면 True)
+    tile_rows = max(block, tile_rows - tile_rows % block)
+    coarse_rows, coarse_cols = -(-rows // block), -(-cols // block)
+    coarse = np.zeros((coarse_rows, coarse_cols), dtype=bool)
+    for r0, tile in raster.iter_tiles(tile_rows):
+        inside = ~outside_lut[tile]
+        pad_r, pad_c = (-inside.shape[0]) % block, (-cols) % block
+        inside = np.pad(inside, ((0, pad_r), (0, pad_c)))
+        blocks = inside.reshape(inside.shape[0] // block, block, -1, block).any(axis=(1, 3))
+        coarse[r0 // block:r0 // block + blocks.shape[0]] = blocks
+
+    # 2. 저해상도 성분별 창 정밀 분석
+    regions, _ = ndimage.label(coarse, structure=np.ones((3, 3), dtype=bool))
+    courts = {}
+    for region_slice in ndimage.find_objects(regions):
+        if region_slice is None:
+            continue
+        rs, cs = region_slice
+        r0, r1 = rs.start * block, min(rows, rs.stop * block)
+        c0, c1 = cs.start * block, min(cols, cs.stop * block)
+
+        window = np.asarray(raster.indices[r0:r1, c0:c1])
+        for court in _find_courts(outside_lut[window], line_lut[window], hidden_lut[window], (r0, c0)):
+            courts[court['bounds']] = court
+
+    structure = {
+        'shape': (rows, cols),
+        'courts': sorted(courts.values(), key=lambda court: court['bounds'][:2])
+    }
+
+    if key is not None:
+        _remember(key, structure)
+    return structure
+
+
+def _find_courts(outside: np.ndarray, line: np.ndarray, hidden: np.ndarray, offset: tuple) -> list:
+    """
+    마스크 창에서 코트 목록 탐색
+
+    Parameters:
+        outside / line / hidden: 배경 / 라인 / 눈 마스크 (같은 크기)
+        offset: 창 좌상단의 전역 좌표 (r, c)
+
+    Returns:
+        list: 코트 정보 리스트 (전역 좌표)
+    """
+    from scipy import ndimage  # 필요할 때만 로드 (import 시간 절감)
+
+    off_r, off_c = offset
+
+    # 1. 코트 영역 = 배경이 아닌 셀의 연결 성분
+    regions, _ = ndimage.label(~outside, structure=np.ones((3, 3), dtype=bool))
+    courts = []
+    for region_slice in ndimage.find_objects(regions):
+        if region_slice is None:
+            continue
+        rs, cs = region_slice
+        if (rs.stop - rs.start) * (cs.stop - cs.start) < MIN_COURT_CELLS:
+            continue
+
+        court_line = line[region_slice]
+        court_visible = ~hidden[region_slice]
+        top, left = rs.start + off_r, cs.start + off_c
+        bottom, right = rs.stop - 1 + off_r, cs.stop - 1 + off_c
+
+        # 2. 가로/세로 라인 = 보이는 셀 대비 검은 셀 비율이 높은 행/열
+        row_ratio = court_line.sum(axis=1) / np.maximum(court_visible.sum(axis=1), 1)
+        col_ratio = court_line.sum(axis=0) / np.maximum(court_visible.sum(axis=0), 1)
+        line_rows = [(a + top, b + top) for a, b in _runs(row_ratio >= LINE_FILL_RATIO)]
+        line_cols = [(a + left, b + left) for a, b in _runs(col_ratio >= LINE_FILL_RATIO)]
+
+        # 3. 네트 = 외곽선을 제외한 가로 라인 중 코트 중심에 가장 가까운 것
+        center = (top + bottom) / 2
+        inner = [run for run in line_rows if run[0] > top and run[1] < bottom]
+        candidates = inner or line_rows
+        if candidates:
+            net_rows = min(candidates, key=lambda run: abs((run[0] + run[1]) / 2 - center))
+        else:
+            net_rows = (int(center), int(center))
+
+        courts.append({
+            'bounds': (top, left, bottom, right),
+            'net_rows': net_rows,
+            'net_row': (net_rows[0] + net_rows[1]) // 2,
+            'line_rows': line_rows,
+            'line_cols': line_cols
+        })
+
+    return courts
+
+
+def _remember(key: str, structure: dict):
+    """분석 결과 캐시 저장 (오래된 항목부터 제거)"""
+    if len(_STRUCTURE_CACHE) >= _STRUCTURE_CACHE_SIZE:
+        _STRUCTURE_CACHE.pop(next(iter(_STRUCTURE_CACHE)))
+    _STRUCTURE_CACHE[key] = structure
+
+
+def split_rows_for_pixels(structure: dict, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    픽셀별 상/하단 분리 기준 행 (속한 코트의 네트 중심, 코트 밖이면 맵 중앙)
+
+    Parameters:
+        structure: analyze_court_structure() 결과
+        rows, cols: 픽셀 좌표 배열
+
+    Returns:
+        np.ndarray: 픽셀별 기준 행 (r < 기준이면 상단)
+    """
+    split = np.full(rows.shape, structure['shape'][0] // 2, dtype=np.int64)
+    for court in structure['courts']:
+        r1, c1, r2, c2 = court['bounds']
+        inside = (rows >= r1) & (rows <= r2) & (cols >= c1) & (cols <= c2)
+        split[inside] = court['net_row']
+    return split
+
+
+def structure_to_json(structure: dict) -> dict:
+    """JSON 저장용 변환 (튜플 -> 리스트)"""
+    return {
+        'shape': list(structure['shape']),
+        'courts': [
+            {
+                'bounds': list(court['bounds']),
+                'net_rows': list(court['net_rows']),
+                'net_row': court['net_row'],
+                'line_rows': [list(run) for run in court['line_rows']],
+                'line_cols': [list(run) for run in court['line_cols']]
+            }
+            for court in structure['courts']
+        ]
+    }
+
+
+def structure_from_json(data: dict) -> dict:
+    """structure_to_json()의 역변환"""
+    return {
+        'shape': tuple(data['shape']),
+        'courts': [
+            {
+                'bounds': tuple(court['bounds']),
+                'net_rows': tuple(court['net_rows']),
+                'net_row': court['net_row'],
+                'line_rows': [tuple(run) for run in court['line_rows']],
+                'line_cols': [tuple(run) for run in court['line_cols']]
+            }
+            for court in data['courts']
+        ]
+    }
+
+
+def _runs(flags: np.ndarray) -> list:
+    """bool 배열에서 연속 True 구간 [(시작, 끝), ...] (끝 포함)"""
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return [(int(a), int(b) - 1) for a, b in zip(edges[::2], edges[1::2])]
@@ -5,8 +5,21 @@ detect.py - 눈 영역 감지 및 군집화
 import numpy as np
 import pickle
 import os
-from sklearn.cluster import DBSCAN
-from autonavsim2d.autonavsim2d import AutoNavSim2D
+
+from src.perception.court import (
+    analyze_court_structure, analyze_court_structure_raster, split_rows_for_pixels,
+    structure_to_json, structure_from_json
+)
+from src.perception.cache import (
+    compute_file_hash, get_cache_path, make_cache_key,
+    load_detection_cache, save_detection_cache
+)
+from src.mapdata.raster import open_map_raster, map_val_to_colors
+from src.utils import trace
+
+# DBSCAN 기본 파라미터 (eps:거리, min_samples:최소 점 개수)
+DBSCAN_EPS = 8
+DBSCAN_MIN_SAMPLES = 3
 
 # 각 군집 시각화 색상 (녹색 계열 제외)
 VIVID_COLORS = [
@@ -35,89 +48,179 @@ BACKGROUND_COLORS = [
     (0, 255, 0)         #GREEN
 ]
 
+# 눈 색상별 적설 가중치 (짙은 눈일수록 무거움, 그 외 눈 색상은 기본값)
+SNOW_SHADE_WEIGHTS = {
+    (100, 149, 237): 1.0,   # BLUE (짙은 눈)
+    (173, 216, 230): 0.5    # LIGHT_BLUE (옅은 눈)
+}
+DEFAULT_SHADE_WEIGHT = 1.0
 
-def load_map_and_extract_snow(map_path: str):
+
+def load_map(map_path: str):
     """
-    맵 파일(.pkl) 로드 및 눈 픽셀 추출
+    맵 파일(.pkl) 로드 (AutoNavSim2D 그리드 형식)
 
     Parameters:
         map_path: 군집화가 돠지 않은 기본 맵
     
     Returns:
-        tuple: (상단_눈_픽셀, 하단_눈_픽셀, 맵_데이터)
+        list | None: 맵 데이터 (파일이 없으면 None)
     """
-    
     if not os.path.exists(map_path):    #맵 파일이 존재하지 않음
-        return [], [], None
+        return None
     
     with open(map_path, 'rb') as f:
-        map_val = pickle.load(f)
+        return pickle.load(f)
+
+
+def extract_snow_pixels(map_val: list, court_structure: dict = None):
+    """
+    맵 데이터에서 눈 픽셀 추출 (네트 기준 상/하단 분리)
+
+    Parameters:
+        map_val: 맵 데이터
+        court_structure: 코트 구조 분석 결과 (없으면 맵에서 분석)
     
-    snow_top = []   #눈 픽셀 상단
-    snow_bottom = []    #눈 픽셀 하단
+    Returns:
+        tuple: (상단_눈_픽셀, 하단_눈_픽셀) - 각각 (N, 2) 좌표 배열
+    """
+    return extract_snow_pixels_from_colors(map_val_to_colors(map_val), court_structure)
+
+
+def extract_snow_pixels_from_colors(colors: np.ndarray, court_structure: dict = None):
+    """
+    색상 레이어에서 눈 픽셀 추출 (각 코트의 네트 기준 상/하단 분리)
+
+    Parameters:
+        colors: 색상 레이어 (rows x cols x 3)
+        court_structure: 코트 구조 분석 결과 (없으면 분석, 코트 밖 픽셀은 맵 중앙 기준)
     
-    rows = len(map_val)
-    cols = len(map_val[0])
-    net_row = rows // 2  # 네트 위치
+    Returns:
+        tuple: (상단_눈_픽셀, 하단_눈_픽셀) - 각각 (N, 2) 좌표 배열
+    """
+    snow = snow_mask_from_colors(colors)
+    if court_structure is None:
+        court_structure = analyze_court_structure(colors, snow)
     
-    # 코트에서 코트 기본 정보 외의 픽셀 추출(눈)
-    for r in range(rows):
-        for c in range(cols):
-            try:
-                color = map_val[r][c][1]
-                if color not in BACKGROUND_COLORS:
-                    if r < net_row:
-                        snow_top.append([r, c])
-                    else:
-                        snow_bottom.append([r, c])
-            except: 
-                pass
+    # 코트 기본 정보 외의 픽셀(눈)을 행 우선 순서로 추출
+    rows, cols = np.nonzero(snow)
+    is_top = rows < split_rows_for_pixels(court_structure, rows, cols)
+    pixels = np.stack([rows, cols], axis=1)
     
-    return snow_top, snow_bottom, map_val
+    return pixels[is_top], pixels[~is_top]
 
 
-def apply_clustering(map_val, snow_pixels, area_name="Unknown", color_offset=0):
+def extract_snow_pixels_from_raster(raster, court_structure: dict, tile_rows: int = 256):
     """
-    DBSCAN 군집화 수행 및 Bounding BOX(작업 구역)생성
+    MapRaster에서 타일 단위로 눈 픽셀 추출 (메모리 맵일 경우 타일만 읽음)
+
+    Parameters:
+        raster: src.mapdata.raster.MapRaster
+        court_structure: 코트 구조 분석 결과
+        tile_rows: 타일 행 수
+    
+    Returns:
+        tuple: (상단_눈_픽셀, 하단_눈_픽셀) - 각각 (N, 2) 좌표 배열
+    """
+    snow_lut = snow_lut_for_palette(raster.palette)
+    top_parts, bottom_parts = [], []
+    
+    for r0, tile in raster.iter_tiles(tile_rows):
+        rows, cols = np.nonzero(snow_lut[tile])
+        rows = rows + r0
+        is_top = rows < split_rows_for_pixels(court_structure, rows, cols)
+        pixels = np.stack([rows, cols], axis=1)
+        top_parts.append(pixels[is_top])
+        bottom_parts.append(pixels[~is_top])
     
+    empty = np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(top_parts or [empty]), np.concatenate(bottom_parts or [empty])
+
+
+def snow_lut_for_palette(palette: np.ndarray) -> np.ndarray:
+    """팔레트 인덱스별 눈 여부 LUT (코트 구분 색 이외의 모든 색)"""
+    background = {tuple(color) for color in BACKGROUND_COLORS}
+    return np.array([tuple(color) not in background for color in np.asarray(palette).tolist()], dtype=bool)
+
+
+def snow_mask_from_colors(colors: np.ndarray) -> np.ndarray:
+    """
+    색상 레이어에서 눈 픽셀 마스크 계산 (코트 구분 색 이외의 모든 색)
+
     Parameters:
-        map_val: 맵 데이터
-        snow_pixels: 눈 픽셀 리스트
-        area_name: 영역 이름
-        color_offset: 색상 오프셋
+        colors: 색상 레이어 (rows x cols x 3)
     
     Returns:
-        list: Bounding box 리스트 [((r1,c1), (r2,c2)), ...]
+        np.ndarray: 눈 픽셀 마스크 (rows x cols, bool)
     """
-    bounding_boxes = []
+    background = np.zeros(colors.shape[:2], dtype=bool)
+    for color in BACKGROUND_COLORS:
+        background |= np.all(colors == color, axis=-1)
+    return ~background
+
+
+def load_map_and_extract_snow(map_path: str):
+    """
+    맵 파일(.pkl) 로드 및 눈 픽셀 추출
+
+    Parameters:
+        map_path: 군집화가 돠지 않은 기본 맵
     
+    Returns:
+        tuple: (상단_눈_픽셀, 하단_눈_픽셀, 맵_데이터)
+    """
+    map_val = load_map(map_path)
+    if map_val is None:
+        return [], [], None
+    
+    snow_top, snow_bottom = extract_snow_pixels(map_val)
+    return snow_top, snow_bottom, map_val
+
+
+def cluster_snow_pixels(snow_pixels, eps=DBSCAN_EPS, min_samples=DBSCAN_MIN_SAMPLES) -> list:
+    """
+    DBSCAN 군집화 수행
+    
+    Parameters:
+        snow_pixels: 눈 픽셀 리스트 [[r, c], ...]
+        eps, min_samples: DBSCAN 파라미터
+    
+    Returns:
+        list: 군집별 픽셀 좌표 배열 리스트 [np.ndarray (N, 2), ...] (노이즈 제외)
+    """
     if len(snow_pixels) < 5:
-        return bounding_boxes
+        return []
+    
+    # sklearn은 로드가 무거우므로 군집화가 실제로 필요할 때만 import (캐시 적중 시 생략)
+    from sklearn.cluster import DBSCAN
     
     data = np.array(snow_pixels)
     
     # DBSCAN 수행
-    dbscan = DBSCAN(eps=8, min_samples=3).fit(data) #민감도 설정 = eps:거리, min_samples:최소 점 개수
+    dbscan = DBSCAN(eps=eps, min_samples=min_samples).fit(data) #민감도 설정 = eps:거리, min_samples:최소 점 개수
     labels = dbscan.labels_
     unique_labels = set(labels)
     unique_labels.discard(-1)  #노이즈 제거
     
-    # Bounding Box 계산 및 시각화
+    clusters = []
     for label in unique_labels:
         cluster_points = data[labels == label]
-        
-        if len(cluster_points) == 0:
-            continue
-        
-        # 좌상단, 우하단 탐색
-        r_min, c_min = np.min(cluster_points, axis=0)
-        r_max, c_max = np.max(cluster_points, axis=0)
-        
-        bbox = ((int(r_min), int(c_min)), (int(r_max), int(c_max)))
-        bounding_boxes.append(bbox)
-        
-        # 색상 칠하기
-        color_idx = list(unique_labels).index(label)
+        if len(cluster_points) > 0:
+            clusters.append(cluster_points)
+    
+    return clusters
+
+
+def recolor_clusters(map_val, clusters: list, color_offset=0):
+    """
+    군집별 시각화 색상 칠하기 (보호 색상은 유지)
+    
+    Parameters:
+        map_val: 맵 데이터
+        clusters: 군집별 픽셀 좌표 배열 리스트
+        color_offset: 색상 오프셋
+    """
+    for color_idx, cluster_points in enumerate(clusters):
         color = VIVID_COLORS[(color_idx + color_offset) % len(VIVID_COLORS)]
         
         for pr, pc in cluster_points:
@@ -127,39 +230,214 @@ def apply_clustering(map_val, snow_pixels, area_name="Unknown", color_offset=0):
                     map_val[pr][pc][1] = color
             except:
                 pass
+
+
+def recolor_cluster_colors(colors: np.ndarray, clusters: list, color_offset=0):
+    """
+    색상 레이어에 군집별 시각화 색상 칠하기 (recolor_clusters의 배열 버전)
+    
+    Parameters:
+        colors: 색상 레이어 (rows x cols x 3, 제자리 수정)
+        clusters: 군집별 픽셀 좌표 배열 리스트
+        color_offset: 색상 오프셋
+    """
+    for color_idx, cluster_points in enumerate(clusters):
+        color = VIVID_COLORS[(color_idx + color_offset) % len(VIVID_COLORS)]
+        
+        current = colors[cluster_points[:, 0], cluster_points[:, 1]]
+        protected = np.zeros(len(cluster_points), dtype=bool)
+        for protected_color in PROTECTED_COLORS:
+            protected |= np.all(current == protected_color, axis=-1)
+        
+        targets = cluster_points[~protected]
+        colors[targets[:, 0], targets[:, 1]] = color
+
+
+def clusters_to_boxes(clusters: list, label_mask=None, label_offset=0) -> list:
+    """
+    군집별 Bounding BOX(작업 구역) 계산
+    
+    Parameters:
+        clusters: 군집별 픽셀 좌표 배열 리스트
+        label_mask: 군집 번호를 기록할 마스크 (rows x cols, 선택)
+        label_offset: 마스크에 기록할 군집 번호 시작값
+    
+    Returns:
+        list: Bounding box 리스트 [((r1,c1), (r2,c2)), ...]
+    """
+    bounding_boxes = []
+    
+    for cluster_points in clusters:
+        # 좌상단, 우하단 탐색
+        r_min, c_min = np.min(cluster_points, axis=0)
+        r_max, c_max = np.max(cluster_points, axis=0)
+        
+        bbox = ((int(r_min), int(c_min)), (int(r_max), int(c_max)))
+        bounding_boxes.append(bbox)
+        
+        if label_mask is not None:
+            label_mask[cluster_points[:, 0], cluster_points[:, 1]] = label_offset + len(bounding_boxes) - 1
+    
+    return bounding_boxes
+
+
+def apply_clustering(map_val, snow_pixels, area_name="Unknown", color_offset=0,
+                     eps=DBSCAN_EPS, min_samples=DBSCAN_MIN_SAMPLES, label_mask=None, label_offset=0):
+    """
+    DBSCAN 군집화 수행 및 Bounding BOX(작업 구역)생성
+    
+    Parameters:
+        map_val: 맵 데이터
+        snow_pixels: 눈 픽셀 리스트
+        area_name: 영역 이름
+        color_offset: 색상 오프셋
+        eps, min_samples: DBSCAN 파라미터
+        label_mask: 군집 번호를 기록할 마스크 (rows x cols, 선택)
+        label_offset: 마스크에 기록할 군집 번호 시작값
+    
+    Returns:
+        list: Bounding box 리스트 [((r1,c1), (r2,c2)), ...]
+    """
+    clusters = cluster_snow_pixels(snow_pixels, eps=eps, min_samples=min_samples)
+    bounding_boxes = clusters_to_boxes(clusters, label_mask=label_mask, label_offset=label_offset)
+    recolor_clusters(map_val, clusters, color_offset=color_offset)
     
     return bounding_boxes
 
 
-def detect_snow_regions(map_path):
+def compute_cluster_stats(raster, clusters: list, boxes: list) -> list:
+    """
+    군집별 적설량 통계 계산 (재색칠 이전 색상 기준)
+    
+    Parameters:
+        raster: 원본 맵 (src.mapdata.raster.MapRaster)
+        clusters: 군집별 픽셀 좌표 배열 리스트 (boxes와 같은 순서)
+        boxes: Bounding box 리스트 [((r1,c1), (r2,c2)), ...]
+    
+    Returns:
+        list: 군집별 통계 [{'pixel_count', 'fill_ratio', 'load', 'density'}, ...]
+              - fill_ratio: 눈 픽셀 수 / Bounding box 면적
+              - load: 색상 가중치 합 (적설량 추정치)
+              - density: load / Bounding box 면적
+    """
+    # 팔레트 인덱스별 색상 가중치
+    weight_lut = np.array([
+        SNOW_SHADE_WEIGHTS.get(tuple(color), DEFAULT_SHADE_WEIGHT) for color in raster.palette.tolist()
+    ])
+    
+    stats = []
+    for cluster_points, ((r1, c1), (r2, c2)) in zip(clusters, boxes):
+        area = (r2 - r1 + 1) * (c2 - c1 + 1)
+        count = len(cluster_points)
+        load = float(weight_lut[raster.indices[cluster_points[:, 0], cluster_points[:, 1]]].sum())
+        stats.append({
+            'pixel_count': int(count),
+            'fill_ratio': float(count / area),
+            'load': load,
+            'density': float(load / area)
+        })
+    
+    return stats
+
+
+def detect_snow_regions(map_path, use_cache=True, eps=DBSCAN_EPS, min_samples=DBSCAN_MIN_SAMPLES,
+                        with_layers=True, tile_rows=256):
     """
     Main Interface
     Parameters:
-        map_path: 군집화가 돠지 않은 기본 맵
+        map_path: 군집화가 돠지 않은 기본 맵 (.pkl 또는 .tcmap)
+        use_cache: True일 경우 맵 옆의 캐시 파일(.detect.npz)을 사용/갱신
+        eps, min_samples: DBSCAN 파라미터 (캐시 키에 포함)
+        with_layers: False일 경우 맵 크기의 결과 레이어(colors, labels)를 만들지 않음
+                     (.tcmap은 메모리 맵 + 타일 단위로 처리되어 메모리 사용량이 맵 크기에 비례하지 않음)
+        tile_rows: 타일 단위 처리 행 수
     
     Returns:
         dict: {
-            'map_val': 맵 데이터,
+            'colors': 군집별로 재색칠된 색상 레이어 (rows x cols x 3, with_layers=False면 None),
             'top_boxes': 상단 박스,
             'bottom_boxes': 하단 박스,
-            'all_boxes': 전체 박스
+            'all_boxes': 전체 박스,
+            'labels': 군집 마스크 (rows x cols, -1: 눈 없음, with_layers=False면 None),
+            'cluster_stats': 군집별 적설량 통계 (all_boxes 순서),
+            'court_structure': 코트 구조 (코트 경계, 네트, 라인),
+            'from_cache': 캐시 사용 여부
         }
+        AutoNavSim2D 그리드가 필요하면 src.mapdata.raster.colors_to_map_val(colors)로 변환합니다.
     """
-    # 맵 로드 및 눈 추출
-    top_pixels, bottom_pixels, map_val = load_map_and_extract_snow(map_path)
-    
-    if map_val is None:
+    if not os.path.exists(map_path):
         return None
     
+    # 캐시 확인 (맵 해시 + 파라미터가 모두 같을 때만 유효)
+    cache_key = None
+    if use_cache:
+        with trace.span('cache_lookup', cat='perception') as sp:
+            params = {'eps': eps, 'min_samples': min_samples}
+            cache_key = make_cache_key(compute_file_hash(map_path), params)
+            cached = load_detection_cache(get_cache_path(map_path), cache_key, with_layers=with_layers)
+            sp['hit'] = cached is not None
+        if cached is not None:
+            return {
+                'colors': cached['colors'],
+                'top_boxes': cached['top_boxes'],
+                'bottom_boxes': cached['bottom_boxes'],
+                'all_boxes': cached['top_boxes'] + cached['bottom_boxes'],
+                'labels': cached['labels'],
+                'cluster_stats': cached['cluster_stats'],
+                'court_structure': structure_from_json(cached['court_structure']),
+                'from_cache': True
+            }
+    
+    # 맵 로드 (.tcmap은 메모리 맵)
+    with trace.span('load_map', cat='perception', path=map_path) as sp:
+        raster = open_map_raster(map_path, mmap=True)
+        sp['shape'] = list(raster.shape)
+    
+    # 코트 구조 분석 및 눈 추출 (타일 단위)
+    snow_lut = snow_lut_for_palette(raster.palette)
+    with trace.span('court_structure', cat='perception'):
+        court_structure = analyze_court_structure_raster(raster, hidden_lut=snow_lut, tile_rows=tile_rows)
+    with trace.span('extract_pixels', cat='perception') as sp:
+        top_pixels, bottom_pixels = extract_snow_pixels_from_raster(raster, court_structure, tile_rows)
+        sp['pixels'] = len(top_pixels) + len(bottom_pixels)
+    
     # 군집화
-    top_boxes = apply_clustering(map_val, top_pixels, "상단 코트", color_offset=0)
-    bottom_boxes = apply_clustering(map_val, bottom_pixels, "하단 코트", color_offset=4)
+    with trace.span('cluster', cat='perception') as sp:
+        top_clusters = cluster_snow_pixels(top_pixels, eps=eps, min_samples=min_samples)
+        bottom_clusters = cluster_snow_pixels(bottom_pixels, eps=eps, min_samples=min_samples)
+        top_boxes = clusters_to_boxes(top_clusters)
+        bottom_boxes = clusters_to_boxes(bottom_clusters)
+        sp['clusters'] = len(top_boxes) + len(bottom_boxes)
     
     all_boxes = top_boxes + bottom_boxes
+    with trace.span('cluster_stats', cat='perception'):
+        cluster_stats = compute_cluster_stats(raster, top_clusters + bottom_clusters, all_boxes)
+    
+    colors = labels = None
+    if with_layers:
+        # 군집 마스크 및 재색칠 (상단: 색상 0~, 하단: 색상 4~)
+        with trace.span('recolor', cat='perception'):
+            labels = np.full(raster.shape, -1, dtype=np.int32)
+            clusters_to_boxes(top_clusters, label_mask=labels)
+            clusters_to_boxes(bottom_clusters, label_mask=labels, label_offset=len(top_boxes))
+            
+            colors = raster.colors()
+            recolor_cluster_colors(colors, top_clusters, color_offset=0)
+            recolor_cluster_colors(colors, bottom_clusters, color_offset=4)
+    
+    # 레이어 없이 감지한 경우(headless/서비스)도 박스/통계/코트 구조는 저장
+    if cache_key is not None:
+        with trace.span('cache_save', cat='perception'):
+            save_detection_cache(get_cache_path(map_path), cache_key, top_boxes, bottom_boxes,
+                                 labels, colors, cluster_stats, structure_to_json(court_structure))
     
     return {
-        'map_val': map_val,
+        'colors': colors,
         'top_boxes': top_boxes,
         'bottom_boxes': bottom_boxes,
-        'all_boxes': all_boxes
-    }
\ No newline at end of file
+        'all_boxes': all_boxes,
+        'labels': labels,
+        'cluster_stats': cluster_stats,
+        'court_structure': court_structure,
+        'from_cache': False
+    }
@@ -0,0 +1,267 @@
+"""
+stream.py - 부분 관측 프레임 기반 스트리밍 눈 감지
+
+로봇 시야(FOV) 프레임을 전역 눈 마스크에 누적하고, 프레임 주변 영역만 다시 계산하여
+군집을 점진적으로 갱신합니다. 군집은 eps 이내 픽셀끼리 연결되는 단일 연결(single-linkage)
+방식이며, min_samples 미만 군집은 노이즈로 간주합니다 (DBSCAN 근사).
+"""
+
+import numpy as np
+
+from src.perception.detect import DBSCAN_EPS, DBSCAN_MIN_SAMPLES, snow_mask_from_colors
+
+
+def crop_frame(colors: np.ndarray, center: tuple, radius: int) -> tuple:
+    """
+    전체 색상 레이어에서 로봇 주변 관측 프레임 잘라내기 (시뮬레이션/테스트용)
+
+    Parameters:
+        colors: 전체 색상 레이어 (rows x cols x 3)
+        center: 로봇 위치 (r, c)
+        radius: 관측 반경 (셀)
+
+    Returns:
+        tuple: (프레임 색상 배열, 프레임 좌상단 오프셋 (r, c))
+    """
+    rows, cols = colors.shape[:2]
+    r0 = max(0, center[0] - radius)
+    c0 = max(0, center[1] - radius)
+    r1 = min(rows, center[0] + radius + 1)
+    c1 = min(cols, center[1] + radius + 1)
+    return colors[r0:r1, c0:c1], (r0, c0)
+
+
+class StreamingSnowDetector:
+    """
+    스트리밍 눈 감지기
+
+    Attributes:
+        mask (np.ndarray): 전역 눈 마스크 (rows x cols, bool)
+        observed (np.ndarray): 한 번이라도 관측된 셀 마스크
+        labels (np.ndarray): 픽셀별 군집 id (-1: 눈 없음, union-find 루트가 아닐 수 있음)
+    """
+
+    def __init__(self, map_shape: tuple, eps: int = DBSCAN_EPS, min_samples: int = DBSCAN_MIN_SAMPLES):
+        """
+        Parameters:
+            map_shape: 전체 맵 크기 (rows, cols)
+            eps: 연결 거리 (셀)
+            min_samples: 군집으로 인정할 최소 픽셀 수
+        """
+        self.rows, self.cols = map_shape
+        self.eps = eps
+        self.min_samples = min_samples
+
+        self.mask = np.zeros(map_shape, dtype=bool)
+        self.observed = np.zeros(map_shape, dtype=bool)
+        self.labels = np.full(map_shape, -1, dtype=np.int64)
+
+        # union-find 및 루트별 군집 정보
+        self._parent = {}
+        self._boxes = {}     # root -> [r1, c1, r2, c2]
+        self._counts = {}    # root -> 픽셀 수
+        self._next_id = 0
+
+        # eps 거리 연결 = 반경 eps/2 원판으로 팽창시킨 마스크의 연결 성분
+        radius = max(1, eps // 2)
+        yy, xx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+        self._disk = (yy * yy + xx * xx) <= radius * radius
+
+    # ==================== Public API ====================
+
+    def ingest(self, frame: np.ndarray, offset: tuple) -> set:
+        """
+        관측 프레임 1개를 전역 마스크에 반영하고 군집 갱신
+
+        프레임 영역은 최신 관측으로 덮어씁니다 (제설된 구역은 눈이 사라짐).
+
+        Parameters:
+            frame: 관측 색상 배열 (h x w x 3)
+            offset: 프레임 좌상단의 전역 좌표 (r, c)
+
+        Returns:
+            set: 변경된 군집 + 사라진 군집 루트 id 집합
+                 (사라진 id: 모두 제설됐거나 다른 군집에 합쳐졌거나 min_samples 미만이 되어
+                  get_clusters()에 더 이상 없는 군집 - 소비자는 이 id의 군집을 버리면 됩니다)
+        """
+        r0, c0 = offset
+        r1 = min(self.rows, r0 + frame.shape[0])
+        c1 = min(self.cols, c0 + frame.shape[1])
+        fr0, fc0 = max(0, -r0), max(0, -c0)
+        r0, c0 = max(0, r0), max(0, c0)
+        if r1 <= r0 or c1 <= c0:
+            return set()
+
+        frame_snow = snow_mask_from_colors(frame[fr0:fr0 + r1 - r0, fc0:fc0 + c1 - c0])
+        window = (slice(r0, r1), slice(c0, c1))
+
+        old_snow = self.mask[window]
+        added = frame_snow & ~old_snow
+        removed = old_snow & ~frame_snow
+
+        self.mask[window] = frame_snow
+        self.observed[window] = True
+
+        visible_before = self._visible_ids()
+        changed = set()
+        if removed.any():
+            changed |= self._remove_pixels(window, removed)
+        if added.any():
+            changed |= self._add_pixels(r0, c0, r1, c1)
+
+        changed = {self._find(root) for root in changed if self._find(root) in self._boxes}
+        return changed | (visible_before - self._visible_ids())
+
+    def get_boxes(self) -> list:
+        """
+        현재 군집 Bounding box 리스트 (min_samples 미만 군집 제외)
+
+        Returns:
+            list: [((r1,c1), (r2,c2)), ...] (좌상단 기준 정렬)
+        """
+        boxes = [
+            ((box[0], box[1]), (box[2], box[3]))
+            for root, box in self._boxes.items()
+            if self._counts[root] >= self.min_samples
+        ]
+        return sorted(boxes)
+
+    def get_clusters(self) -> list:
+        """
+        현재 군집 정보 리스트
+
+        Returns:
+            list: [{'id', 'box', 'pixel_count'}, ...] (min_samples 미만 제외)
+        """
+        return [
+            {
+                'id': root,
+                'box': ((box[0], box[1]), (box[2], box[3])),
+                'pixel_count': self._counts[root]
+            }
+            for root, box in sorted(self._boxes.items(), key=lambda item: item[1])
+            if self._counts[root] >= self.min_samples
+        ]
+
+    # ==================== Internal ====================
+
+    def _visible_ids(self) -> set:
+        """get_clusters()에 나오는 군집 루트 id 집합 (min_samples 이상)"""
+        return {root for root, count in self._counts.items() if count >= self.min_samples}
+
+    def _find(self, node: int) -> int:
+        """union-find 루트 탐색 (경로 압축)"""
+        root = node
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[node] != root:
+            self._parent[node], node = root, self._parent[node]
+        return root
+
+    def _new_cluster(self) -> int:
+        cluster_id = self._next_id
+        self._next_id += 1
+        self._parent[cluster_id] = cluster_id
+        return cluster_id
+
+    def _union(self, roots: list) -> int:
+        """여러 루트를 하나로 합치고 박스/픽셀 수 병합"""
+        main = max(roots, key=lambda r: self._counts.get(r, 0))
+        for root in roots:
+            if root == main:
+                continue
+            self._parent[root] = main
+            box, main_box = self._boxes.pop(root), self._boxes[main]
+            self._boxes[main] = [min(box[0], main_box[0]), min(box[1], main_box[1]),
+                                 max(box[2], main_box[2]), max(box[3], main_box[3])]
+            self._counts[main] += self._counts.pop(root)
+        return main
+
+    def _resolve(self, ids: np.ndarray) -> np.ndarray:
+        """군집 id 배열 -> 루트 id 배열 (-1 유지)"""
+        resolved = ids.copy()
+        for cluster_id in np.unique(ids[ids >= 0]):
+            resolved[ids == cluster_id] = self._find(int(cluster_id))
+        return resolved
+
+    def _local_components(self, r0: int, c0: int, r1: int, c1: int, mask: np.ndarray = None):
+        """(r0:r1, c0:c1) 영역 눈 픽셀의 eps 연결 성분 (픽셀 좌표, 성분 번호)"""
+        from scipy import ndimage  # 필요할 때만 로드 (import 시간 절감)
+
+        local = self.mask[r0:r1, c0:c1] if mask is None else mask
+        dilated = ndimage.binary_dilation(local, structure=self._disk)
+        components, _ = ndimage.label(dilated, structure=np.ones((3, 3), dtype=bool))
+        pr, pc = np.nonzero(local)
+        return pr, pc, components[pr, pc]
+
+    def _add_pixels(self, r0: int, c0: int, r1: int, c1: int) -> set:
+        """새 눈 픽셀 라벨링 - 프레임을 eps만큼 확장한 영역만 계산"""
+        pr0, pc0 = max(0, r0 - self.eps), max(0, c0 - self.eps)
+        pr1, pc1 = min(self.rows, r1 + self.eps), min(self.cols, c1 + self.eps)
+
+        pr, pc, comp = self._local_components(pr0, pc0, pr1, pc1)
+        gr, gc = pr + pr0, pc + pc0
+        ids = self._resolve(self.labels[gr, gc])
+
+        changed = set()
+        # 새 픽셀(-1)을 포함한 성분만 갱신
+        for k in np.unique(comp[ids < 0]):
+            in_comp = comp == k
+            roots = [int(root) for root in np.unique(ids[in_comp]) if root >= 0]
+
+            if roots:
+                root = self._union(roots)
+            else:
+                root = self._new_cluster()
+                self._counts[root] = 0
+
+            new_pixels = in_comp & (ids < 0)
+            nr, nc = gr[new_pixels], gc[new_pixels]
+            self.labels[nr, nc] = root
+            self._counts[root] += len(nr)
+
+            box = self._boxes.get(root)
+            bounds = [int(nr.min()), int(nc.min()), int(nr.max()), int(nc.max())]
+            if box is not None:
+                bounds = [min(box[0], bounds[0]), min(box[1], bounds[1]),
+                          max(box[2], bounds[2]), max(box[3], bounds[3])]
+            self._boxes[root] = bounds
+            changed.add(root)
+
+        return changed
+
+    def _remove_pixels(self, window: tuple, removed: np.ndarray) -> set:
+        """사라진 눈 픽셀 제거 - 영향받은 군집만 재분할"""
+        window_labels = self.labels[window]
+        affected = {self._find(int(i)) for i in np.unique(window_labels[removed])}
+        window_labels[removed] = -1
+
+        changed = set()
+        for root in affected:
+            changed |= self._rebuild_cluster(root)
+        return changed
+
+    def _rebuild_cluster(self, root: int) -> set:
+        """군집 1개를 박스 범위 안에서 다시 연결 성분으로 나눔"""
+        r1, c1, r2, c2 = self._boxes.pop(root)
+        self._counts.pop(root)
+
+        region = (slice(r1, r2 + 1), slice(c1, c2 + 1))
+        members = self._resolve(self.labels[region]) == root
+        if not members.any():
+            return set()
+
+        pr, pc, comp = self._local_components(r1, c1, r2 + 1, c2 + 1, mask=members)
+        gr, gc = pr + r1, pc + c1
+
+        new_roots = set()
+        for idx, k in enumerate(np.unique(comp)):
+            in_comp = comp == k
+            cluster_id = root if idx == 0 else self._new_cluster()
+            nr, nc = gr[in_comp], gc[in_comp]
+            self.labels[nr, nc] = cluster_id
+            self._counts[cluster_id] = len(nr)
+            self._boxes[cluster_id] = [int(nr.min()), int(nc.min()), int(nr.max()), int(nc.max())]
+            new_roots.add(cluster_id)
+
+        return new_roots
@@ -0,0 +1 @@
+# utils 패키지
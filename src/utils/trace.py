@@ -0,0 +1,200 @@
+"""
+trace.py - 파이프라인 단계별 시간 측정 (Span) 및 Chrome Trace JSON 내보내기
+
+기본은 비활성 상태이며, 비활성일 때 span()은 아무 일도 하지 않는 공용 객체를 돌려주므로
+계측 코드를 그대로 두어도 부담이 거의 없습니다.
+내보낸 JSON은 chrome://tracing, Perfetto(ui.perfetto.dev) 등 표준 트레이스 뷰어에서 열 수 있습니다.
+
+    from src.utils import trace
+    trace.enable()
+    with trace.span('a_star', cat='planner') as sp:
+        ...
+        sp['expansions'] = count
+    trace.export_chrome_trace('trace.json')
+
+환경 변수 SNOWBOT_TRACE=<경로>.json 을 지정하면 import 시점에 활성화됩니다 (GUI 실행용).
+"""
+
+import json
+import os
+import threading
+import time
+
+# 설정 시 import 시점에 활성화되고, 값은 트레이스 저장 경로로 사용
+TRACE_ENV = 'SNOWBOT_TRACE'
+
+_enabled = bool(os.environ.get(TRACE_ENV))
+_events = []
+_lock = threading.Lock()
+
+
+class _Span:
+    """활성 상태의 Span - 종료 시 Complete 이벤트('ph': 'X') 1개를 기록"""
+
+    __slots__ = ('name', 'cat', 'args', 'start')
+
+    def __init__(self, name: str, cat: str, args: dict):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _append(self.name, self.cat, self.start, time.perf_counter(), self.args)
+        return False
+
+    def __setitem__(self, key, value):
+        self.args[key] = value
+
+
+class _NullSpan:
+    """비활성 상태의 Span - 모든 동작을 무시"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _append(name: str, cat: str, start: float, end: float, args: dict):
+    """Complete 이벤트 1개 기록 (시간: time.perf_counter() 초)"""
+    event = {
+        'name': name,
+        'cat': cat,
+        'ph': 'X',
+        'ts': start * 1e6,
+        'dur': (end - start) * 1e6,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+        'args': args
+    }
+    with _lock:
+        _events.append(event)
+
+
+def enable():
+    """계측 활성화"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """계측 비활성화 (기록된 이벤트는 유지)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def env_trace_path() -> str:
+    """환경 변수로 지정된 트레이스 저장 경로 (없으면 None)"""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def span(name: str, cat: str = 'pipeline', **args):
+    """
+    구간 측정 컨텍스트 매니저
+
+    Parameters:
+        name: 구간 이름 (예: 'a_star')
+        cat: 분류 (예: 'perception', 'planner')
+        **args: 이벤트에 함께 기록할 값 (with 블록 안에서 sp['key'] = value 로 추가 가능)
+
+    Returns:
+        컨텍스트 매니저 (비활성 시 no-op 공용 객체)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def record(name: str, cat: str, start: float, end: float, **args):
+    """
+    with 블록으로 감싸기 어려운 구간을 직접 기록 (비활성 시 무시)
+
+    Parameters:
+        start, end: time.perf_counter() 값 (초)
+    """
+    if _enabled:
+        _append(name, cat, start, end, args)
+
+
+def get_events() -> list:
+    """기록된 이벤트 복사본"""
+    with _lock:
+        return list(_events)
+
+
+def drain() -> list:
+    """기록된 이벤트를 꺼내고 비움 (프로세스 풀 작업자가 결과와 함께 돌려줄 때 사용)"""
+    with _lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+
+def reset():
+    """기록된 이벤트 삭제"""
+    with _lock:
+        _events.clear()
+
+
+def add_events(events: list):
+    """다른 프로세스에서 받은 이벤트 병합 (perf_counter는 시스템 공용 단조 시계라 시간축이 맞음)"""
+    with _lock:
+        _events.extend(events)
+
+
+def summarize(events: list = None) -> dict:
+    """
+    이름별 집계
+
+    Returns:
+        dict: {name: {'count', 'total_ms', 'mean_ms', 'max_ms'}} (total_ms 내림차순)
+    """
+    events = get_events() if events is None else events
+    summary = {}
+    for event in events:
+        entry = summary.setdefault(event['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        duration = event['dur'] / 1000.0
+        entry['count'] += 1
+        entry['total_ms'] += duration
+        entry['max_ms'] = max(entry['max_ms'], duration)
+    for entry in summary.values():
+        entry['mean_ms'] = entry['total_ms'] / entry['count']
+    return dict(sorted(summary.items(), key=lambda item: -item[1]['total_ms']))
+
+
+def export_chrome_trace(path: str, events: list = None) -> str:
+    """
+    Chrome Trace Event 형식 JSON으로 저장
+
+    Parameters:
+        path: 저장 경로
+        events: 저장할 이벤트 (None이면 기록된 전체)
+
+    Returns:
+        str: 저장 경로
+    """
+    events = get_events() if events is None else events
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return path
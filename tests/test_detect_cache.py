@@ -0,0 +1,42 @@
+"""
+test_detect_cache.py - 눈 감지 결과 캐시
+"""
+import os
+
+from src.mapdata.generate import generate_map, save_map
+from src.perception.cache import get_cache_path
+from src.perception.detect import detect_snow_regions
+
+
+def make_map(tmp_path) -> str:
+    colors, _ = generate_map(num_courts=1, num_patches=3, patch_size=(8, 10), seed=0)
+    map_path = str(tmp_path / 'court.tcmap')
+    save_map(colors, map_path)
+    return map_path
+
+
+def test_cache_written_without_layers(tmp_path):
+    map_path = make_map(tmp_path)
+
+    first = detect_snow_regions(map_path, use_cache=True, with_layers=False)
+    assert not first['from_cache']
+    assert os.path.exists(get_cache_path(map_path))
+
+    second = detect_snow_regions(map_path, use_cache=True, with_layers=False)
+    assert second['from_cache']
+    assert second['all_boxes'] == first['all_boxes']
+    assert second['labels'] is None and second['colors'] is None
+
+
+def test_layerless_cache_not_used_for_layers(tmp_path):
+    map_path = make_map(tmp_path)
+    detect_snow_regions(map_path, use_cache=True, with_layers=False)
+
+    # 레이어가 없는 캐시는 레이어 요청에 쓰지 않고 다시 계산해 레이어까지 저장
+    with_layers = detect_snow_regions(map_path, use_cache=True, with_layers=True)
+    assert not with_layers['from_cache']
+    assert with_layers['labels'] is not None
+
+    again = detect_snow_regions(map_path, use_cache=True, with_layers=True)
+    assert again['from_cache']
+    assert again['labels'].shape == with_layers['labels'].shape
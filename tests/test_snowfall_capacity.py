@@ -0,0 +1,104 @@
+"""
+test_snowfall_capacity.py - 적재 한도 모드에서 동적 강설 경로 수리 (하치장 왕복 유지)
+"""
+import pytest
+
+from src.mapdata.generate import generate_map, save_map
+from src.mapdata.raster import open_map_raster
+from src.mapdata.occupancy import OccupancyView
+from src.perception.detect import detect_snow_regions
+from src.control.planner import (
+    create_snow_removal_planners, generate_multi_pass_coverage, cluster_load
+)
+from src.control.route_codec import decode_plan
+from src.launch.headless import default_start
+
+CAPACITY = 200.0
+
+
+@pytest.fixture(scope='module')
+def court(tmp_path_factory):
+    colors, _ = generate_map(num_courts=1, num_patches=4, patch_size=(8, 10), seed=0)
+    map_path = str(tmp_path_factory.mktemp('snowfall') / 'court.tcmap')
+    save_map(colors, map_path)
+    detection = detect_snow_regions(map_path, use_cache=False, with_layers=False)
+    matrix = OccupancyView(open_map_raster(map_path)).to_bitgrid()
+    return detection, matrix
+
+
+def max_load_between_dumps(route: list, segments: list, dump_indices: list) -> float:
+    """하치장 방문 사이에 싣는 양의 최댓값 (Coverage 셀을 처음 지날 때마다 적재량이 고르게 쌓임)"""
+    dumps = set(dump_indices)
+    gains = {}
+    for cluster, entry, transit_start, end in segments:
+        cells = set(generate_multi_pass_coverage(cluster, entry))
+        per_cell = cluster_load(None, cluster) / len(cells)
+        for idx in range(route.index(entry, transit_start), end + 1):
+            if route[idx] in cells:
+                cells.discard(route[idx])
+                gains[idx] = per_cell
+
+    carried = peak = 0.0
+    for idx in range(len(route)):
+        carried += gains.get(idx, 0.0)
+        peak = max(peak, carried)
+        if idx in dumps:
+            carried = 0.0
+    return peak
+
+
+def check_repaired(planner, matrix, old_route: list, progress: int):
+    plan = decode_plan(planner.export_plan())
+    route, segments = plan['route'], plan['segments']
+    capacity_plan = planner.capacity_plan
+    dump_indices = capacity_plan['dump_indices']
+
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(route, route[1:]))
+    assert route[:progress + 1] == old_route[:progress + 1]
+    assert capacity_plan['trips'] == len(dump_indices)
+    assert all(route[v] == capacity_plan['dump_site'] for v in dump_indices)
+    assert dump_indices[-1] == len(route) - 1
+    assert max_load_between_dumps(route, segments, dump_indices) <= CAPACITY + 1e-9
+    return route
+
+
+@pytest.mark.parametrize('where', ['start', 'to_dump', 'middle'])
+def test_add_clusters_keeps_dump_trips(court, where):
+    detection, matrix = court
+    court_structure = detection['court_structure']
+    start = default_start(court_structure)
+    planner, _ = create_snow_removal_planners(detection['all_boxes'], court_structure=court_structure,
+                                              capacity=CAPACITY)
+    route, _ = planner(None, matrix, start, start)
+    assert planner.capacity_plan['trips'] >= 2
+
+    if where == 'start':
+        progress = 0
+    elif where == 'to_dump':
+        progress = planner.capacity_plan['dump_indices'][0] - 3
+    else:
+        progress = len(route) // 2
+    for idx in range(progress + 1):   # 로봇이 경로를 따라 progress까지 주행
+        planner(None, matrix, route[idx], route[idx])
+
+    # 새 눈 더미 (남은 구간의 클러스터와 겹치는 것 1개 + 떨어진 것 2개)
+    (r1, c1), (r2, c2) = decode_plan(planner.export_plan())['segments'][-1][0]
+    drifts = [((r1 - 2, c1 - 2), (r1 + 3, c1 + 3)), ((20, 40), (27, 47)), ((150, 100), (157, 107))]
+    result = planner.add_clusters(drifts)
+
+    assert result is not None and result['skipped'] == 0
+    check_repaired(planner, matrix, route, progress)
+
+
+def test_add_clusters_refused_for_imported_capacity_plan(court):
+    detection, matrix = court
+    court_structure = detection['court_structure']
+    start = default_start(court_structure)
+    source, _ = create_snow_removal_planners(detection['all_boxes'], court_structure=court_structure,
+                                             capacity=CAPACITY)
+    source(None, matrix, start, start)
+
+    replay, _ = create_snow_removal_planners(detection['all_boxes'], court_structure=court_structure,
+                                             capacity=CAPACITY)
+    replay.import_plan(source.export_plan())
+    assert replay.add_clusters([((20, 40), (27, 47))], matrix=matrix) is None
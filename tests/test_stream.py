@@ -0,0 +1,51 @@
+"""
+test_stream.py - 스트리밍 눈 감지 (군집 변경/삭제 보고)
+"""
+import numpy as np
+
+from src.perception.stream import StreamingSnowDetector
+
+SNOW = (100, 149, 237)
+GROUND = (0, 255, 0)
+
+
+def make_colors(patches: list) -> np.ndarray:
+    colors = np.zeros((60, 80, 3), dtype=np.uint8)
+    colors[:] = GROUND
+    for r1, c1, r2, c2 in patches:
+        colors[r1:r2 + 1, c1:c2 + 1] = SNOW
+    return colors
+
+
+def test_new_clusters_reported():
+    detector = StreamingSnowDetector((60, 80))
+    changed = detector.ingest(make_colors([(5, 5, 12, 12), (40, 50, 48, 60)]), (0, 0))
+    assert changed == {cluster['id'] for cluster in detector.get_clusters()}
+    assert len(changed) == 2
+
+
+def test_cleared_cluster_reported_as_removed():
+    detector = StreamingSnowDetector((60, 80))
+    detector.ingest(make_colors([(5, 5, 12, 12), (40, 50, 48, 60)]), (0, 0))
+    clusters = {cluster['box']: cluster['id'] for cluster in detector.get_clusters()}
+    cleared = clusters[((5, 5), (12, 12))]
+    kept = clusters[((40, 50), (48, 60))]
+
+    # 첫 번째 군집을 덮는 프레임에서 눈이 모두 사라짐
+    frame = make_colors([(40, 50, 48, 60)])[0:20, 0:20]
+    changed = detector.ingest(frame, (0, 0))
+
+    assert changed == {cleared}
+    assert [cluster['id'] for cluster in detector.get_clusters()] == [kept]
+
+
+def test_partial_clear_reports_shrunk_cluster():
+    detector = StreamingSnowDetector((60, 80))
+    detector.ingest(make_colors([(5, 5, 12, 20)]), (0, 0))
+    (cluster,) = detector.get_clusters()
+
+    frame = make_colors([(5, 5, 12, 12)])[0:20, 13:30]
+    changed = detector.ingest(frame, (0, 13))
+
+    assert changed == {cluster['id']}
+    assert detector.get_clusters()[0]['box'] == ((5, 5), (12, 12))
@@ -0,0 +1,42 @@
+"""
+map_convert.py - 맵 포맷 변환 도구 (.pkl <-> .tcmap)
+
+    python tools/map_convert.py maps/TennisCourt_Snow.pkl      # -> maps/TennisCourt_Snow.tcmap
+    python tools/map_convert.py maps/TennisCourt_Snow.tcmap    # -> maps/TennisCourt_Snow.pkl
+"""
+import argparse
+import os
+import sys
+
+# 프로젝트 루트를 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.mapdata.raster import is_raster_file, convert_pickle_to_raster, convert_raster_to_pickle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='맵 포맷 변환 (.pkl <-> .tcmap)')
+    parser.add_argument('inputs', nargs='+', help='변환할 맵 파일 (.pkl 또는 .tcmap)')
+    parser.add_argument('--output', type=str, default=None, help='출력 경로 (입력이 1개일 때만)')
+    args = parser.parse_args()
+
+    if args.output and len(args.inputs) > 1:
+        parser.error('--output은 입력 파일이 1개일 때만 사용할 수 있습니다')
+
+    for path in args.inputs:
+        if not os.path.exists(path):
+            print(f"❌ 파일 없음: {path}")
+            continue
+
+        if is_raster_file(path):
+            out_path = convert_raster_to_pickle(path, args.output)
+        else:
+            out_path = convert_pickle_to_raster(path, args.output)
+
+        print(f"💾 {path} ({os.path.getsize(path) / 1024:.1f} KB) -> "
+              f"{out_path} ({os.path.getsize(out_path) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()